@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - offline benchmark suite
+#
+# Measure the hot paths of the SDK without the network - the offline
+# validation of every predefined radio model, the list & info response
+# parsing, the calc() overhead over an in-process transport and the import
+# time. The results are saved as JSON and compared with a baseline run.
+#
+# Usage:
+#
+#   python -m benchmarks.radio_code_benchmark -o baseline.json
+#   python -m benchmarks.radio_code_benchmark -o current.json --compare baseline.json
+#   python -m benchmarks.radio_code_benchmark --compare baseline.json current.json
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Callable, Iterator
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+from radio_code_calculator.radio_code_calculator import _pattern_positions, _radio_model_from_info, \
+    _radio_models_from_list
+
+#
+# repository root (the import time is measured for the source checkout)
+#
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#
+# format version of the results file
+#
+RESULTS_VERSION = 1
+
+#
+# default slowdown reported as a regression (0.1 - 10% slower than the baseline)
+#
+DEFAULT_THRESHOLD = 0.1
+
+#
+# max. SDK import time relative to "import requests" (the HTTP stack the SDK used to load at the import)
+#
+MAX_IMPORT_RATIO = 0.5
+
+#
+# activation key accepted by the in-process transport
+#
+BENCHMARK_ACTIVATION_KEY = "ABCD-ABCD-ABCD-ABCD"
+
+
+def valid_value(pattern: str, length: int) -> str:
+    """Create a value matching the simple fixed-length character class pattern (different characters per position)"""
+
+    positions = _pattern_positions(pattern)
+
+    if positions is None or len(positions) != length:
+        raise ValueError(f"cannot generate a value for {pattern}")
+
+    return "".join(characters[(index * 7) % len(characters)] for index, characters in enumerate(positions))
+
+
+def model_params(radio_model: RadioModel) -> dict:
+    """Radio model parameters as returned by the info & list commands (with the patterns for all the SDK languages)"""
+
+    def patterns(pattern: Optional[str]) -> Optional[dict]:
+        return None if pattern is None else {"php": pattern, "python": pattern, "js": pattern, "java": pattern}
+
+    return {
+        "serialMaxLen": radio_model.serial_max_len,
+        "serialRegexPattern": patterns(radio_model.serial_regex_pattern),
+        "extraMaxLen": radio_model.extra_max_len,
+        "extraRegexPattern": patterns(radio_model.extra_regex_pattern),
+    }
+
+
+def list_response(scale: int = 1) -> dict:
+    """Response of the list command with all the predefined radio models (repeated scale times under new names)"""
+
+    models = {}
+
+    for copy in range(scale):
+        for radio_model in RadioModels.all():
+            models[radio_model.name if copy == 0 else f"{radio_model.name}-{copy}"] = model_params(radio_model)
+
+    return {"error": RadioErrors.SUCCESS, "supportedRadioModels": models}
+
+
+def web_api_response(params: Dict[str, str]) -> Dict:
+    """Constant Web API response, so the benchmarks measure only the SDK"""
+
+    if params.get("command") == "calc":
+        return {"error": RadioErrors.SUCCESS, "code": "1234"}
+
+    return {"error": RadioErrors.SUCCESS}
+
+
+def validate_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """RadioModel.validate() of every predefined radio model with the valid & invalid input"""
+
+    for radio_model in RadioModels.all():
+
+        serial = valid_value(radio_model.serial_regex_pattern, radio_model.serial_max_len)
+
+        # the last character replaced with one never allowed by the patterns
+        invalid_pattern = serial[:-1] + "!"
+        invalid_length = serial[:-1]
+
+        yield f"validate.{radio_model.name}.valid", lambda radio_model=radio_model, serial=serial: radio_model.validate(serial)
+        yield f"validate.{radio_model.name}.invalid_pattern", \
+            lambda radio_model=radio_model, serial=invalid_pattern: radio_model.validate(serial)
+        yield f"validate.{radio_model.name}.invalid_length", \
+            lambda radio_model=radio_model, serial=invalid_length: radio_model.validate(serial)
+
+
+def parse_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """Parsing of the list & info responses to RadioModels at the realistic & 100x catalog sizes"""
+
+    realistic = list_response()
+    large = list_response(100)
+    info = {"error": RadioErrors.SUCCESS, **model_params(RadioModels.JEEP_CHEROKEE)}
+
+    yield "parse.info", lambda: _radio_model_from_info("jeep-cherokee", info)
+    yield "parse.list.realistic", lambda: _radio_models_from_list(realistic)
+    yield "parse.list.100x", lambda: _radio_models_from_list(large)
+
+
+def calc_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """calc() overhead over the in-process transport (no network)"""
+
+    serial = valid_value(RadioModels.FORD_M_SERIES.serial_regex_pattern, RadioModels.FORD_M_SERIES.serial_max_len)
+
+    calculator = RadioCodeCalculator(BENCHMARK_ACTIVATION_KEY, transport=FakeTransport(web_api_response))
+    cached = RadioCodeCalculator(BENCHMARK_ACTIVATION_KEY, transport=FakeTransport(web_api_response),
+                                 cache=RadioCodeCache())
+    offline = RadioCodeCalculator(BENCHMARK_ACTIVATION_KEY, transport=FakeTransport(web_api_response),
+                                  offline_validation=True)
+
+    yield "calc.transport", lambda: calculator.calc(RadioModels.FORD_M_SERIES, serial)
+    yield "calc.cached", lambda: cached.calc(RadioModels.FORD_M_SERIES, serial)
+    yield "calc.offline_rejected", lambda: offline.calc(RadioModels.FORD_M_SERIES, serial[:-1])
+    yield "calc.by_name", lambda: calculator.calc("ford-m-series", serial)
+
+
+def measure(function: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    """Time the function (the number of calls per repeat is calibrated to run at least min_time seconds)
+
+    :return: Best & median time per call in nanoseconds, number of the calls per repeat & the number of the repeats
+    :rtype: Dict
+    """
+
+    timer = timeit.Timer(function)
+
+    number = 1
+
+    # calibrate
+    while True:
+        elapsed = timer.timeit(number)
+
+        if elapsed >= min_time:
+            break
+
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+
+    times = [elapsed / number * 1e9 for elapsed in timer.repeat(repeat, number)]
+
+    return {"ns_per_op": min(times), "median_ns": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def measure_import_time(repeat: int, module: str = "radio_code_calculator") -> Dict:
+    """Cumulative import time of the module (python -X importtime), in a new interpreter each time
+
+    :param int repeat: Number of the measurements
+    :param str module: Module name
+    :return: Best & median import time in nanoseconds
+    :rtype: Dict
+    """
+
+    times = []
+
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True, cwd=ROOT).stderr
+
+        line_times = [int(fields[1]) * 1000 for fields in ([field.strip() for field in line.split("|")]
+                                                           for line in output.splitlines())
+                      if len(fields) == 3 and fields[2] == module]
+
+        # e.g. the module is loaded at the interpreter startup, or the -X importtime output format changed
+        if not line_times:
+            raise RuntimeError(f"no -X importtime line for the {module} module (already imported at the startup "
+                               f"or the output format isn't supported)")
+
+        times.append(line_times[0])
+
+    return {"ns_per_op": min(times), "median_ns": statistics.median(times), "number": 1, "repeat": repeat}
+
+
+def run(pattern: str = "", quick: bool = False, log: Callable[[str], None] = print) -> Dict:
+    """Run the benchmarks
+
+    :param str pattern: Run only the benchmarks with this substring in the name
+    :param bool quick: Fewer & shorter repeats (smoke test, the results are noisy)
+    :param Callable[[str], None] log: Progress output
+    :return: Results (ready to be saved as JSON)
+    :rtype: Dict
+    """
+
+    repeat, min_time = (3, 0.005) if quick else (7, 0.1)
+
+    results: Dict[str, Dict] = {}
+
+    for benchmarks in (validate_benchmarks(), parse_benchmarks(), calc_benchmarks()):
+        for name, function in benchmarks:
+
+            if pattern not in name:
+                continue
+
+            results[name] = measure(function, repeat, min_time)
+
+            log(f"{name:<55} {results[name]['ns_per_op']:>14,.0f} ns")
+
+    if pattern in "import":
+        results["import"] = measure_import_time(repeat)
+
+        log(f"{'import':<55} {results['import']['ns_per_op']:>14,.0f} ns")
+
+        # the SDK import must stay well below the cost of the HTTP stack it doesn't load anymore
+        if importlib.util.find_spec("requests") is not None:
+            ratio = results["import"]["ns_per_op"] / measure_import_time(repeat, "requests")["ns_per_op"]
+            results["import"]["requests_ratio"] = ratio
+
+            log(f"{'import (relative to import requests)':<55} {ratio:>14.2f} x"
+                f"{f'  warning: over {MAX_IMPORT_RATIO}' if ratio >= MAX_IMPORT_RATIO else ''}")
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> tuple[list[str], list[str]]:
+    """Compare the results with the baseline (the best times per call)
+
+    :param Dict baseline: Baseline results
+    :param Dict current: Current results
+    :param float threshold: Slowdown reported as a regression (0.1 - 10% slower)
+    :return: Report lines and the names of the regressed benchmarks
+    :rtype: tuple[list[str], list[str]]
+    """
+
+    lines = [f"{'benchmark':<55} {'baseline ns':>14} {'current ns':>14} {'change':>8}"]
+    regressions = []
+
+    for name, result in current["benchmarks"].items():
+
+        base = baseline["benchmarks"].get(name)
+
+        if base is None:
+            lines.append(f"{name:<55} {'-':>14} {result['ns_per_op']:>14,.0f} {'new':>8}")
+            continue
+
+        change = result["ns_per_op"] / base["ns_per_op"] - 1.0
+
+        if change > threshold:
+            status = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            status = "  faster"
+        else:
+            status = ""
+
+        lines.append(f"{name:<55} {base['ns_per_op']:>14,.0f} {result['ns_per_op']:>14,.0f} {change:>+8.1%}{status}")
+
+    if baseline.get("python") != current.get("python") or baseline.get("platform") != current.get("platform"):
+        lines.append(f"warning: comparing the results of different environments "
+                     f"({baseline.get('python')} {baseline.get('platform')} vs. "
+                     f"{current.get('python')} {current.get('platform')})")
+
+    return lines, regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Benchmark suite command
+
+    :param Optional[list] argv: Command line arguments (defaults to sys.argv)
+    :return: Exit code (1 if any benchmark regressed)
+    :rtype: int
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.radio_code_benchmark",
+                                     description="Run the offline benchmarks of the Radio Code Calculator SDK.")
+
+    parser.add_argument("-o", "--output", help="save the results to this JSON file")
+    parser.add_argument("-k", "--filter", default="", help="run only the benchmarks with this substring in the name")
+    parser.add_argument("--quick", action="store_true", help="fewer & shorter repeats (smoke test)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="compare with the baseline results file (BASELINE - run the benchmarks first, "
+                             "BASELINE CURRENT - compare two results files)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown reported as a regression (default {DEFAULT_THRESHOLD} - 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and optionally a current results file")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1], encoding="utf-8") as file:
+            current = json.load(file)
+    else:
+        current = run(args.filter, args.quick)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(current, file, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare[0], encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    lines, regressions = compare(baseline, current, args.threshold)
+
+    print("\n".join(lines))
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,12 @@
 from radio_code_calculator.radio_code_calculator import *
+from radio_code_calculator.async_radio_code_calculator import *
+from radio_code_calculator.radio_model_registry import *
+from radio_code_calculator.radio_code_cache import *
+from radio_code_calculator.radio_code_store import *
+from radio_code_calculator.radio_code_table import *
+from radio_code_calculator.radio_code_transport import *
+from radio_code_calculator.radio_code_rate_limiter import *
+from radio_code_calculator.radio_code_retry import *
+from radio_code_calculator.radio_code_hedging import *
+from radio_code_calculator.radio_code_metrics import *
+from radio_code_calculator.radio_code_tracing import *
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - python -m radio_code_calculator
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+import sys
+
+from radio_code_calculator.radio_code_cli import main
+
+sys.exit(main())
@@ -0,0 +1,690 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - WebApi interface (asyncio)
+#
+# Generate radio unlocking codes for various radio players.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Dependencies : httpx (https://pypi.python.org/pypi/httpx/) for the default transport
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Union, Iterable, AsyncIterable, AsyncIterator, Callable
+import time
+
+from radio_code_calculator.radio_code_transport import AsyncTransport, AsyncHttpxTransport, TransportTimeoutError
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioCodeCalculator, \
+    _calc_key, _calc_params, _calc_return, _info_params, _offline_validation_error, _radio_model_from_info, \
+    _radio_models_from_list
+from radio_code_calculator.radio_code_tracing import trace_span, _traced_async
+
+
+class AsyncRadioCodeCalculator(object):
+    """Radio Code Calculator API module for asyncio applications"""
+
+    #
+    # @var string default Radio Code Calculator API WebApi endpoint
+    #
+    API_URL: str = RadioCodeCalculator.API_URL
+
+    #
+    # @var string WebApi key for the service
+    #
+    _apiKey: str = ""
+
+    def __init__(self,
+                 api_key: str = "",
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 max_concurrency: int = 100,
+                 offline_validation: bool = False,
+                 cache=None,
+                 store=None,
+                 coalesce_requests: bool = True,
+                 model_catalog=None,
+                 transport: Optional[AsyncTransport] = None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 circuit_breaker=None,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0,
+                 timeout: Optional[float] = None,
+                 hedging=None,
+                 code_tables=None,
+                 typed_results: bool = False,
+                 metrics=None,
+                 tracer=None):
+        """Initialize asyncio Radio Code Calculator API class
+
+        :param str api_key: Activation key for the service (it cannot be empty!)
+        :param int max_connections: Max. number of the connections in the shared connection pool
+        :param int max_keepalive_connections: Max. number of idle keep-alive connections kept in the pool
+        :param int max_concurrency: Max. number of requests in flight at the same time (others are waiting)
+        :param bool offline_validation: Validate calc() input offline and reject invalid input without a Web API request
+        :param Optional[RadioCodeCache] cache: Cache of the calc() results (optional)
+        :param Optional[RadioCodeStore] store: Persistent store of the calc() results, checked after the cache (optional)
+        :param bool coalesce_requests: Send identical concurrent requests only once and share the result between the callers
+        :param Optional[RadioModelCatalog] model_catalog: Cache of the list command results used by list() & info() (optional)
+        :param Optional[AsyncTransport] transport: HTTP transport (defaults to AsyncHttpxTransport with the pool settings above)
+        :param Optional[RateLimiter] rate_limiter: Limits the number of the requests per second, configured with the
+                                                   license limits on login() (optional)
+        :param Optional[RetryPolicy] retry_policy: Retry the transient failures with exponential backoff (optional)
+        :param Optional[CircuitBreaker] circuit_breaker: Fail fast with ERROR_CONNECTION while the Web API is down (optional)
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        :param Optional[float] timeout: Default deadline of each command including the retries in seconds (None - no deadline)
+        :param Optional[HedgingPolicy] hedging: Send a second calc request when the first one is slow (optional)
+        :param Optional[Iterable[RadioCodeTable]] code_tables: Memory-mapped radio code tables of the radio models with
+                                                               numeric serial numbers, checked before the cache (optional)
+        :param bool typed_results: Return the calc() results as compact CalcResult objects instead of the raw dictionaries
+        :param Optional[MetricsHook] metrics: Instrumentation hooks e.g. MetricsCollector, also set on the transport (optional)
+        :param Optional[Tracer] tracer: Traces the sampled commands with the per-phase spans (optional)
+        """
+
+        import asyncio
+
+        self._apiKey = api_key
+
+        # radio models downloaded with list() are used for the offline validation
+        self._offline_validation = offline_validation
+        self._radio_models: Dict[str, RadioModel] = {}
+
+        # calc() results cache & persistent store
+        self._cache = cache
+        self._store = store
+
+        # calc() returns CalcResult objects
+        self._typed_results = typed_results
+
+        # radio model name -> dense radio code table
+        self._code_tables = {table.radio_model: table for table in code_tables} if code_tables else None
+
+        # cached list command results
+        self._model_catalog = model_catalog
+
+        # requests in flight by their parameters
+        self._coalesce_requests = coalesce_requests
+        self._in_flight: Dict[tuple, "asyncio.Future"] = {}
+
+        # limits the number of requests in flight
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # client-side limit of the requests per second
+        self._rate_limiter = rate_limiter
+
+        # failure handling
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+
+        # default deadline of the commands
+        self._timeout = timeout
+
+        self._hedging = hedging
+
+        # HTTP transport shared by all the commands (the HTTP stack is loaded on the first request)
+        self._transport = transport or AsyncHttpxTransport(max_connections=max_connections,
+                                                           max_keepalive_connections=max_keepalive_connections,
+                                                           connect_timeout=connect_timeout,
+                                                           read_timeout=read_timeout)
+
+        # the transport reports the transferred bytes & the new connections
+        self._metrics = metrics
+
+        if metrics is not None:
+            self._transport.metrics = metrics
+
+        # sampled traces of the commands
+        self._tracer = tracer
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP transport and release all the pooled connections, write the results buffered by the store"""
+
+        await self._transport.close()
+
+        # the store is shared, it's only flushed (closed by its owner)
+        if self._store is not None:
+            import asyncio
+            await asyncio.to_thread(self._store.flush)
+
+    @_traced_async("login")
+    async def login(self, timeout: Optional[float] = None) -> tuple[int, dict]:
+        """Login to the service and get the information about the current license limits
+
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+        :return: A dictionary with an error code, and an optional dictionary with the raw results (or Null on error)
+        :rtype: tuple[int, dict]
+        """
+
+        # parameters
+        params = {"command": "login"}
+
+        result = await self.post_request(params, timeout)
+
+        # apply the license limits
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_from_license(result)
+
+        return result["error"], result
+
+    @_traced_async("calc")
+    async def calc(self,
+                   radio_model: Union[RadioModel, str],
+                   radio_serial_number: str,
+                   radio_extra_data: str = "",
+                   timeout: Optional[float] = None) -> tuple[int, dict]:
+        """Calculate the radio code for the selected radio model
+
+        :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+        :param str radio_serial_number: Radio serial number / pre code
+        :param str radio_extra_data: Optional extra data (for example - a supplier code) to generate the radio code
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+
+        :return: A list with an error code, and an optional dictionary with the raw results (or null), or a CalcResult
+                 with typed_results=True
+        :rtype: tuple[int, Union[dict, CalcResult]]:
+        """
+
+        import asyncio
+
+        # parameters
+        params = _calc_params(radio_model, radio_serial_number, radio_extra_data)
+
+        key = _calc_key(params)
+
+        # reject invalid input without sending the request
+        if self._offline_validation:
+            radio_models = self._radio_models
+
+            # the models from the model catalog take precedence
+            if self._model_catalog is not None and self._model_catalog.registry is not None:
+                radio_models = self._model_catalog.registry
+
+            result = _offline_validation_error(radio_model, radio_models, radio_serial_number, radio_extra_data)
+
+            if result is not None:
+                return _calc_return(result, key, self._typed_results)
+
+        # previously calculated radio code
+        table = None
+
+        if self._code_tables is not None:
+            table = self._code_tables.get(key[0])
+
+            if table is not None:
+                result = table.get(key)
+
+                if self._metrics is not None:
+                    self._metrics.record_cache("table", result is not None)
+
+                if result is not None:
+                    return _calc_return(result, key, self._typed_results)
+
+        if self._cache is not None:
+            result = self._cache.get(key)
+
+            if self._metrics is not None:
+                self._metrics.record_cache("cache", result is not None)
+
+            if result is not None:
+                return _calc_return(result, key, self._typed_results)
+
+        if self._store is not None:
+            result = await asyncio.to_thread(self._store.get, key)
+
+            if self._metrics is not None:
+                self._metrics.record_cache("store", result is not None)
+
+            if result is not None:
+                if self._cache is not None:
+                    self._cache.put(key, result)
+
+                if table is not None:
+                    table.put(key, result)
+
+                return _calc_return(result, key, self._typed_results)
+
+        result = await self.post_request(params, timeout)
+
+        if table is not None:
+            table.put(key, result)
+
+        if self._cache is not None:
+            self._cache.put(key, result)
+
+        if self._store is not None:
+            await asyncio.to_thread(self._store.put, key, result)
+
+        return _calc_return(result, key, self._typed_results)
+
+    async def calc_many(self, items: Iterable[tuple], ordered: bool = True) -> list[tuple]:
+        """Calculate the radio codes for many radio serial numbers at once (limited by max_concurrency)
+
+        :param Iterable[tuple] items: (radio_model, radio_serial_number) or (radio_model, radio_serial_number, radio_extra_data) tuples
+        :param bool ordered: Return the results in the input order, or in the completion order if False
+
+        :return: A list of (error code, raw results) tuples in the input order, or a list of
+                 (input index, error code, raw results) tuples in the completion order if not ordered
+        :rtype: list[tuple]
+        """
+
+        import asyncio
+
+        async def calc_item(index: int, item: tuple) -> tuple:
+            return index, *await self._calc_item(item)
+
+        tasks = [calc_item(index, item) for index, item in enumerate(items)]
+
+        if ordered:
+            return [(error, result) for index, error, result in await asyncio.gather(*tasks)]
+
+        return [await task for task in asyncio.as_completed(tasks)]
+
+    async def calc_iter(self, items: Union[Iterable[tuple], AsyncIterable[tuple]], window: Optional[int] = None) -> AsyncIterator[tuple]:
+        """Calculate the radio codes for a stream of radio serial numbers, yield the results as soon as they're ready
+
+        The input is consumed lazily, at most window items are read ahead (requests in flight & results waiting to be
+        consumed), so the memory use doesn't depend on the input size. A slow consumer pauses reading the input.
+
+        :param Union[Iterable[tuple], AsyncIterable[tuple]] items: (radio_model, radio_serial_number) or
+                                                                   (radio_model, radio_serial_number, radio_extra_data) tuples
+        :param Optional[int] window: Max. number of the input items read ahead (defaults to max_concurrency)
+
+        :return: An async iterator of (input item, error code, raw results) tuples in the completion order
+        :rtype: AsyncIterator[tuple]
+        """
+
+        import asyncio
+        import collections.abc
+
+        if window is None:
+            window = self._max_concurrency
+
+        exhausted = object()
+
+        if isinstance(items, collections.abc.AsyncIterable):
+            items = items.__aiter__()
+
+            async def next_item():
+                try:
+                    return await items.__anext__()
+                except StopAsyncIteration:
+                    return exhausted
+        else:
+            items = iter(items)
+
+            async def next_item():
+                return next(items, exhausted)
+
+        # task -> input item
+        pending = {}
+
+        async def submit(count: int) -> None:
+            for _ in range(count):
+                item = await next_item()
+
+                if item is exhausted:
+                    return
+
+                pending[asyncio.ensure_future(self._calc_item(item))] = item
+
+        try:
+            await submit(window)
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                results = [(pending.pop(task), *task.result()) for task in done]
+
+                await submit(len(results))
+
+                for result in results:
+                    yield result
+
+        finally:
+            # the consumer stopped early
+            for task in pending:
+                task.cancel()
+
+    async def _calc_item(self, item: tuple) -> tuple[int, dict]:
+        """Calculate the radio code for a single calc_many() item, never raise an exception
+
+        :param tuple item: (radio_model, radio_serial_number) or (radio_model, radio_serial_number, radio_extra_data)
+        :return: A list with an error code, and a dictionary with the raw results
+        :rtype: tuple[int, dict]
+        """
+
+        try:
+            radio_model, radio_serial_number, *radio_extra_data = item
+        except (TypeError, ValueError):
+            return _calc_return({"error": RadioErrors.INVALID_INPUT}, None, self._typed_results)
+
+        if len(radio_extra_data) > 1:
+            return _calc_return({"error": RadioErrors.INVALID_INPUT}, None, self._typed_results)
+
+        try:
+            return await self.calc(radio_model, radio_serial_number, *radio_extra_data)
+        except Exception as ex:
+            return _calc_return({"error": RadioErrors.ERROR_CONNECTION}, None, self._typed_results)
+
+    @_traced_async("info")
+    async def info(self, radio_model: Union[RadioModel, str], timeout: Optional[float] = None) -> tuple[int, Optional[RadioModel]]:
+        """Get the information about the given radio calculator and its parameters (name, max. len & regex pattern)
+
+        :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+        :return: A list with an error code, and an optional RadioModel create from the return values (or null)
+        :rtype: tuple[int, Optional[RadioModel]]:
+        """
+
+        # parameters
+        params = _info_params(radio_model)
+
+        # serve the model from the cached list command results
+        if self._model_catalog is not None:
+            error, registry = await self._model_catalog.get_async(lambda: self._fetch_list(timeout))
+
+            if error != RadioErrors.SUCCESS:
+                return error, None
+
+            radio_model = registry.get(params["radio_model"])
+
+            if radio_model is None:
+                return RadioErrors.INVALID_RADIO_MODEL, None
+
+            return error, radio_model
+
+        # send request
+        result = await self.post_request(params, timeout)
+
+        if result["error"] != RadioErrors.SUCCESS:
+            return result["error"], None
+
+        with trace_span("model"):
+            radio_model = _radio_model_from_info(params["radio_model"], result)
+
+        return result["error"], radio_model
+
+    @_traced_async("list")
+    async def list(self, timeout: Optional[float] = None) -> tuple[int, Optional[list[RadioModel]]]:
+        """List all the supported radio calculators and their parameters (name, max. len & regex pattern)
+
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+
+        :return: A list with an error code, and an optional list of supported RadioModels (or null)
+        :rtype: tuple[int, Optional[list[RadioModel]]]:
+        """
+
+        # cached list command results
+        if self._model_catalog is not None:
+            error, registry = await self._model_catalog.get_async(lambda: self._fetch_list(timeout))
+
+            if error != RadioErrors.SUCCESS:
+                return error, None
+
+            return error, [radio_model for radio_model in registry]
+
+        # send request
+        result = await self._fetch_list(timeout)
+
+        if result["error"] != RadioErrors.SUCCESS:
+            return result["error"], None
+
+        with trace_span("model", count=len(result.get("supportedRadioModels", {}))):
+            radio_models = _radio_models_from_list(result)
+
+        # remember the models for the offline validation
+        self._radio_models = {radio_model.name: radio_model for radio_model in radio_models}
+
+        return result["error"], radio_models
+
+    async def _fetch_list(self, timeout: Optional[float] = None) -> Dict:
+        """Send the list command
+
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+        :return: Raw results of the list command
+        :rtype: Dict
+        """
+
+        # parameters
+        params = {"command": "list"}
+
+        return await self.post_request(params, timeout)
+
+    async def post_request(self, params_array: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+        """Send a POST request to the server
+
+        :param Dict params_array: An array with the parameters
+        :param Optional[float] timeout: Deadline of the request including the retries in seconds (defaults to the
+                                        timeout of the instance)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        # add activation key to the parameters array
+        if self._apiKey:
+            params_array["key"] = self._apiKey
+
+        if timeout is None:
+            timeout = self._timeout
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        # slow calc requests are hedged
+        send_request = self._hedged_request if self._hedging is not None and params_array.get("command") == "calc" \
+            else self._send_request
+
+        if self._metrics is None:
+            return await self._coalesced_request(send_request, params_array, deadline)
+
+        started = time.monotonic()
+
+        result = await self._coalesced_request(send_request, params_array, deadline)
+
+        self._metrics.record_request(params_array.get("command", ""), params_array.get("radio_model", ""),
+                                     result.get("error"), time.monotonic() - started)
+
+        return result
+
+    async def _coalesced_request(self, send_request: Callable, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request, or wait for the identical one in flight
+
+        :param Callable send_request: Request function (_send_request or _hedged_request)
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        import asyncio
+
+        if not self._coalesce_requests:
+            return await send_request(params_array, deadline)
+
+        # identical concurrent requests share a single Web API request (the request isn't cancelled along with
+        # the caller, as other callers might be waiting for it)
+        key = tuple(sorted(params_array.items()))
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(send_request(params_array, deadline))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            return await asyncio.shield(task)
+
+        if deadline is None:
+            return dict(await asyncio.shield(task))
+
+        # the caller's own deadline, the request in flight might take longer
+        try:
+            return dict(await asyncio.wait_for(asyncio.shield(task), max(deadline - time.monotonic(), 0.0)))
+        except asyncio.TimeoutError:
+            return {"error": RadioErrors.ERROR_CONNECTION}
+
+    async def _hedged_request(self, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request, and an identical one if the first doesn't answer in time, return the first response
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        import asyncio
+
+        primary = asyncio.ensure_future(self._timed_request(params_array, deadline))
+        pending = {primary}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedging.delay())
+
+            if done:
+                self._hedging.record_request(hedged=False)
+                return primary.result()
+
+            hedge = asyncio.ensure_future(self._timed_request(params_array, deadline))
+            pending = {primary, hedge}
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    result = task.result()
+
+                    # the other request might still succeed
+                    if result.get("error") != RadioErrors.ERROR_CONNECTION or not pending:
+                        self._hedging.record_request(hedged=True, hedge_won=task is hedge)
+                        return result
+
+        finally:
+            # the slower request isn't needed anymore
+            for task in pending:
+                task.cancel()
+
+    async def _timed_request(self, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request and record its response time for the hedging policy
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        started = time.monotonic()
+
+        result = await self._send_request(params_array, deadline)
+
+        if result.get("error") != RadioErrors.ERROR_CONNECTION:
+            self._hedging.record(time.monotonic() - started)
+
+        return result
+
+    async def _post(self, params_array: Dict[str, str], timeout: Optional[float], attempt: int = 1) -> Dict:
+
+        # wait for a free slot
+        with trace_span("queue", kind="concurrency"):
+            await self._semaphore.acquire()
+
+        try:
+            with trace_span("http", attempt=attempt):
+                return await self._transport.post(self.API_URL, params_array, timeout)
+        finally:
+            self._semaphore.release()
+
+    async def _send_request(self, params_array: Dict[str, str], deadline: Optional[float] = None) -> Dict:
+        """Send a POST request to the server (without the request coalescing)
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request including the retries (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        import asyncio
+
+        # default error -> only returned by the SDK
+        default_error = {"error": RadioErrors.ERROR_CONNECTION}
+
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+
+            # fail fast while the Web API is down
+            if self._circuit_breaker is not None and not self._circuit_breaker.allow():
+                return default_error
+
+            try:
+                # wait for the turn within the rate limit
+                if self._rate_limiter is not None:
+                    with trace_span("queue", kind="rate_limit"):
+                        await self._rate_limiter.acquire_async()
+
+                # time left for this attempt
+                timeout = None if deadline is None else deadline - time.monotonic()
+
+                if timeout is not None and timeout <= 0:
+
+                    # the request isn't sent, don't hold the half-open trial
+                    if self._circuit_breaker is not None:
+                        self._circuit_breaker.release()
+
+                    return default_error
+
+                if timeout is None:
+                    result = await self._post(params_array, timeout, attempt + 1)
+
+                else:
+                    try:
+                        # the deadline covers the wait for a free slot too
+                        result = await asyncio.wait_for(self._post(params_array, timeout, attempt + 1), timeout)
+                    except asyncio.TimeoutError as ex:
+                        raise TransportTimeoutError(f"no response within {timeout} seconds") from ex
+
+            except Exception as ex:
+
+                if self._metrics is not None:
+                    self._metrics.record_failure(params_array.get("command", ""), ex)
+
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_exception(ex)
+
+                attempt += 1
+                delay = None if self._retry_policy is None else \
+                    self._retry_policy.backoff(attempt, started, ex, params_array.get("command"))
+
+                # no time left for another attempt
+                if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+                    return default_error
+
+                with trace_span("backoff", attempt=attempt):
+                    await asyncio.sleep(delay)
+
+                continue
+
+            except BaseException:
+
+                # cancelled (or interrupted) without an outcome, don't hold the half-open trial
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.release()
+
+                raise
+
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record_success()
+
+            # return original JSON response code
+            return result
@@ -0,0 +1,478 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - multi-core offline bulk validator
+#
+# Validates huge files of radio serial numbers (one per line) offline. The
+# file is memory-mapped, split into newline-aligned chunks and the chunks
+# are validated in a pool of processes.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Iterable, Iterator, Union
+import os
+import sys
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioModels, _import_numpy
+from radio_code_calculator.radio_model_registry import RadioModelRegistry
+
+#
+# @var list[str] output modes - the error code of every record, or only the valid records
+#
+OUTPUT_MODES = ["codes", "valid"]
+
+#
+# @var int default chunk size (bytes of the input file validated by a single task)
+#
+DEFAULT_CHUNK_SIZE = 16 << 20
+
+#
+# @var int min. chunk size when a smaller file is split between the workers
+#
+_MIN_CHUNK_SIZE = 1 << 20
+
+#
+# @var int max. number of the radio models validated with the vectorized validation (bits of the match masks)
+#
+_MAX_VECTORIZED_MODELS = 63
+
+#
+# @var int number of the records gathered at once by the vectorized validation
+#
+_GATHER_BATCH = 1 << 16
+
+#
+# @var Optional[tuple] memory-mapped input file & chunk validator of the worker process
+#
+_worker_state = None
+
+
+class _ChunkValidator(object):
+    """Validator of the newline-aligned chunks of the input file (shared by the main & the worker processes)"""
+
+    def __init__(self, radio_models: list[RadioModel], output: str):
+
+        self.radio_models = radio_models
+        self.output = output
+
+        # the models with the same name are replaced, the same way as in the registry
+        self.registry = RadioModelRegistry(radio_models)
+        self.single = len(radio_models) == 1
+
+        # bit N of the match masks is the model N
+        self._bits = {id(radio_model): 1 << index for index, radio_model in enumerate(radio_models)}
+        self._labels: Dict[int, str] = {}
+
+        self._np = _import_numpy() if len(radio_models) <= _MAX_VECTORIZED_MODELS else None
+
+    def _label(self, mask: int) -> str:
+        """Get the names of the matching radio models
+
+        :param int mask: Mask of the matching radio models
+        :return: Radio model names separated with "|" (in the radio models order)
+        :rtype: str
+        """
+
+        label = self._labels.get(mask)
+
+        if label is None:
+            label = self._labels[mask] = "|".join(radio_model.name for index, radio_model in enumerate(self.radio_models)
+                                                  if mask >> index & 1)
+
+        return label
+
+    def _match(self, data: bytes) -> tuple[list, list]:
+        """Validate the records with the compiled validators
+
+        :param bytes data: Newline-aligned chunk of the input file
+        :return: Error codes & match masks of the records
+        :rtype: tuple[list, list]
+        """
+
+        text = data.decode("latin-1")
+        lines = text.split("\n")
+
+        if text.endswith("\n"):
+            lines.pop()
+
+        errors = []
+        masks = []
+
+        if self.single:
+            radio_model = self.radio_models[0]
+
+            for line in lines:
+                error = radio_model.validate(line[:-1] if line.endswith("\r") else line)
+
+                errors.append(error)
+                masks.append(error == RadioErrors.SUCCESS)
+
+            return errors, masks
+
+        bits = self._bits
+        lengths = self.registry._by_length
+
+        for line in lines:
+            if line.endswith("\r"):
+                line = line[:-1]
+
+            mask = 0
+
+            for radio_model in self.registry.candidates(line):
+                mask |= bits[id(radio_model)]
+
+            masks.append(mask)
+
+            if mask:
+                errors.append(RadioErrors.SUCCESS)
+            else:
+                errors.append(RadioErrors.INVALID_SERIAL_PATTERN if len(line) in lengths else RadioErrors.INVALID_SERIAL_LENGTH)
+
+        return errors, masks
+
+    def _match_vectorized(self, np, data: bytes) -> tuple:
+        """Validate the records with the vectorized per-position checks (the records of each length at once)
+
+        :param np: NumPy module
+        :param bytes data: Newline-aligned chunk of the input file
+        :return: Error codes & match masks of the records (numpy.ndarray)
+        :rtype: tuple
+        """
+
+        buffer = np.frombuffer(data, dtype=np.uint8)
+
+        ends = np.flatnonzero(buffer == 0x0A)
+
+        # the last line of the file doesn't have to end with a new line character
+        if not data.endswith(b"\n"):
+            ends = np.append(ends, len(data))
+
+        starts = np.zeros_like(ends)
+        starts[1:] = ends[:-1] + 1
+
+        lengths = ends - starts
+
+        # \r\n line ends
+        carriage_returns = lengths > 0
+        carriage_returns[carriage_returns] = buffer[ends[carriage_returns] - 1] == 0x0D
+        lengths -= carriage_returns
+
+        errors = np.full(len(ends), RadioErrors.INVALID_SERIAL_LENGTH, dtype=np.int8)
+        masks = np.zeros(len(ends), dtype=np.int64)
+
+        for serial_len, index in self.registry._by_length.items():
+
+            rows = np.flatnonzero(lengths == serial_len)
+
+            if serial_len <= 0 or not rows.size:
+                continue
+
+            errors[rows] = RadioErrors.INVALID_SERIAL_PATTERN
+
+            # gather the records in batches to keep the index matrices small
+            for batch in range(0, len(rows), _GATHER_BATCH):
+
+                batch_rows = rows[batch:batch + _GATHER_BATCH]
+
+                # the matrix of the records of this length, one character code per cell
+                records = buffer[starts[batch_rows, None] + np.arange(serial_len)]
+
+                for radio_model in index.models:
+                    valid = radio_model._validate_records(np, records, b"") == RadioErrors.SUCCESS
+                    masks[batch_rows[valid]] |= self._bits[id(radio_model)]
+
+        errors[masks != 0] = RadioErrors.SUCCESS
+
+        return errors, masks
+
+    def validate(self, data: bytes) -> tuple[bytes, tuple[int, int, int, int]]:
+        """Validate the newline-aligned chunk of the input file
+
+        :param bytes data: Chunk of the input file (complete lines)
+        :return: The output for the chunk and the number of the records, valid, invalid length & invalid pattern ones
+        :rtype: tuple[bytes, tuple[int, int, int, int]]
+        """
+
+        np = self._np
+
+        if np is not None:
+            errors, masks = self._match_vectorized(np, data)
+
+            valid = int(np.count_nonzero(errors == RadioErrors.SUCCESS))
+            invalid_length = int(np.count_nonzero(errors == RadioErrors.INVALID_SERIAL_LENGTH))
+
+            # the error codes are single digits, write them without formatting the numbers one by one
+            if self.output == "codes" and self.single:
+                output = np.empty(2 * len(errors), dtype=np.uint8)
+                output[0::2] = errors + ord("0")
+                output[1::2] = ord("\n")
+
+                return output.tobytes(), (len(errors), valid, invalid_length, len(errors) - valid - invalid_length)
+
+            errors, masks = errors.tolist(), masks.tolist()
+        else:
+            errors, masks = self._match(data)
+
+            valid = errors.count(RadioErrors.SUCCESS)
+            invalid_length = errors.count(RadioErrors.INVALID_SERIAL_LENGTH)
+
+        counts = (len(errors), valid, invalid_length, len(errors) - valid - invalid_length)
+
+        if self.output == "valid":
+            lines = data.split(b"\n")
+
+            if data.endswith(b"\n"):
+                lines.pop()
+
+            lines = [line[:-1] if line.endswith(b"\r") else line for line, mask in zip(lines, masks) if mask]
+
+            return b"\n".join(lines) + b"\n" if lines else b"", counts
+
+        if self.single:
+            output = "\n".join(map(str, map(int, errors)))
+        else:
+            output = "\n".join(f"{int(error)},{self._label(mask)}" for error, mask in zip(errors, masks))
+
+        return output.encode("ascii") + b"\n" if errors else b"", counts
+
+
+def _init_worker(path: str, radio_models: list[RadioModel], output: str) -> None:
+    """Map the input file in the worker process (each worker maps the file on its own, nothing is copied)
+
+    :param str path: Input file path
+    :param list[RadioModel] radio_models: Radio models
+    :param str output: Output mode
+    """
+
+    import mmap
+
+    global _worker_state
+
+    with open(path, "rb") as file:
+        _worker_state = (mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), _ChunkValidator(radio_models, output))
+
+
+def _validate_range(start: int, end: int) -> tuple[bytes, tuple[int, int, int, int]]:
+    """Validate the chunk of the input file in the worker process
+
+    :param int start: Chunk start offset
+    :param int end: Chunk end offset
+    :return: The output for the chunk and the statistics
+    :rtype: tuple[bytes, tuple[int, int, int, int]]
+    """
+
+    mm, validator = _worker_state
+
+    return validator.validate(mm[start:end])
+
+
+def _chunks(mm, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Split the memory-mapped file into the newline-aligned chunks
+
+    :param mm: Memory-mapped input file
+    :param int chunk_size: Approx. chunk size
+    :return: An iterator of the (start, end) offsets of the chunks
+    :rtype: Iterator[tuple[int, int]]
+    """
+
+    size = len(mm)
+    start = 0
+
+    while start < size:
+
+        # extend the chunk to the end of the line
+        end = mm.find(b"\n", min(start + chunk_size, size) - 1)
+        end = size if end < 0 else end + 1
+
+        yield start, end
+
+        start = end
+
+
+class BulkValidator(object):
+    """Multi-core offline validator of huge files of radio serial numbers (one serial number per line)
+
+    The input file is memory-mapped and split into newline-aligned chunks, the worker processes map the same file
+    and validate their chunks, so the file is never copied between the processes. The outputs of the chunks are
+    written in the input order.
+    """
+
+    def __init__(self,
+                 radio_model: Union[RadioModel, str, None] = None,
+                 radio_models: Optional[Iterable[RadioModel]] = None,
+                 output: str = "codes",
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Initialize the validator
+
+        :param Union[RadioModel, str, None] radio_model: Radio model of the serial numbers (None - detect the matching
+                                                          radio models for each record)
+        :param Optional[Iterable[RadioModel]] radio_models: Radio models to detect (defaults to all the predefined
+                                                            RadioModels)
+        :param str output: "codes" - the error code of every record (and the matching radio models if they're
+                           detected), "valid" - only the valid records
+        :param Optional[int] workers: Number of the worker processes (defaults to the number of the CPU cores)
+        :param int chunk_size: Approx. number of bytes validated by a single task
+        """
+
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"unknown output mode {output}")
+
+        if isinstance(radio_model, str):
+            name = radio_model
+            radio_model = RadioModels.by_name(name) if radio_models is None else \
+                next((candidate for candidate in radio_models if candidate.name == name), None)
+
+            if radio_model is None:
+                raise ValueError(f"unknown radio model {name}")
+
+        if radio_model is not None:
+            self.radio_models = [radio_model]
+        else:
+            self.radio_models = list(RadioModelRegistry(radio_models))
+
+        self.output = output
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def run(self, input_path: str, output_path: Optional[str] = None) -> Dict[str, int]:
+        """Validate the input file
+
+        The lines are the records, the \\r\\n line ends are accepted, an empty line is a record with an invalid length.
+        The error codes are written one per line, in the input order (with the radio model names separated with "|"
+        after a comma if the radio models are detected). The valid records are written without changes.
+
+        :param str input_path: Input file path (one serial number per line)
+        :param Optional[str] output_path: Output file path (None - only count the records)
+        :return: Statistics - the number of the records, and the valid, invalid_length & invalid_pattern ones
+        :rtype: Dict[str, int]
+        """
+
+        import mmap
+
+        totals = [0, 0, 0, 0]
+        output = open(output_path, "wb") if output_path is not None else None
+
+        try:
+            with open(input_path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+
+                # an empty file can't be mapped
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+            try:
+                # split the smaller files between all the workers
+                chunk_size = min(self.chunk_size, max(-(-size // self.workers), _MIN_CHUNK_SIZE))
+                chunks = _chunks(mm, chunk_size)
+
+                for data, counts in self._validate_chunks(input_path, mm, chunks, size > chunk_size):
+
+                    if output is not None:
+                        output.write(data)
+
+                    for index, count in enumerate(counts):
+                        totals[index] += count
+
+            finally:
+                if size:
+                    mm.close()
+
+        finally:
+            if output is not None:
+                output.close()
+
+        return dict(zip(("records", "valid", "invalid_length", "invalid_pattern"), totals))
+
+    def _validate_chunks(self, input_path: str, mm, chunks: Iterator[tuple[int, int]], parallel: bool) -> Iterator[tuple]:
+        """Validate the chunks in the worker processes (or in this process if there's a single worker or chunk)
+
+        :param str input_path: Input file path
+        :param mm: Memory-mapped input file
+        :param Iterator[tuple[int, int]] chunks: Chunk offsets
+        :param bool parallel: Use the worker processes
+        :return: An iterator of the chunk outputs and statistics in the input order
+        :rtype: Iterator[tuple]
+        """
+
+        if self.workers == 1 or not parallel:
+            validator = _ChunkValidator(self.radio_models, self.output)
+
+            for start, end in chunks:
+                yield validator.validate(mm[start:end])
+
+            return
+
+        import collections
+        import itertools
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(input_path, self.radio_models, self.output)) as executor:
+
+            # a bounded number of the chunks in flight, so the outputs waiting to be written don't pile up
+            pending = collections.deque(executor.submit(_validate_range, start, end)
+                                        for start, end in itertools.islice(chunks, 2 * self.workers))
+
+            while pending:
+                result = pending.popleft().result()
+
+                for start, end in itertools.islice(chunks, 1):
+                    pending.append(executor.submit(_validate_range, start, end))
+
+                yield result
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Bulk validator console command
+
+    :param Optional[list] argv: Command line arguments (defaults to sys.argv)
+    :return: Exit code (0 - all the records are valid, 2 - some records are invalid)
+    :rtype: int
+    """
+
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m radio_code_calculator.radio_code_bulk_validator",
+                                     description="Validate a file of radio serial numbers (one per line) offline on all the CPU cores.")
+
+    parser.add_argument("input", help="input file with one serial number per line")
+    parser.add_argument("output", nargs="?", help="output file (omit to only print the statistics)")
+    parser.add_argument("--radio-model", help="radio model name (default - detect the matching radio models)")
+    parser.add_argument("--output-mode", choices=OUTPUT_MODES, default="codes",
+                        help="codes - the error code of every record, valid - only the valid records (default codes)")
+    parser.add_argument("--workers", type=int, help="number of the worker processes (default - number of the CPU cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE >> 20, help="chunk size in MB (default 16)")
+
+    args = parser.parse_args(argv)
+
+    try:
+        validator = BulkValidator(args.radio_model, output=args.output_mode, workers=args.workers,
+                                  chunk_size=args.chunk_size << 20)
+
+        started = time.monotonic()
+        stats = validator.run(args.input, args.output)
+        elapsed = time.monotonic() - started
+
+    except (OSError, ValueError) as ex:
+        print(f"radio_code_bulk_validator: {ex}", file=sys.stderr)
+        return 1
+
+    print(f"records {stats['records']} | valid {stats['valid']} | invalid length {stats['invalid_length']} | "
+          f"invalid pattern {stats['invalid_pattern']} | {stats['records'] / elapsed if elapsed > 0 else 0.0:.0f} records/s",
+          file=sys.stderr)
+
+    return 0 if stats["valid"] == stats["records"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - in-memory radio code cache
+#
+# Bounded LRU cache with expiration time for the calc() results.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from collections import OrderedDict
+from typing import Optional, Dict, Iterable, Union
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, CalcResult
+
+
+class RadioCodeCache(object):
+    """Thread-safe in-memory LRU cache of the calc() results with expiration time"""
+
+    def __init__(self,
+                 max_size: int = 10000,
+                 ttl: Optional[float] = None,
+                 negative_errors: Iterable[int] = (),
+                 negative_ttl: Optional[float] = None,
+                 compact: bool = False):
+        """Initialize the cache
+
+        :param int max_size: Max. number of cached results (the least recently used are evicted first)
+        :param Optional[float] ttl: Time to live of the cached results in seconds (None - never expire)
+        :param Iterable[int] negative_errors: Deterministic RadioErrors to cache besides SUCCESS e.g. INVALID_SERIAL_NOT_SUPPORTED
+        :param Optional[float] negative_ttl: Time to live of the cached errors in seconds (defaults to ttl)
+        :param bool compact: Keep the results with only the error & code fields as CalcResult objects instead of the
+                             dictionaries (a fraction of the memory for the big caches)
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_errors = frozenset(negative_errors)
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.compact = compact
+
+        # key -> (expiration time or None, result), the most recently used at the end
+        self._entries: OrderedDict[tuple, tuple[Optional[float], Union[Dict, CalcResult]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        """Get the cached result
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :return: A copy of the cached result or None if it's not cached (or expired)
+        :rtype: Optional[Dict]
+        """
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, result = entry
+
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return result.to_dict() if isinstance(result, CalcResult) else dict(result)
+
+    def put(self, key: tuple, result: Dict) -> bool:
+        """Cache the result if it's a successful one (or one of the configured deterministic errors)
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :param Dict result: Raw calc() result
+        :return: True if the result was cached
+        :rtype: bool
+        """
+
+        error = result.get("error")
+
+        if error == RadioErrors.SUCCESS:
+            ttl = self.ttl
+        elif error in self.negative_errors:
+            ttl = self.negative_ttl
+        else:
+            return False
+
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        # the key already has the radio model, serial & extra data
+        if self.compact and result.keys() <= {"error", "code"}:
+            entry = CalcResult(error, result.get("code"))
+        else:
+            entry = dict(result)
+
+        with self._lock:
+
+            self._entries[key] = (expires, entry)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return True
+
+    def clear(self) -> None:
+        """Remove all the cached results"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics
+
+        :return: A dictionary with the hits, misses, evictions, expirations & size counters
+        :rtype: Dict[str, int]
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
@@ -8,7 +8,7 @@
 #
 # Version      : v1.1.6
 # Python       : Python v3
-# Dependencies : requests (https://pypi.python.org/pypi/requests/)
+# Dependencies : requests (https://pypi.python.org/pypi/requests/), loaded on the first Web API request
 # Author       : Bartosz Wójcik (support@pelock.com)
 # Project      : https://www.pelock.com/products/radio-code-calculator
 # Homepage     : https://www.pelock.com
@@ -17,12 +17,19 @@
 #
 ###############################################################################
 
+from array import array
 from enum import IntEnum
-from typing import Optional, Dict, Union
-
-# required external package - install with "pip install requests"
-import requests
+from typing import Optional, Dict, Union, Iterable, Iterator, Callable
+import contextvars
+import functools
+import itertools
 import re
+import sys
+import threading
+import time
+
+from radio_code_calculator.radio_code_transport import Transport, RequestsTransport
+from radio_code_calculator.radio_code_tracing import trace_span, _traced
 
 
 class RadioErrors(IntEnum):
@@ -62,15 +69,159 @@ class RadioErrors(IntEnum):
     INVALID_LICENSE: int = 100
 
 
+# simple patterns made only of character classes with fixed repeat counts e.g. ^([A-Z]{1}[0-9]{3})$
+_SIMPLE_PATTERN = re.compile(r"^\^(\()?((?:\[[A-Za-z0-9\-]+\](?:\{[0-9]+\})?)+)(?(1)\))\$$")
+_SIMPLE_PATTERN_CLASS = re.compile(r"\[([A-Za-z0-9\-]+)\](?:\{([0-9]+)\})?")
+
+
+# trailing characters of the fixed-length records in the bytes buffers (not a part of the serial number)
+_RECORD_PADDING = b"\x00 \r\n"
+
+# number of records validated at once by the vectorized validation
+_VALIDATE_CHUNK = 1 << 20
+
+
+def _import_numpy():
+    """Import optional NumPy package
+
+    :return: numpy module or None if it's not installed
+    """
+
+    try:
+        # optional external package - install with "pip install numpy"
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _character_class(class_pattern: str) -> str:
+    """Expand the character class body (e.g. "a-zA-Z0-9") to the string of all the matching characters
+
+    :param str class_pattern: Character class body without the brackets
+    :return: All the characters matching the class
+    :rtype: str
+    """
+
+    characters = []
+    i = 0
+
+    while i < len(class_pattern):
+
+        # range e.g. A-Z ("-" at the beginning or at the end is a literal)
+        if i + 2 < len(class_pattern) and class_pattern[i + 1] == "-":
+            characters.extend(chr(c) for c in range(ord(class_pattern[i]), ord(class_pattern[i + 2]) + 1))
+            i += 3
+        else:
+            characters.append(class_pattern[i])
+            i += 1
+
+    return "".join(sorted(set(characters)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _pattern_positions(pattern: str) -> Optional[tuple[str, ...]]:
+    """Convert a simple fixed-length character class pattern to the list of allowed characters for each position
+
+    :param str pattern: Regex pattern e.g. ^([A-Z]{1}[0-9]{3})$
+    :return: Allowed characters for each position, or None if the pattern isn't a simple one
+    :rtype: Optional[tuple[str, ...]]
+    """
+
+    match = _SIMPLE_PATTERN.match(pattern)
+
+    if match is None:
+        return None
+
+    positions: list[str] = []
+
+    for class_pattern, count in _SIMPLE_PATTERN_CLASS.findall(match.group(2)):
+        positions.extend([_character_class(class_pattern)] * int(count or 1))
+
+    return tuple(positions)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_validator(pattern: Optional[str], max_len: int) -> Optional[Callable[[str], bool]]:
+    """Compile the regex pattern to a function checking if the value matches it
+
+    Simple fixed-length character class patterns are checked without the regex engine, as a sequence of
+    str.strip() calls (a string made only of the allowed characters is stripped to an empty string). The validators
+    are cached, so the radio models with the same pattern share them.
+
+    :param Optional[str] pattern: Regex pattern
+    :param int max_len: Expected length of the value
+    :return: A function returning True if the value matches the pattern, or None if there's no pattern
+    :rtype: Optional[Callable[[str], bool]]
+    """
+
+    if pattern is None:
+        return None
+
+    positions = _pattern_positions(pattern)
+
+    # fall back to the precompiled regex, also when the pattern length differs from the max. length
+    if positions is None or len(positions) != max_len:
+        regex = re.compile(pattern)
+        return lambda value: regex.match(value) is not None
+
+    # group the consecutive positions with the same character class
+    segments: list[tuple[int, int, str]] = []
+
+    for index, characters in enumerate(positions):
+        if segments and segments[-1][2] == characters:
+            segments[-1] = (segments[-1][0], index + 1, characters)
+        else:
+            segments.append((index, index + 1, characters))
+
+    if len(segments) == 1:
+        characters = segments[0][2]
+        return lambda value: len(value) == max_len and not value.strip(characters)
+
+    if len(segments) == 2:
+        (_, split, head), (_, _, tail) = segments
+        return lambda value: len(value) == max_len and not value[:split].strip(head) and not value[split:].strip(tail)
+
+    def validator(value: str) -> bool:
+
+        if len(value) != max_len:
+            return False
+
+        for segment_start, segment_end, characters in segments:
+            if value[segment_start:segment_end].strip(characters):
+                return False
+
+        return True
+
+    return validator
+
+
+def _intern_patterns(patterns: dict[str, str]) -> dict[str, str]:
+    """Intern the regex patterns, the same patterns are repeated in many radio models
+
+    :param dict[str, str] patterns: Regex patterns by the programming language
+    :return: A new dictionary with the interned patterns
+    :rtype: dict[str, str]
+    """
+
+    return {sys.intern(language): sys.intern(pattern) if isinstance(pattern, str) else pattern
+            for language, pattern in patterns.items()}
+
+
 class RadioModel(object):
     """A single radio model with its parameters"""
-    name: str = ""
 
-    serial_max_len: int = 0
-    _serial_regex_patterns: dict[str, str] = {}
+    # no per-instance __dict__, there can be a lot of radio models (e.g. downloaded with the list command)
+    __slots__ = ("name", "serial_max_len", "_serial_regex_patterns", "extra_max_len", "_extra_regex_patterns",
+                 "_serial_validator", "_extra_validator", "_serial_positions", "__weakref__")
+
+    name: str
+
+    serial_max_len: int
+    _serial_regex_patterns: dict[str, str]
 
-    extra_max_len: int = 0
-    _extra_regex_patterns: Optional[dict[str, str]] = None
+    extra_max_len: int
+    _extra_regex_patterns: Optional[dict[str, str]]
 
     @property
     def serial_regex_pattern(self):
@@ -103,27 +254,42 @@ class RadioModel(object):
         :param int extra_max_len: Max. extra field length
         :param Optional[Union[str, dict[str, str]]] extra_regex_pattern: Extra field single regex pattern or a dictionary
         """
-        self.name = name
+        self.name = sys.intern(name)
         self.serial_max_len = serial_max_len
 
-        # create an empty dict to prevent Python re-using previous dict from previous object (!)
+        # store the regex pattern under the key for the current programming language (compatibility), always
+        # in a new dict to prevent sharing it between the objects (!)
         self._serial_regex_patterns = {}
 
-        # store the regex pattern under the key for the current programming language (compatibility)
         if isinstance(serial_regex_pattern, str):
-            self._serial_regex_patterns["python"] = serial_regex_pattern
+            self._serial_regex_patterns["python"] = sys.intern(serial_regex_pattern)
         elif isinstance(serial_regex_pattern, dict):
-            self._serial_regex_patterns = serial_regex_pattern
+            self._serial_regex_patterns = _intern_patterns(serial_regex_pattern)
 
         # initialize extra field
         self.extra_max_len = extra_max_len
-        self._extra_regex_pattern = None
+        self._extra_regex_patterns = None
 
         if extra_max_len:
             if isinstance(extra_regex_pattern, str):
-                self._extra_regex_patterns["python"] = extra_regex_pattern
+                self._extra_regex_patterns = {"python": sys.intern(extra_regex_pattern)}
             elif isinstance(extra_regex_pattern, dict):
-                self._extra_regex_patterns = extra_regex_pattern
+                self._extra_regex_patterns = _intern_patterns(extra_regex_pattern)
+
+        # compile the validators once (shared by the models with the same patterns)
+        self._serial_validator = _compile_validator(self.serial_regex_pattern, serial_max_len)
+        self._extra_validator = _compile_validator(self.extra_regex_pattern, extra_max_len)
+
+        # allowed characters for each serial position (used by the vectorized validation)
+        self._serial_positions = _pattern_positions(self.serial_regex_pattern)
+
+        if self._serial_positions is not None and len(self._serial_positions) != serial_max_len:
+            self._serial_positions = None
+
+    def __reduce__(self):
+        # the compiled validators can't be pickled, they're compiled again (e.g. in the worker processes)
+        return RadioModel, (self.name, self.serial_max_len, self._serial_regex_patterns, self.extra_max_len,
+                            self._extra_regex_patterns)
 
     def validate(self, serial: str, extra: Optional[str] = None) -> int:
         """Validate radio serial number and extra data (if provided), check their lenghts and regex patterns
@@ -136,17 +302,137 @@ class RadioModel(object):
 
         if len(serial) != self.serial_max_len:
             return RadioErrors.INVALID_SERIAL_LENGTH
-        if re.match(self.serial_regex_pattern, serial) is None:
+        if not self._serial_validator(serial):
             return RadioErrors.INVALID_SERIAL_PATTERN
 
-        if extra is not None and len(extra) > 0:
+        if extra:
             if len(extra) != self.extra_max_len:
                 return RadioErrors.INVALID_EXTRA_LENGTH
-            if re.match(self.extra_regex_pattern, extra) is None:
+            if self._extra_validator is not None and not self._extra_validator(extra):
                 return RadioErrors.INVALID_EXTRA_PATTERN
 
         return RadioErrors.SUCCESS
 
+    def validate_many(self, serials: Union[Iterable[str], bytes, bytearray, memoryview, "numpy.ndarray"],
+                      record_len: Optional[int] = None) -> Union["numpy.ndarray", array]:
+        """Validate many radio serial numbers at once (without the extra data)
+
+        The serial numbers can be provided as a list of strings, a NumPy array of fixed-width strings (dtype S or U)
+        or a contiguous bytes buffer of fixed-length records. The records in the buffer can be padded with spaces,
+        NUL bytes or end with a new line character (e.g. "123456\\n" records of 7 bytes).
+
+        If NumPy is installed, the serial numbers are validated with vectorized per-position character class checks,
+        otherwise with the (slower) pure-Python loop.
+
+        :param serials: Radio serial numbers
+        :param Optional[int] record_len: Length of a single record in the bytes buffer (defaults to serial_max_len)
+        :return: An int8 array of RadioErrors codes for each serial number (numpy.ndarray if NumPy is installed,
+                 array.array otherwise)
+        :rtype: Union[numpy.ndarray, array]
+        """
+
+        np = _import_numpy()
+
+        if isinstance(serials, (bytes, bytearray, memoryview)):
+
+            record_len = record_len or self.serial_max_len
+
+            if len(serials) % record_len:
+                raise ValueError(f"buffer length {len(serials)} is not a multiple of the record length {record_len}")
+
+            if np is None:
+                return array("b", (self.validate(bytes(serials[offset:offset + record_len]).rstrip(_RECORD_PADDING).decode("latin-1"))
+                                   for offset in range(0, len(serials), record_len)))
+
+            records = np.frombuffer(serials, dtype=np.uint8).reshape(-1, record_len)
+            return self._validate_records(np, records, _RECORD_PADDING)
+
+        if np is None:
+            return array("b", (self.validate(serial) for serial in serials))
+
+        strings = None
+
+        if not isinstance(serials, np.ndarray):
+            strings = list(serials)
+            serials = np.array(strings, dtype=str)
+
+        if serials.size == 0:
+            return np.zeros(0, dtype=np.int8)
+
+        if serials.dtype.kind == "S":
+            records = serials.reshape(-1).view(np.uint8).reshape(-1, serials.dtype.itemsize)
+        elif serials.dtype.kind == "U":
+            records = serials.reshape(-1).view(np.uint32).reshape(-1, serials.dtype.itemsize // 4)
+        else:
+            return np.fromiter((self.validate(serial) for serial in serials), dtype=np.int8, count=len(serials))
+
+        errors = self._validate_records(np, records, b"\x00")
+
+        # NumPy drops the trailing NUL characters of the strings, validate the strings with NULs one by one
+        if strings is not None and "\x00" in "".join(strings):
+            for index, serial in enumerate(strings):
+                if "\x00" in serial:
+                    errors[index] = self.validate(serial)
+
+        return errors
+
+    def _validate_records(self, np, records: "numpy.ndarray", padding: bytes) -> "numpy.ndarray":
+        """Validate a matrix of fixed-length records (one character code per cell)
+
+        :param np: NumPy module
+        :param numpy.ndarray records: Matrix of character codes (one record per row)
+        :param bytes padding: Trailing characters not counted as the part of the serial number
+        :return: An int8 array of RadioErrors codes for each record
+        :rtype: numpy.ndarray
+        """
+
+        count, width = records.shape
+        errors = np.full(count, RadioErrors.INVALID_SERIAL_LENGTH, dtype=np.int8)
+
+        if width < self.serial_max_len:
+            return errors
+
+        # complex patterns can't be validated per-position, decode the records and use the compiled validator
+        if self._serial_positions is None or self.serial_max_len == 0:
+            for index, record in enumerate(records):
+                errors[index] = self.validate("".join(map(chr, record)).rstrip(padding.decode("latin-1")))
+            return errors
+
+        # per-position lookup tables (character code -> allowed), code points above 255 are never allowed
+        tables = np.zeros((self.serial_max_len, 256), dtype=bool)
+
+        for position, characters in enumerate(self._serial_positions):
+            tables[position, np.frombuffer(characters.encode("latin-1"), dtype=np.uint8)] = True
+
+        padding_table = np.zeros(256, dtype=bool)
+        padding_table[np.frombuffer(padding, dtype=np.uint8)] = True
+
+        # process the records in chunks to keep the temporary arrays small
+        for start in range(0, count, _VALIDATE_CHUNK):
+
+            chunk = records[start:start + _VALIDATE_CHUNK]
+
+            if chunk.dtype != np.uint8:
+                chunk = np.minimum(chunk, 255).astype(np.uint8)
+
+            # the padding characters are never allowed in the serial numbers, so the serial length is valid if
+            # the last serial character isn't a padding and all the characters after it are
+            valid_length = ~padding_table[chunk[:, self.serial_max_len - 1]]
+
+            for position in range(self.serial_max_len, width):
+                valid_length &= padding_table[chunk[:, position]]
+
+            valid_pattern = valid_length.copy()
+
+            for position in range(self.serial_max_len):
+                valid_pattern &= tables[position, chunk[:, position]]
+
+            chunk_errors = errors[start:start + _VALIDATE_CHUNK]
+            chunk_errors[valid_length] = RadioErrors.INVALID_SERIAL_PATTERN
+            chunk_errors[valid_pattern] = RadioErrors.SUCCESS
+
+        return errors
+
 
 class RadioModels(object):
     """Supported radio models with the validation parameters (max. length & regex pattern)"""
@@ -166,6 +452,299 @@ class RadioModels(object):
     ECLIPSE_ESN: RadioModel = RadioModel("eclipse-esn", 6, r"^([a-zA-Z0-9]{6})$")
     JAGUAR_ALPINE: RadioModel = RadioModel("jaguar-alpine", 5, r"^([0-9]{5})$")
 
+    @classmethod
+    def all(cls) -> list[RadioModel]:
+        """Return all the predefined radio models
+
+        :return: A list of predefined RadioModels
+        :rtype: list[RadioModel]
+        """
+        return [value for value in vars(cls).values() if isinstance(value, RadioModel)]
+
+    @classmethod
+    def by_name(cls, name: str) -> Optional[RadioModel]:
+        """Find the predefined radio model by its name
+
+        :param str name: Radio model name e.g. "ford-m-series"
+        :return: Radio model or None if there's no such predefined model
+        :rtype: Optional[RadioModel]
+        """
+        for radio_model in cls.all():
+            if radio_model.name == name:
+                return radio_model
+        return None
+
+
+class CalcResult(object):
+    """Compact calc() result (returned instead of the raw results dictionary with typed_results=True)
+
+    Only the error code & the radio code of the raw results are kept. The read-only dictionary-style access to them
+    (result["code"], result.get("code"), "code" in result, keys(), dict(result)) is supported, so the code reading the
+    raw results keeps working. The other fields are only the attributes.
+    """
+
+    __slots__ = ("error", "code", "radio_model", "serial", "extra")
+
+    #
+    # @var tuple[str] keys of the raw results available with the dictionary-style access
+    #
+    _KEYS = ("error", "code")
+
+    def __init__(self, error: int, code: Optional[str] = None, radio_model: str = "", serial: str = "", extra: str = ""):
+        """Initialize the calc() result
+
+        :param int error: One of the RadioErrors
+        :param Optional[str] code: Radio code (None on error)
+        :param str radio_model: Radio model name
+        :param str serial: Radio serial number
+        :param str extra: Extra data
+        """
+
+        self.error = error
+        self.code = code
+        self.radio_model = sys.intern(radio_model)
+        self.serial = serial
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, result: Dict, key: Optional[tuple] = None) -> "CalcResult":
+        """Create the calc() result from the raw results
+
+        :param Dict result: Raw calc() results
+        :param Optional[tuple] key: (radio model name, serial number, extra data)
+        :return: Compact calc() result
+        :rtype: CalcResult
+        """
+
+        return cls(result["error"], result.get("code"), *(key or ()))
+
+    def to_dict(self) -> Dict:
+        """Convert to the raw results dictionary
+
+        :return: A dictionary with the error code and the radio code (if there's one)
+        :rtype: Dict
+        """
+
+        if self.code is None:
+            return {"error": self.error}
+
+        return {"error": self.error, "code": self.code}
+
+    def keys(self) -> list[str]:
+        """Keys of the raw results
+
+        :return: ["error", "code"] or ["error"] if there's no radio code
+        :rtype: list[str]
+        """
+        return ["error"] if self.code is None else ["error", "code"]
+
+    def __contains__(self, name) -> bool:
+        return name in self._KEYS and (name != "code" or self.code is not None)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __getitem__(self, name: str):
+
+        if name not in self:
+            raise KeyError(name)
+
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __eq__(self, other) -> bool:
+
+        if not isinstance(other, CalcResult):
+            return NotImplemented
+
+        return (self.error, self.code, self.radio_model, self.serial, self.extra) == \
+            (other.error, other.code, other.radio_model, other.serial, other.extra)
+
+    def __repr__(self) -> str:
+        return f"CalcResult(error={self.error!r}, code={self.code!r}, radio_model={self.radio_model!r}, " \
+               f"serial={self.serial!r}, extra={self.extra!r})"
+
+
+def _calc_return(result: Dict, key: Optional[tuple], typed_results: bool) -> tuple:
+    """Build the calc() return value
+
+    :param Dict result: Raw calc() results
+    :param Optional[tuple] key: (radio model name, serial number, extra data) or None for invalid input
+    :param bool typed_results: Return a CalcResult instead of the raw results dictionary
+    :return: A list with an error code, and the raw results dictionary or a CalcResult
+    :rtype: tuple
+    """
+
+    if typed_results:
+        return result["error"], CalcResult.from_dict(result, key)
+
+    return result["error"], result
+
+
+def _calc_params(radio_model: Union[RadioModel, str], radio_serial_number: str, radio_extra_data: str = "") -> Dict[str, str]:
+    """Build the Web API parameters for the calc command
+
+    :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+    :param str radio_serial_number: Radio serial number / pre code
+    :param str radio_extra_data: Optional extra data
+    :return: A dictionary with the request parameters
+    :rtype: Dict[str, str]
+    """
+
+    return {
+        "command": "calc",
+        "radio_model": radio_model if isinstance(radio_model, str) else radio_model.name,
+        "serial": radio_serial_number,
+        "extra": radio_extra_data,
+    }
+
+
+def _offline_validation_error(radio_model: Union[RadioModel, str],
+                              radio_models: Dict[str, RadioModel],
+                              radio_serial_number: str,
+                              radio_extra_data: str = "") -> Optional[Dict]:
+    """Validate the calc command input offline against the known radio model
+
+    :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+    :param Dict[str, RadioModel] radio_models: Radio models downloaded with the list command (by name)
+    :param str radio_serial_number: Radio serial number / pre code
+    :param str radio_extra_data: Optional extra data
+    :return: The same error dictionary the Web API would return, or None if the input is valid (or the model is unknown)
+    :rtype: Optional[Dict]
+    """
+
+    if isinstance(radio_model, str):
+        radio_model = radio_models.get(radio_model) or RadioModels.by_name(radio_model)
+
+        # unknown radio model -> let the Web API decide
+        if radio_model is None:
+            return None
+
+    error = radio_model.validate(radio_serial_number, radio_extra_data)
+
+    if error == RadioErrors.SUCCESS:
+        return None
+
+    # copies, the caller can modify the results
+    return {
+        "error": error,
+        "serialMaxLen": radio_model.serial_max_len,
+        "serialRegexPattern": dict(radio_model._serial_regex_patterns),
+        "extraMaxLen": radio_model.extra_max_len,
+        "extraRegexPattern": dict(radio_model._extra_regex_patterns) if radio_model._extra_regex_patterns is not None else None,
+    }
+
+
+class _SingleFlight(object):
+    """Executes only one call at a time for the same key, concurrent callers wait for its result"""
+
+    class _Call(object):
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Optional[Dict] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[tuple, _SingleFlight._Call] = {}
+
+    def do(self, key: tuple, function: Callable[[], Dict], deadline: Optional[float] = None) -> Dict:
+        """Execute the function or wait for the result of the same call in flight
+
+        :param tuple key: Call key (identical calls have equal keys)
+        :param Callable[[], Dict] function: Function to execute
+        :param Optional[float] deadline: time.monotonic() deadline of the waiting caller (None - no deadline)
+        :return: The function result (a copy for the waiting callers, ERROR_CONNECTION if it doesn't come in time)
+        :rtype: Dict
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _SingleFlight._Call()
+
+        if not leader:
+            # the caller's own deadline, the call in flight might take longer
+            if not call.done.wait(None if deadline is None else max(deadline - time.monotonic(), 0.0)) or call.result is None:
+                return {"error": RadioErrors.ERROR_CONNECTION}
+
+            return dict(call.result)
+
+        try:
+            call.result = function()
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+
+def _calc_key(params: Dict[str, str]) -> tuple[str, str, str]:
+    """Build the cache key of the calc command parameters
+
+    :param Dict[str, str] params: The calc command parameters
+    :return: (radio model name, serial number, extra data) tuple
+    :rtype: tuple[str, str, str]
+    """
+
+    return params["radio_model"], params["serial"], params["extra"] or ""
+
+
+def _info_params(radio_model: Union[RadioModel, str]) -> Dict[str, str]:
+    """Build the Web API parameters for the info command
+
+    :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+    :return: A dictionary with the request parameters
+    :rtype: Dict[str, str]
+    """
+
+    return {
+        "command": "info",
+        "radio_model": radio_model if isinstance(radio_model, str) else radio_model.name,
+    }
+
+
+def _radio_model_from_info(radio_model_name: str, result: Dict) -> RadioModel:
+    """Create RadioModel from the radio model parameters returned by the Web API
+
+    :param str radio_model_name: Radio model name
+    :param Dict result: Radio model parameters (serialMaxLen, serialRegexPattern, extraMaxLen, extraRegexPattern)
+    :return: Radio model
+    :rtype: RadioModel
+    """
+
+    return RadioModel(radio_model_name, result["serialMaxLen"], result["serialRegexPattern"],
+                      result["extraMaxLen"], result["extraRegexPattern"])
+
+
+def _radio_models_from_list(result: Dict) -> list[RadioModel]:
+    """Create the list of RadioModels from the list command results
+
+    :param Dict result: Results of the list command
+    :return: A list of supported RadioModels
+    :rtype: list[RadioModel]
+    """
+
+    radio_models: list[RadioModel] = []
+
+    # enumerate supported radio models and build a list of RadioModel classes
+    for radio_model_name in result["supportedRadioModels"]:
+        radio_models.append(_radio_model_from_info(radio_model_name, result["supportedRadioModels"][radio_model_name]))
+
+    return radio_models
+
+
 
 class RadioCodeCalculator(object):
     """Radio Code Calculator API module"""
@@ -180,17 +759,132 @@ class RadioCodeCalculator(object):
     # 
     _apiKey: str = ""
 
-    def __init__(self, api_key: str = ""):
+    def __init__(self,
+                 api_key: str = "",
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 keep_alive: bool = True,
+                 offline_validation: bool = False,
+                 cache=None,
+                 store=None,
+                 coalesce_requests: bool = True,
+                 model_catalog=None,
+                 transport: Optional[Transport] = None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 circuit_breaker=None,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0,
+                 timeout: Optional[float] = None,
+                 hedging=None,
+                 code_tables=None,
+                 typed_results: bool = False,
+                 metrics=None,
+                 tracer=None):
         """Initialize Radio Code Calculator API class
 
         :param str api_key: Activation key for the service (it cannot be empty!)
+        :param int pool_connections: Number of per-host connection pools to cache
+        :param int pool_maxsize: Max. number of connections kept open per host (set it to the number of worker threads)
+        :param bool keep_alive: Keep the connections open between the requests (HTTP keep-alive)
+        :param bool offline_validation: Validate calc() input offline and reject invalid input without a Web API request
+        :param Optional[RadioCodeCache] cache: Cache of the calc() results (optional)
+        :param Optional[RadioCodeStore] store: Persistent store of the calc() results, checked after the cache (optional)
+        :param bool coalesce_requests: Send identical concurrent requests only once and share the result between the callers
+        :param Optional[RadioModelCatalog] model_catalog: Cache of the list command results used by list() & info() (optional)
+        :param Optional[Transport] transport: HTTP transport (defaults to RequestsTransport with the pool settings above)
+        :param Optional[RateLimiter] rate_limiter: Limits the number of the requests per second, configured with the
+                                                   license limits on login() (optional)
+        :param Optional[RetryPolicy] retry_policy: Retry the transient failures with exponential backoff (optional)
+        :param Optional[CircuitBreaker] circuit_breaker: Fail fast with ERROR_CONNECTION while the Web API is down (optional)
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        :param Optional[float] timeout: Default deadline of each command including the retries in seconds (None - no deadline)
+        :param Optional[HedgingPolicy] hedging: Send a second calc request when the first one is slow (optional)
+        :param Optional[Iterable[RadioCodeTable]] code_tables: Memory-mapped radio code tables of the radio models with
+                                                               numeric serial numbers, checked before the cache (optional)
+        :param bool typed_results: Return the calc() results as compact CalcResult objects instead of the raw dictionaries
+        :param Optional[MetricsHook] metrics: Instrumentation hooks e.g. MetricsCollector, also set on the transport (optional)
+        :param Optional[Tracer] tracer: Traces the sampled commands with the per-phase spans (optional)
         """
 
         self._apiKey = api_key
 
-    def login(self) -> tuple[int, dict]:
+        self._pool_maxsize = pool_maxsize
+
+        # radio models downloaded with list() are used for the offline validation
+        self._offline_validation = offline_validation
+        self._radio_models: Dict[str, RadioModel] = {}
+
+        # calc() results cache & persistent store
+        self._cache = cache
+        self._store = store
+
+        # calc() returns CalcResult objects
+        self._typed_results = typed_results
+
+        # radio model name -> dense radio code table
+        self._code_tables = {table.radio_model: table for table in code_tables} if code_tables else None
+
+        # cached list command results
+        self._model_catalog = model_catalog
+
+        self._single_flight = _SingleFlight() if coalesce_requests else None
+
+        # client-side limit of the requests per second
+        self._rate_limiter = rate_limiter
+
+        # failure handling
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+
+        # default deadline of the commands
+        self._timeout = timeout
+
+        # the hedged calc requests run in the background threads
+        self._hedging = hedging
+        self._hedge_executor = None
+
+        if hedging is not None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._hedge_executor = ThreadPoolExecutor(max_workers=max(32, 4 * pool_maxsize))
+
+        # HTTP transport shared by all the commands (the HTTP stack is loaded on the first request)
+        self._transport = transport or RequestsTransport(pool_connections, pool_maxsize, keep_alive,
+                                                         connect_timeout, read_timeout)
+
+        # the transport reports the transferred bytes & the new connections
+        self._metrics = metrics
+
+        if metrics is not None:
+            self._transport.metrics = metrics
+
+        # sampled traces of the commands
+        self._tracer = tracer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP transport and release all the pooled connections, write the results buffered by the store"""
+
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+
+        self._transport.close()
+
+        # the store is shared, it's only flushed (closed by its owner)
+        if self._store is not None:
+            self._store.flush()
+
+    @_traced("login")
+    def login(self, timeout: Optional[float] = None) -> tuple[int, dict]:
         """Login to the service and get the information about the current license limits
 
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
         :return: A dictionary with an error code, and an optional dictionary with the raw results (or Null on error)
         :rtype: Optional[Dict]
         """
@@ -198,90 +892,295 @@ class RadioCodeCalculator(object):
         # parameters
         params = {"command": "login"}
 
-        result = self.post_request(params)
+        result = self.post_request(params, timeout)
+
+        # apply the license limits
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_from_license(result)
+
         return result["error"], result
 
-    def calc(self, radio_model: Union[RadioModel, str], radio_serial_number: str, radio_extra_data: str = "") -> tuple[int, dict]:
+    @_traced("calc")
+    def calc(self,
+             radio_model: Union[RadioModel, str],
+             radio_serial_number: str,
+             radio_extra_data: str = "",
+             timeout: Optional[float] = None) -> tuple[int, dict]:
         """Calculate the radio code for the selected radio model
 
         :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
         :param str radio_serial_number: Radio serial number / pre code
         :param str radio_extra_data: Optional extra data (for example - a supplier code) to generate the radio code
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
 
-        :return: A list with an error code, and an optional dictionary with the raw results (or null)
-        :rtype: tuple[int, dict]:
+        :return: A list with an error code, and an optional dictionary with the raw results (or null), or a CalcResult
+                 with typed_results=True
+        :rtype: tuple[int, Union[dict, CalcResult]]:
         """
 
         # parameters
-        params = {
-            "command": "calc",
-            "radio_model": radio_model if isinstance(radio_model, str) else radio_model.name,
-            "serial": radio_serial_number,
-            "extra": radio_extra_data,
-        }
-
-        result = self.post_request(params)
-        return result["error"], result
+        params = _calc_params(radio_model, radio_serial_number, radio_extra_data)
+
+        key = _calc_key(params)
+
+        # reject invalid input without sending the request
+        if self._offline_validation:
+            radio_models = self._radio_models
+
+            # the models from the model catalog take precedence
+            if self._model_catalog is not None and self._model_catalog.registry is not None:
+                radio_models = self._model_catalog.registry
+
+            result = _offline_validation_error(radio_model, radio_models, radio_serial_number, radio_extra_data)
+
+            if result is not None:
+                return _calc_return(result, key, self._typed_results)
+
+        # previously calculated radio code
+        table = None
+
+        if self._code_tables is not None:
+            table = self._code_tables.get(key[0])
+
+            if table is not None:
+                result = table.get(key)
+
+                if self._metrics is not None:
+                    self._metrics.record_cache("table", result is not None)
+
+                if result is not None:
+                    return _calc_return(result, key, self._typed_results)
+
+        if self._cache is not None:
+            result = self._cache.get(key)
+
+            if self._metrics is not None:
+                self._metrics.record_cache("cache", result is not None)
+
+            if result is not None:
+                return _calc_return(result, key, self._typed_results)
+
+        if self._store is not None:
+            result = self._store.get(key)
+
+            if self._metrics is not None:
+                self._metrics.record_cache("store", result is not None)
+
+            if result is not None:
+                if self._cache is not None:
+                    self._cache.put(key, result)
+
+                if table is not None:
+                    table.put(key, result)
+
+                return _calc_return(result, key, self._typed_results)
+
+        result = self.post_request(params, timeout)
+
+        if table is not None:
+            table.put(key, result)
+
+        if self._cache is not None:
+            self._cache.put(key, result)
+
+        if self._store is not None:
+            self._store.put(key, result)
+
+        return _calc_return(result, key, self._typed_results)
+
+    def calc_many(self, items: Iterable[tuple], max_workers: Optional[int] = None, ordered: bool = True) -> list[tuple]:
+        """Calculate the radio codes for many radio serial numbers at once using a pool of worker threads
+
+        :param Iterable[tuple] items: (radio_model, radio_serial_number) or (radio_model, radio_serial_number, radio_extra_data) tuples
+        :param Optional[int] max_workers: Max. number of requests in flight (defaults to the connection pool size)
+        :param bool ordered: Return the results in the input order, or in the completion order if False
+
+        :return: A list of (error code, raw results) tuples in the input order, or a list of
+                 (input index, error code, raw results) tuples in the completion order if not ordered
+        :rtype: list[tuple]
+        """
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        items = list(items)
+
+        if not items:
+            return []
+
+        if max_workers is None:
+            max_workers = self._pool_maxsize
+
+        # all the workers share the same connection pool
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+
+            futures = {executor.submit(self._calc_item, item): index for index, item in enumerate(items)}
+
+            if ordered:
+                return [future.result() for future in futures]
+
+            return [(futures[future], *future.result()) for future in as_completed(futures)]
+
+    def calc_iter(self, items: Iterable[tuple], max_workers: Optional[int] = None, window: Optional[int] = None) -> Iterator[tuple]:
+        """Calculate the radio codes for a stream of radio serial numbers, yield the results as soon as they're ready
+
+        The input is consumed lazily, at most window items are read ahead (requests in flight & results waiting to be
+        consumed), so the memory use doesn't depend on the input size. A slow consumer pauses reading the input.
+
+        :param Iterable[tuple] items: (radio_model, radio_serial_number) or (radio_model, radio_serial_number, radio_extra_data) tuples
+        :param Optional[int] max_workers: Max. number of requests in flight (defaults to the connection pool size)
+        :param Optional[int] window: Max. number of the input items read ahead (defaults to 2 * max_workers)
+
+        :return: An iterator of (input item, error code, raw results) tuples in the completion order
+        :rtype: Iterator[tuple]
+        """
+
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        if max_workers is None:
+            max_workers = self._pool_maxsize
+
+        if window is None:
+            window = 2 * max_workers
+
+        items = iter(items)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # future -> input item
+        pending = {}
+
+        def submit(count: int) -> None:
+            for item in itertools.islice(items, count):
+                pending[executor.submit(self._calc_item, item)] = item
+
+        try:
+            submit(window)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                results = [(pending.pop(future), *future.result()) for future in done]
+
+                # keep the workers busy while the consumer handles the results
+                submit(len(results))
+
+                yield from results
+
+        finally:
+            # the consumer stopped early, drop the requests not sent yet
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _calc_item(self, item: tuple) -> tuple[int, dict]:
+        """Calculate the radio code for a single calc_many() item, never raise an exception
+
+        :param tuple item: (radio_model, radio_serial_number) or (radio_model, radio_serial_number, radio_extra_data)
+        :return: A list with an error code, and a dictionary with the raw results
+        :rtype: tuple[int, dict]
+        """
+
+        try:
+            radio_model, radio_serial_number, *radio_extra_data = item
+        except (TypeError, ValueError):
+            return _calc_return({"error": RadioErrors.INVALID_INPUT}, None, self._typed_results)
+
+        if len(radio_extra_data) > 1:
+            return _calc_return({"error": RadioErrors.INVALID_INPUT}, None, self._typed_results)
+
+        try:
+            return self.calc(radio_model, radio_serial_number, *radio_extra_data)
+        except Exception as ex:
+            return _calc_return({"error": RadioErrors.ERROR_CONNECTION}, None, self._typed_results)
 
-    def info(self, radio_model: Union[RadioModel, str]) -> tuple[int, Optional[RadioModel]]:
+    @_traced("info")
+    def info(self, radio_model: Union[RadioModel, str], timeout: Optional[float] = None) -> tuple[int, Optional[RadioModel]]:
         """Get the information about the given radio calculator and its parameters (name, max. len & regex pattern)
 
         :param Union[RadioModel, str] radio_model: Radio model either as a RadioModel class or a string
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
         :return: A list with an error code, and an optional RadioModel create from the return values (or null)
         :rtype: tuple[int, Optional[RadioModel]]:
         """
 
         # parameters
-        params = {
-            "command": "info",
-            "radio_model": radio_model if isinstance(radio_model, str) else radio_model.name,
-        }
+        params = _info_params(radio_model)
+
+        # serve the model from the cached list command results
+        if self._model_catalog is not None:
+            error, registry = self._model_catalog.get(lambda: self._fetch_list(timeout))
+
+            if error != RadioErrors.SUCCESS:
+                return error, None
+
+            radio_model = registry.get(params["radio_model"])
+
+            if radio_model is None:
+                return RadioErrors.INVALID_RADIO_MODEL, None
+
+            return error, radio_model
 
         # send request
-        result = self.post_request(params)
+        result = self.post_request(params, timeout)
 
         if result["error"] != RadioErrors.SUCCESS:
             return result["error"], None
 
-        model = RadioModel(params["radio_model"], result["serialMaxLen"], result["serialRegexPattern"],
-                           result["extraMaxLen"], result["extraRegexPattern"])
+        with trace_span("model"):
+            radio_model = _radio_model_from_info(params["radio_model"], result)
 
-        return result["error"], model
+        return result["error"], radio_model
 
-    def list(self) -> tuple[int, Optional[list[RadioModel]]]:
+    @_traced("list")
+    def list(self, timeout: Optional[float] = None) -> tuple[int, Optional[list[RadioModel]]]:
         """List all the supported radio calculators and their parameters (name, max. len & regex pattern)
 
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+
         :return: A list with an error code, and an optional list of supported RadioModels (or null)
         :rtype: tuple[int, Optional[list[RadioModel]]]:
         """
 
-        # parameters
-        params = {"command": "list"}
+        # cached list command results
+        if self._model_catalog is not None:
+            error, registry = self._model_catalog.get(lambda: self._fetch_list(timeout))
+
+            if error != RadioErrors.SUCCESS:
+                return error, None
+
+            return error, [radio_model for radio_model in registry]
 
         # send request
-        result = self.post_request(params)
+        result = self._fetch_list(timeout)
 
         if result["error"] != RadioErrors.SUCCESS:
             return result["error"], None
 
-        radio_models: list[RadioModel] = []
+        with trace_span("model", count=len(result.get("supportedRadioModels", {}))):
+            radio_models = _radio_models_from_list(result)
 
-        # enumerate supported radio models and build a list of RadioModel classes
-        for radio_model_name in result["supportedRadioModels"]:
+        # remember the models for the offline validation
+        self._radio_models = {radio_model.name: radio_model for radio_model in radio_models}
 
-            radio_model = result["supportedRadioModels"][radio_model_name]
+        return result["error"], radio_models
 
-            model = RadioModel(radio_model_name, radio_model["serialMaxLen"],
-                               radio_model["serialRegexPattern"], radio_model["extraMaxLen"],
-                               radio_model["extraRegexPattern"])
-            radio_models.append(model)
+    def _fetch_list(self, timeout: Optional[float] = None) -> Dict:
+        """Send the list command
 
-        return result["error"], radio_models
+        :param Optional[float] timeout: Deadline of the command in seconds (defaults to the timeout of the instance)
+        :return: Raw results of the list command
+        :rtype: Dict
+        """
+
+        # parameters
+        params = {"command": "list"}
+
+        return self.post_request(params, timeout)
 
-    def post_request(self, params_array: Dict[str, str]) -> Dict:
+    def post_request(self, params_array: Dict[str, str], timeout: Optional[float] = None) -> Dict:
         """Send a POST request to the server
 
         :param Dict params_array: An array with the parameters
+        :param Optional[float] timeout: Deadline of the request including the retries in seconds (defaults to the
+                                        timeout of the instance)
         :return: A dictionary with the POST request results (or default error)
         :rtype: Dict
         """
@@ -290,22 +1189,178 @@ class RadioCodeCalculator(object):
         if self._apiKey:
             params_array["key"] = self._apiKey
 
+        if timeout is None:
+            timeout = self._timeout
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        # slow calc requests are hedged
+        send_request = self._hedged_request if self._hedging is not None and params_array.get("command") == "calc" \
+            else self._send_request
+
+        if self._metrics is None:
+            return self._coalesced_request(send_request, params_array, deadline)
+
+        started = time.monotonic()
+
+        result = self._coalesced_request(send_request, params_array, deadline)
+
+        self._metrics.record_request(params_array.get("command", ""), params_array.get("radio_model", ""),
+                                     result.get("error"), time.monotonic() - started)
+
+        return result
+
+    def _coalesced_request(self, send_request: Callable, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request, or wait for the identical one in flight
+
+        :param Callable send_request: Request function (_send_request or _hedged_request)
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        # identical concurrent requests share a single Web API request
+        if self._single_flight is not None:
+            return self._single_flight.do(tuple(sorted(params_array.items())), lambda: send_request(params_array, deadline),
+                                          deadline)
+
+        return send_request(params_array, deadline)
+
+    def _hedged_request(self, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request, and an identical one if the first doesn't answer in time, return the first response
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        sending = threading.Event()
+
+        def primary_request() -> Dict:
+            sending.set()
+            return self._timed_request(params_array, deadline)
+
+        # the background requests are traced too
+        primary = self._hedge_executor.submit(contextvars.copy_context().run, primary_request)
+
+        # the hedge delay starts when the request is sent, the time spent waiting for a free thread is not its latency
+        if not sending.wait(None if deadline is None else max(0.0, deadline - time.monotonic())) and primary.cancel():
+            return {"error": RadioErrors.ERROR_CONNECTION}
+
+        done, pending = wait([primary], timeout=self._hedging.delay())
+
+        if done:
+            self._hedging.record_request(hedged=False)
+            return primary.result()
+
+        hedge = self._hedge_executor.submit(contextvars.copy_context().run, self._timed_request, params_array, deadline)
+        pending = {primary, hedge}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                result = future.result()
+
+                # the other request might still succeed
+                if result.get("error") != RadioErrors.ERROR_CONNECTION or not pending:
+                    self._hedging.record_request(hedged=True, hedge_won=future is hedge)
+                    return result
+
+    def _timed_request(self, params_array: Dict[str, str], deadline: Optional[float]) -> Dict:
+        """Send a POST request and record its response time for the hedging policy
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
+        started = time.monotonic()
+
+        result = self._send_request(params_array, deadline)
+
+        if result.get("error") != RadioErrors.ERROR_CONNECTION:
+            self._hedging.record(time.monotonic() - started)
+
+        return result
+
+    def _send_request(self, params_array: Dict[str, str], deadline: Optional[float] = None) -> Dict:
+        """Send a POST request to the server (without the request coalescing)
+
+        :param Dict params_array: An array with the parameters (including the activation key)
+        :param Optional[float] deadline: time.monotonic() deadline of the request including the retries (None - no deadline)
+        :return: A dictionary with the POST request results (or default error)
+        :rtype: Dict
+        """
+
         # default error -> only returned by the SDK
         default_error = {"error": RadioErrors.ERROR_CONNECTION}
 
-        try:
-            response = requests.post(self.API_URL, data=params_array)
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
 
-            # no response at all or an invalid response code
-            if not response or not response.ok:
+            # fail fast while the Web API is down
+            if self._circuit_breaker is not None and not self._circuit_breaker.allow():
                 return default_error
 
-            # decode to json array
-            result = response.json()
+            try:
+                # wait for the turn within the rate limit
+                if self._rate_limiter is not None:
+                    with trace_span("queue", kind="rate_limit"):
+                        self._rate_limiter.acquire()
 
-            # return original JSON response code
-            return result
+                # time left for this attempt
+                timeout = None if deadline is None else deadline - time.monotonic()
 
-        except Exception as ex:
+                if timeout is not None and timeout <= 0:
+
+                    # the request isn't sent, don't hold the half-open trial
+                    if self._circuit_breaker is not None:
+                        self._circuit_breaker.release()
+
+                    return default_error
+
+                with trace_span("http", attempt=attempt + 1):
+                    result = self._transport.post(self.API_URL, params_array, timeout)
+
+            except Exception as ex:
+
+                if self._metrics is not None:
+                    self._metrics.record_failure(params_array.get("command", ""), ex)
 
-            return default_error
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_exception(ex)
+
+                attempt += 1
+                delay = None if self._retry_policy is None else \
+                    self._retry_policy.backoff(attempt, started, ex, params_array.get("command"))
+
+                # no time left for another attempt
+                if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+                    return default_error
+
+                with trace_span("backoff", attempt=attempt):
+                    time.sleep(delay)
+
+                continue
+
+            except BaseException:
+
+                # cancelled (or interrupted) without an outcome, don't hold the half-open trial
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.release()
+
+                raise
+
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record_success()
+
+            # return original JSON response code
+            return result
@@ -0,0 +1,580 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - bulk file pipeline
+#
+# The radio-code-calculator console command. Streams a CSV or JSON Lines
+# file through normalization, offline validation, deduplication and
+# concurrent radio code calculation, writes the results incrementally and
+# resumes from the checkpoint after a crash.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Iterator, BinaryIO
+import json
+import os
+import re
+import sys
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioModels, RadioCodeCalculator
+
+#
+# @var str environment variable with the activation key
+#
+API_KEY_VARIABLE = "RADIO_CODE_CALCULATOR_API_KEY"
+
+#
+# @var list[str] output columns
+#
+OUTPUT_FIELDS = ["record", "radio_model", "serial", "extra", "error", "code"]
+
+#
+# @var re.Pattern separators removed from the serial numbers
+#
+_SERIAL_SEPARATORS = re.compile(r"[\s\-]+")
+
+
+def _input_format(path: str, input_format: Optional[str]) -> str:
+
+    if input_format is not None:
+        return input_format
+
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def _read_records(file: BinaryIO, input_format: str, radio_model: Optional[str], offset: int) -> Iterator[tuple]:
+    """Read the input records lazily
+
+    :param BinaryIO file: Input file
+    :param str input_format: "csv" or "jsonl"
+    :param Optional[str] radio_model: Radio model name for the inputs without the radio model column
+    :param int offset: Input offset to start at (after the header of a CSV file)
+    :return: An iterator of (end offset, record dictionary or None if it's malformed) tuples
+    :rtype: Iterator[tuple]
+    """
+
+    import csv
+
+    columns = None
+
+    if input_format == "csv":
+        first_line = file.readline()
+        # a header that isn't valid UTF-8 isn't a header, the line is read (and reported) as a record
+        first_row = next(csv.reader([first_line.decode("utf-8-sig", "replace")]), [])
+
+        # the header row is optional
+        if "serial" in (column.strip().lower() for column in first_row):
+            columns = [column.strip().lower() for column in first_row]
+        else:
+            file.seek(0)
+
+        columns = columns or (["serial", "extra"] if radio_model else ["radio_model", "serial", "extra"])
+
+    if offset > file.tell():
+        file.seek(offset)
+
+    position = file.tell()
+
+    for line in file:
+        position += len(line)
+
+        try:
+            text = line.decode("utf-8-sig").strip()
+
+            # skip empty lines
+            if not text:
+                continue
+
+            if input_format == "csv":
+                record = dict(zip(columns, next(csv.reader([text]))))
+            else:
+                record = json.loads(text)
+
+            if not isinstance(record, dict):
+                record = None
+
+        # not UTF-8 (UnicodeDecodeError is a ValueError), malformed JSON or CSV
+        except (ValueError, csv.Error):
+            record = None
+
+        if record is not None and radio_model and not record.get("radio_model"):
+            record["radio_model"] = radio_model
+
+        yield position, record
+
+
+def normalize_serial(radio_model: RadioModel, serial: str) -> str:
+    """Normalize the radio serial number (remove the spaces & dashes, fix the letter case if the model needs it)
+
+    :param RadioModel radio_model: Radio model
+    :param str serial: Radio serial number as entered by the user
+    :return: Normalized serial number
+    :rtype: str
+    """
+
+    serial = _SERIAL_SEPARATORS.sub("", serial)
+
+    if radio_model.validate(serial) != RadioErrors.SUCCESS and radio_model.validate(serial.upper()) == RadioErrors.SUCCESS:
+        return serial.upper()
+
+    return serial
+
+
+class _Checkpoint(object):
+    """SQLite database with the pipeline progress, the keys of the written results (used for deduplication) and the
+    indexes of the written malformed records (without the keys)"""
+
+    def __init__(self, path: str, restart: bool = False):
+
+        import sqlite3
+
+        if restart and os.path.exists(path):
+            os.remove(path)
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        with self._connection:
+            self._connection.execute("""CREATE TABLE IF NOT EXISTS seen (
+                                          radio_model TEXT NOT NULL,
+                                          serial TEXT NOT NULL,
+                                          extra TEXT NOT NULL,
+                                          record INTEGER NOT NULL,
+                                          outcome TEXT NOT NULL,
+                                          PRIMARY KEY (radio_model, serial, extra)
+                                        ) WITHOUT ROWID""")
+            self._connection.execute("""CREATE TABLE IF NOT EXISTS malformed (
+                                          record INTEGER PRIMARY KEY
+                                        )""")
+            self._connection.execute("""CREATE TABLE IF NOT EXISTS progress (
+                                          id INTEGER PRIMARY KEY CHECK (id = 1),
+                                          records INTEGER NOT NULL,
+                                          input_offset INTEGER NOT NULL,
+                                          output_offset INTEGER NOT NULL,
+                                          stats TEXT NOT NULL
+                                        )""")
+
+        row = self._connection.execute("SELECT records, input_offset, output_offset, stats FROM progress").fetchone()
+
+        # there's a checkpoint to resume from (the results written before it are in the output file)
+        self.resumable = row is not None
+
+        self.records, self.input_offset, self.output_offset, stats = row or (0, 0, 0, "{}")
+        self.stats: Dict[str, int] = json.loads(stats)
+
+    def reset(self) -> None:
+        """Forget the progress and the written results (start over)"""
+
+        with self._connection:
+            self._connection.execute("DELETE FROM seen")
+            self._connection.execute("DELETE FROM malformed")
+            self._connection.execute("DELETE FROM progress")
+
+        self.resumable = False
+        self.records = self.input_offset = self.output_offset = 0
+        self.stats = {}
+
+    def seen(self, key: tuple) -> Optional[tuple]:
+        """Find the written result with the same key
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :return: (record index, outcome) of the written result or None
+        :rtype: Optional[tuple]
+        """
+        return self._connection.execute("SELECT record, outcome FROM seen WHERE radio_model = ? AND serial = ? AND extra = ?",
+                                        key).fetchone()
+
+    def malformed(self, index: int) -> bool:
+        """Check if the malformed record (without the key) is written
+
+        :param int index: Record index
+        :return: True if it's written
+        :rtype: bool
+        """
+        return self._connection.execute("SELECT 1 FROM malformed WHERE record = ?", (index,)).fetchone() is not None
+
+    def commit(self, written: list, malformed: list, records: int, input_offset: int, output_offset: int,
+               stats: Dict[str, int]) -> None:
+
+        with self._connection:
+            self._connection.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?, ?)", written)
+            self._connection.executemany("INSERT OR IGNORE INTO malformed VALUES (?)", malformed)
+            # the records before the position are never read again
+            self._connection.execute("DELETE FROM malformed WHERE record < ?", (records,))
+            self._connection.execute("INSERT OR REPLACE INTO progress VALUES (1, ?, ?, ?, ?)",
+                                     (records, input_offset, output_offset, json.dumps(stats)))
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class _Progress(object):
+    """Input position before which all the records are finished, and their statistics (the records finish out of order)"""
+
+    def __init__(self, records: int, input_offset: int, stats: Dict[str, int]):
+
+        self.records = records
+        self.input_offset = input_offset
+        self.stats = {"records": 0, "invalid": 0, "duplicates": 0, "calculated": 0, "failed": 0}
+        self.stats.update(stats)
+
+        # record index -> (end offset, outcome) of the finished records after the position
+        self._finished: Dict[int, tuple] = {}
+
+    def finish(self, index: int, end_offset: int, outcome: str) -> None:
+
+        self._finished[index] = (end_offset, outcome)
+
+        while self.records in self._finished:
+            self.input_offset, outcome = self._finished.pop(self.records)
+            self.stats["records"] += 1
+            self.stats[outcome] += 1
+            self.records += 1
+
+
+class Pipeline(object):
+    """Bulk file pipeline - normalize, validate offline, deduplicate, calculate concurrently & write incrementally"""
+
+    def __init__(self,
+                 calculator: RadioCodeCalculator,
+                 input_path: str,
+                 output_path: str,
+                 checkpoint_path: Optional[str] = None,
+                 input_format: Optional[str] = None,
+                 radio_model: Optional[str] = None,
+                 workers: int = 8,
+                 window: Optional[int] = None,
+                 checkpoint_every: int = 1000,
+                 progress_every: float = 10.0,
+                 restart: bool = False,
+                 log=sys.stderr):
+        """Initialize the pipeline
+
+        :param RadioCodeCalculator calculator: Radio Code Calculator API instance
+        :param str input_path: Input file path (CSV or JSON Lines)
+        :param str output_path: Output file path (CSV or JSON Lines, by the extension)
+        :param Optional[str] checkpoint_path: Checkpoint database path (defaults to the output path + ".checkpoint")
+        :param Optional[str] input_format: "csv" or "jsonl" (defaults to the input file extension)
+        :param Optional[str] radio_model: Radio model name for the inputs without the radio model column
+        :param int workers: Number of the concurrent Web API requests
+        :param Optional[int] window: Max. number of the records read ahead (defaults to 4 * workers)
+        :param int checkpoint_every: Number of the finished records between the checkpoints
+        :param float progress_every: Number of seconds between the progress reports (0 - only the final report)
+        :param bool restart: Ignore the existing checkpoint and start over
+        :param log: Stream for the progress reports
+        """
+
+        self.calculator = calculator
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+        self.input_format = _input_format(input_path, input_format)
+        self.output_format = _input_format(output_path, None)
+        self.radio_model = radio_model
+        self.workers = workers
+        self.window = window or 4 * workers
+        self.checkpoint_every = checkpoint_every
+        self.progress_every = progress_every
+        self.restart = restart
+        self.log = log
+
+        self.stats: Dict[str, int] = {}
+        self._run_records = 0
+        self._run_calculated = 0
+
+    def _format(self, record: Dict) -> bytes:
+
+        if self.output_format == "jsonl":
+            return (json.dumps(record) + "\n").encode()
+
+        import csv
+        import io
+
+        line = io.StringIO()
+        csv.writer(line, lineterminator="\n").writerow([record.get(field, "") for field in OUTPUT_FIELDS])
+        return line.getvalue().encode()
+
+    def report(self, elapsed: float) -> str:
+        """Format the progress report
+
+        :param float elapsed: Number of seconds since the start (of this run)
+        :return: Progress report
+        :rtype: str
+        """
+
+        stats = self.stats
+        rate = self._run_records / elapsed if elapsed > 0 else 0.0
+        calc_rate = self._run_calculated / elapsed if elapsed > 0 else 0.0
+
+        return (f"records {stats['records']} | invalid {stats['invalid']} | duplicates {stats['duplicates']} | "
+                f"calculated {stats['calculated']} | failed {stats['failed']} | "
+                f"{rate:.1f} records/s | {calc_rate:.1f} calc/s | {elapsed:.1f} s")
+
+    def run(self) -> Dict[str, int]:
+        """Run the pipeline (resume from the checkpoint if there's one)
+
+        :return: Statistics - the number of the records, and the invalid, duplicates, calculated & failed ones
+        :rtype: Dict[str, int]
+        """
+
+        checkpoint = _Checkpoint(self.checkpoint_path, self.restart)
+
+        # no checkpoint, or the output file doesn't have the results it refers to (removed or replaced) -> start over
+        if not checkpoint.resumable or not os.path.exists(self.output_path) or \
+                os.path.getsize(self.output_path) < checkpoint.output_offset:
+            checkpoint.reset()
+
+        progress = _Progress(checkpoint.records, checkpoint.input_offset, checkpoint.stats)
+        self.stats = progress.stats
+
+        # throughput of this run
+        self._run_records = self._run_calculated = 0
+
+        # drop the results written after the last checkpoint, they're calculated again (the results written before
+        # it are kept even if no record is finished in order yet, the checkpoint has their keys)
+        output = open(self.output_path, "r+b" if checkpoint.resumable else "wb")
+        output.truncate(checkpoint.output_offset)
+        output.seek(0, os.SEEK_END)
+
+        if self.output_format == "csv" and output.tell() == 0:
+            output.write((",".join(OUTPUT_FIELDS) + "\n").encode())
+
+        # keys of the records in flight -> (record index, end offset), results written since the last checkpoint
+        # (and their keys, the checkpoint has only the keys written before it), malformed records written since then
+        active: Dict[tuple, tuple] = {}
+        written: list[tuple] = []
+        written_keys: set = set()
+        malformed: list[tuple] = []
+
+        started = last_report = time.monotonic()
+        finished_since_checkpoint = 0
+
+        def finish(index: int, end_offset: int, outcome: str) -> None:
+
+            nonlocal finished_since_checkpoint, last_report
+
+            progress.finish(index, end_offset, outcome)
+            finished_since_checkpoint += 1
+
+            if finished_since_checkpoint >= self.checkpoint_every:
+                commit()
+                finished_since_checkpoint = 0
+
+            if self.progress_every and time.monotonic() - last_report >= self.progress_every:
+                last_report = time.monotonic()
+                print(self.report(last_report - started), file=self.log, flush=True)
+
+        def write(index: int, end_offset: int, outcome: str, result: Dict, key: Optional[tuple]) -> None:
+
+            output.write(self._format(result))
+
+            if key is not None:
+                written.append((*key, index, outcome))
+                written_keys.add(key)
+            else:
+                malformed.append((index,))
+
+            finish(index, end_offset, outcome)
+
+        def commit() -> None:
+
+            # the results are on the disk before the checkpoint refers to them
+            output.flush()
+            os.fsync(output.fileno())
+
+            checkpoint.commit(written, malformed, progress.records, progress.input_offset, output.tell(), progress.stats)
+            written.clear()
+            written_keys.clear()
+            malformed.clear()
+
+        def items() -> Iterator[tuple]:
+            """Normalize, validate & deduplicate the records, yield the ones to calculate"""
+
+            index = checkpoint.records
+
+            with open(self.input_path, "rb") as file:
+
+                for end_offset, record in _read_records(file, self.input_format, self.radio_model, checkpoint.input_offset):
+
+                    self._run_records += 1
+
+                    error, key, radio_model = self._prepare(record)
+
+                    duplicate = key is not None and (key in active or key in written_keys)
+                    seen = None if key is None or duplicate else checkpoint.seen(key)
+
+                    if seen is not None and seen[0] == index:
+                        # written before the crash, after the last checkpoint position
+                        finish(index, end_offset, seen[1])
+
+                    elif key is None and checkpoint.malformed(index):
+                        finish(index, end_offset, "invalid")
+
+                    elif duplicate or seen is not None:
+                        finish(index, end_offset, "duplicates")
+
+                    elif error is not None:
+                        result = {"record": index + 1, "error": int(error)}
+
+                        if key is not None:
+                            result.update(radio_model=key[0], serial=key[1], extra=key[2])
+
+                        write(index, end_offset, "invalid", result, key)
+
+                    else:
+                        active[key] = (index, end_offset)
+                        yield radio_model, key[1], key[2]
+
+                    index += 1
+
+        try:
+            for (radio_model, serial, extra), error, result in self.calculator.calc_iter(items(), self.workers, self.window):
+
+                key = (radio_model.name, serial, extra)
+                index, end_offset = active.pop(key)
+
+                self._run_calculated += 1
+
+                write(index, end_offset, "calculated" if error == RadioErrors.SUCCESS else "failed",
+                      {"record": index + 1, "radio_model": radio_model.name, "serial": serial, "extra": extra,
+                       "error": int(error), "code": result.get("code", "")}, key)
+
+            commit()
+
+        finally:
+            output.close()
+            checkpoint.close()
+
+        print(self.report(time.monotonic() - started), file=self.log, flush=True)
+
+        return dict(self.stats)
+
+    @staticmethod
+    def _prepare(record: Optional[Dict]) -> tuple:
+        """Normalize & validate the input record offline
+
+        :param Optional[Dict] record: Input record
+        :return: (error code or None if it's valid, (radio model name, serial, extra) key or None, RadioModel or None)
+        :rtype: tuple
+        """
+
+        if record is None or not isinstance(record.get("serial"), str) or not isinstance(record.get("radio_model"), str):
+            return RadioErrors.INVALID_INPUT, None, None
+
+        name = record["radio_model"].strip().lower()
+        extra = str(record.get("extra") or "").strip()
+
+        radio_model = RadioModels.by_name(name)
+
+        if radio_model is None:
+            return RadioErrors.INVALID_RADIO_MODEL, (name, record["serial"].strip(), extra), None
+
+        serial = normalize_serial(radio_model, record["serial"])
+        key = (name, serial, extra)
+
+        error = radio_model.validate(serial, extra)
+
+        if error != RadioErrors.SUCCESS:
+            return error, key, radio_model
+
+        return None, key, radio_model
+
+
+def main(argv: Optional[list] = None) -> int:
+    """radio-code-calculator console command
+
+    :param Optional[list] argv: Command line arguments (defaults to sys.argv)
+    :return: Exit code
+    :rtype: int
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="radio-code-calculator",
+                                     description="Calculate the radio codes for a CSV or JSON Lines file of radio serial numbers.")
+
+    parser.add_argument("input", help="input file (.csv or .jsonl) with radio_model, serial & extra columns")
+    parser.add_argument("output", help="output file (.csv or .jsonl)")
+    parser.add_argument("--api-key", default=os.environ.get(API_KEY_VARIABLE, ""),
+                        help=f"activation key (defaults to the {API_KEY_VARIABLE} environment variable)")
+    parser.add_argument("--api-url", default=RadioCodeCalculator.API_URL, help="Web API endpoint")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (defaults to the input file extension)")
+    parser.add_argument("--radio-model", help="radio model name for the inputs without the radio_model column")
+    parser.add_argument("--workers", type=int, default=8, help="number of the concurrent requests (default 8)")
+    parser.add_argument("--window", type=int, help="max. number of the records read ahead (default 4 * workers)")
+    parser.add_argument("--checkpoint", help="checkpoint database (default OUTPUT.checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="records between the checkpoints (default 1000)")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="seconds between the progress reports (default 10, 0 - off)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--store", help="persistent radio code store (SQLite database) shared between the runs")
+    parser.add_argument("--rate", type=float, help="max. number of the requests per second")
+    parser.add_argument("--retries", type=int, default=3, help="max. number of the attempts for the transient failures (default 3)")
+    parser.add_argument("--timeout", type=float, help="deadline of each request including the retries in seconds")
+
+    args = parser.parse_args(argv)
+
+    from radio_code_calculator.radio_code_rate_limiter import RateLimiter
+    from radio_code_calculator.radio_code_retry import RetryPolicy
+    from radio_code_calculator.radio_code_store import RadioCodeStore
+
+    store = calculator = None
+
+    try:
+        store = RadioCodeStore(args.store) if args.store else None
+
+        calculator = RadioCodeCalculator(args.api_key,
+                                         pool_maxsize=args.workers,
+                                         store=store,
+                                         rate_limiter=RateLimiter(args.rate) if args.rate else None,
+                                         retry_policy=RetryPolicy(max_attempts=args.retries) if args.retries > 1 else None,
+                                         timeout=args.timeout)
+        calculator.API_URL = args.api_url
+
+        pipeline = Pipeline(calculator, args.input, args.output,
+                            checkpoint_path=args.checkpoint,
+                            input_format=args.format,
+                            radio_model=args.radio_model,
+                            workers=args.workers,
+                            window=args.window,
+                            checkpoint_every=args.checkpoint_every,
+                            progress_every=args.progress_every,
+                            restart=args.restart)
+
+        stats = pipeline.run()
+
+    except KeyboardInterrupt:
+        print("interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+
+    except OSError as ex:
+        print(f"radio-code-calculator: {ex}", file=sys.stderr)
+        return 1
+
+    # e.g. the checkpoint or the store database errors (sqlite3.Error), the checkpoint is kept
+    except Exception as ex:
+        print(f"radio-code-calculator: {type(ex).__name__}: {ex}", file=sys.stderr)
+        return 1
+
+    finally:
+        if calculator is not None:
+            calculator.close()
+
+        if store is not None:
+            store.close()
+
+    return 0 if stats["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - hedged requests
+#
+# Send a second identical calc request when the first one is slower than
+# most of the recent requests, and use whichever response comes first.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from collections import deque
+from typing import Optional, Dict, Union
+import threading
+
+
+class HedgingPolicy(object):
+    """Decide when to send the hedged (second) calc request, based on the recent response times
+
+    The hedged request is sent when the first one hasn't answered within the given percentile of the recent response
+    times, so only the slowest requests (about 100 - percentile % of them) are sent twice.
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 initial_delay: float = 1.0,
+                 min_delay: float = 0.01,
+                 max_delay: Optional[float] = None,
+                 window: int = 1000,
+                 min_samples: int = 20):
+        """Initialize the hedging policy
+
+        :param float percentile: Percentile of the recent response times after which the hedged request is sent
+        :param float initial_delay: Delay used until there are enough response times recorded (in seconds)
+        :param float min_delay: Min. delay before the hedged request in seconds
+        :param Optional[float] max_delay: Max. delay before the hedged request in seconds (optional)
+        :param int window: Number of the recent response times used to compute the percentile
+        :param int min_samples: Number of the response times required to compute the percentile
+        """
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+        # cached percentile, and the number of the response times recorded since it was computed
+        self._delay: Optional[float] = None
+        self._stale = 0
+
+        # statistics
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, latency: float) -> None:
+        """Record the response time
+
+        :param float latency: Response time in seconds
+        """
+
+        with self._lock:
+            self._latencies.append(latency)
+            self._stale += 1
+
+    def delay(self) -> float:
+        """Get the delay after which the hedged request is sent
+
+        :return: Delay in seconds
+        :rtype: float
+        """
+
+        with self._lock:
+
+            if len(self._latencies) < self.min_samples:
+                delay = self.initial_delay
+
+            else:
+                # sorting the whole window for every request would be wasteful
+                if self._delay is None or self._stale >= max(1, len(self._latencies) // 10):
+                    latencies = sorted(self._latencies)
+                    index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100.0))
+                    self._delay = latencies[index]
+                    self._stale = 0
+
+                delay = self._delay
+
+        delay = max(self.min_delay, delay)
+
+        return delay if self.max_delay is None else min(self.max_delay, delay)
+
+    def record_request(self, hedged: bool, hedge_won: bool = False) -> None:
+        """Record the outcome of the request
+
+        :param bool hedged: The hedged request was sent
+        :param bool hedge_won: The response of the hedged request was used
+        """
+
+        with self._lock:
+            self.requests += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get the hedging statistics
+
+        :return: A dictionary with the requests, hedged & hedge_wins counters and the current delay in seconds
+        :rtype: Dict[str, Union[int, float]]
+        """
+
+        delay = self.delay()
+
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "delay": delay,
+            }
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - load generator
+#
+# Drive the sync, bulk (calc_iter) and asyncio calc() paths at a target
+# request rate and report the throughput and the latency percentiles, for
+# the capacity planning against the local stand-in Web API server.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Union
+import itertools
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioModel, RadioModels, RadioCodeCalculator, _pattern_positions
+from radio_code_calculator.radio_code_metrics import _error_name
+
+#
+# @var tuple[str] load generator modes (the calc() paths of the SDK)
+#
+LOAD_MODES = ("sync", "bulk", "async")
+
+
+def _percentile(latencies: list, fraction: float) -> float:
+    """Nearest-rank percentile of the sorted latencies"""
+
+    if not latencies:
+        return 0.0
+
+    return latencies[min(len(latencies) - 1, max(0, int(fraction * len(latencies) + 0.5) - 1))]
+
+
+class LoadReport(object):
+    """Results of the load generator run"""
+
+    def __init__(self, mode: str, target_rps: float, duration: float, latencies: list, errors: list):
+        """Initialize the report
+
+        :param str mode: Load generator mode ("sync", "bulk" or "async")
+        :param float target_rps: Target number of the requests per second (0 - as fast as possible)
+        :param float duration: Duration of the run in seconds
+        :param list latencies: Latency of each request in seconds
+        :param list errors: Error code of each request
+        """
+
+        self.mode = mode
+        self.target_rps = target_rps
+        self.duration = duration
+        self.latencies = sorted(latencies)
+
+        # RadioErrors name -> count
+        self.errors: Dict[str, int] = {}
+
+        for error in errors:
+            name = _error_name(error)
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    @property
+    def requests(self) -> int:
+        """Number of the finished requests"""
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Finished requests per second"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Latency percentile in seconds
+
+        :param float fraction: Percentile (0.99 - p99)
+        :return: Latency in seconds
+        :rtype: float
+        """
+
+        return _percentile(self.latencies, fraction)
+
+    def to_dict(self) -> Dict:
+        """Convert the report to a dictionary (e.g. to save it as JSON)
+
+        :return: The report with the latencies in seconds
+        :rtype: Dict
+        """
+
+        return {
+            "mode": self.mode,
+            "target_rps": self.target_rps,
+            "duration": self.duration,
+            "requests": self.requests,
+            "throughput": self.throughput,
+            "errors": dict(self.errors),
+            "latency": {
+                "p50": self.percentile(0.5),
+                "p95": self.percentile(0.95),
+                "p99": self.percentile(0.99),
+                "max": self.latencies[-1] if self.latencies else 0.0,
+                "mean": sum(self.latencies) / len(self.latencies) if self.latencies else 0.0,
+            },
+        }
+
+    def __str__(self) -> str:
+
+        latency = self.to_dict()["latency"]
+        target = f"{self.target_rps:g} rps" if self.target_rps else "unlimited"
+        errors = ", ".join(f"{name} {count}" for name, count in sorted(self.errors.items()))
+
+        return (f"{self.mode} ({target}): {self.requests} requests in {self.duration:.1f} s | "
+                f"{self.throughput:.1f} requests/s | p50 {latency['p50'] * 1000:.1f} ms | "
+                f"p95 {latency['p95'] * 1000:.1f} ms | p99 {latency['p99'] * 1000:.1f} ms | "
+                f"max {latency['max'] * 1000:.1f} ms | {errors}")
+
+
+class LoadGenerator(object):
+    """Sends calc() requests at the target rate through one of the SDK paths
+
+    The requests are scheduled at fixed intervals (open loop), the latency of each request is measured from its
+    scheduled start, so the time waiting for a free worker when the client falls behind is included (no coordinated
+    omission). With the target rate 0 the requests are sent back-to-back (closed loop) to find the max. throughput.
+    """
+
+    def __init__(self,
+                 api_url: str,
+                 api_key: str,
+                 radio_model: RadioModel = RadioModels.FORD_M_SERIES,
+                 seed: Optional[int] = None,
+                 **calculator_options):
+        """Initialize the load generator
+
+        :param str api_url: Web API endpoint (e.g. StandInServer.url)
+        :param str api_key: Activation key
+        :param RadioModel radio_model: Radio model of the calculated radio codes (with the random serial numbers)
+        :param Optional[int] seed: Random seed of the serial numbers
+        :param calculator_options: RadioCodeCalculator / AsyncRadioCodeCalculator options (e.g. transport, cache)
+        """
+
+        import random
+
+        positions = _pattern_positions(radio_model.serial_regex_pattern)
+
+        if positions is None or len(positions) != radio_model.serial_max_len:
+            raise ValueError(f"cannot generate the serial numbers of {radio_model.name}")
+
+        self.api_url = api_url
+        self.api_key = api_key
+        self.radio_model = radio_model
+        self.calculator_options = calculator_options
+
+        self._positions = positions
+        self._random = random.Random(seed)
+
+    def _items(self, count: int) -> list:
+
+        return [(self.radio_model, "".join(self._random.choice(characters) for characters in self._positions))
+                for _ in range(count)]
+
+    def _calculator(self, **options) -> RadioCodeCalculator:
+
+        calculator = RadioCodeCalculator(self.api_key, **{**options, **self.calculator_options})
+        calculator.API_URL = self.api_url
+
+        return calculator
+
+    def run(self, mode: str, rps: float, duration: float, workers: int = 16) -> LoadReport:
+        """Run the load
+
+        :param str mode: "sync" (calc() from the worker threads), "bulk" (calc_iter()) or "async" (AsyncRadioCodeCalculator)
+        :param float rps: Target number of the requests per second (0 - as fast as possible)
+        :param float duration: Duration of the run in seconds
+        :param int workers: Number of the worker threads, or the max. concurrency of the asyncio client
+        :return: Throughput & latency report
+        :rtype: LoadReport
+        """
+
+        if mode == "sync":
+            return self.run_sync(rps, duration, workers)
+
+        if mode == "bulk":
+            return self.run_bulk(rps, duration, workers)
+
+        if mode == "async":
+            return self.run_async(rps, duration, workers)
+
+        raise ValueError(f"unknown mode {mode}, use one of {', '.join(LOAD_MODES)}")
+
+    def run_sync(self, rps: float, duration: float, workers: int = 16) -> LoadReport:
+        """Send calc() requests from the worker threads sharing a single RadioCodeCalculator (see run())"""
+
+        count = int(rps * duration) if rps else None
+        items = self._items(count or 100000)
+
+        latencies = []
+        errors = []
+
+        # the next request index, shared by the workers (next() of itertools.count is atomic)
+        counter = itertools.count()
+
+        with self._calculator(pool_maxsize=workers) as calculator:
+
+            started = time.monotonic()
+            deadline = started + duration
+
+            def worker() -> None:
+
+                for index in counter:
+
+                    if count is None:
+                        scheduled = time.monotonic()
+
+                        if scheduled >= deadline:
+                            return
+                    else:
+                        if index >= count:
+                            return
+
+                        scheduled = started + index / rps
+                        delay = scheduled - time.monotonic()
+
+                        if delay > 0:
+                            time.sleep(delay)
+
+                    error, _ = calculator.calc(*items[index % len(items)])
+
+                    # list.append is atomic
+                    latencies.append(time.monotonic() - scheduled)
+                    errors.append(error)
+
+            threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+            return LoadReport("sync", rps, time.monotonic() - started, latencies, errors)
+
+    def run_bulk(self, rps: float, duration: float, workers: int = 16) -> LoadReport:
+        """Send the requests through calc_iter() (see run())
+
+        The input is fed at the target rate, the latency is measured from the scheduled start of each request to the
+        moment calc_iter() yields its result (including the wait of the finished results for the next input item).
+        """
+
+        count = int(rps * duration) if rps else None
+        items = self._items(count or 100000)
+
+        latencies = []
+        errors = []
+
+        # id(input item) -> scheduled start
+        scheduled: Dict[int, float] = {}
+
+        with self._calculator(pool_maxsize=workers) as calculator:
+
+            started = time.monotonic()
+            deadline = started + duration
+
+            def paced():
+
+                for index in itertools.count():
+
+                    if count is None:
+                        if time.monotonic() >= deadline:
+                            return
+
+                        item = (*items[index % len(items)],)
+                        scheduled[id(item)] = time.monotonic()
+
+                    else:
+                        if index >= count:
+                            return
+
+                        item = items[index]
+                        scheduled[id(item)] = started + index / rps
+                        delay = scheduled[id(item)] - time.monotonic()
+
+                        if delay > 0:
+                            time.sleep(delay)
+
+                    yield item
+
+            for item, error, _ in calculator.calc_iter(paced(), max_workers=workers):
+                latencies.append(time.monotonic() - scheduled.pop(id(item)))
+                errors.append(error)
+
+            return LoadReport("bulk", rps, time.monotonic() - started, latencies, errors)
+
+    def run_async(self, rps: float, duration: float, max_concurrency: int = 100) -> LoadReport:
+        """Send the requests as asyncio tasks sharing a single AsyncRadioCodeCalculator (see run())"""
+
+        import asyncio
+
+        from radio_code_calculator.async_radio_code_calculator import AsyncRadioCodeCalculator
+
+        count = int(rps * duration) if rps else None
+        items = self._items(count or 100000)
+
+        latencies = []
+        errors = []
+
+        async def send(calculator, item: tuple, scheduled: float) -> None:
+
+            error, _ = await calculator.calc(*item)
+
+            latencies.append(time.monotonic() - scheduled)
+            errors.append(error)
+
+        async def run() -> float:
+
+            calculator = AsyncRadioCodeCalculator(self.api_key, **{"max_concurrency": max_concurrency,
+                                                                   **self.calculator_options})
+            calculator.API_URL = self.api_url
+
+            async with calculator:
+
+                started = time.monotonic()
+                deadline = started + duration
+
+                if count is None:
+
+                    async def worker(offset: int) -> None:
+                        for index in itertools.count(offset, max_concurrency):
+                            scheduled = time.monotonic()
+
+                            if scheduled >= deadline:
+                                return
+
+                            await send(calculator, items[index % len(items)], scheduled)
+
+                    await asyncio.gather(*(worker(offset) for offset in range(max_concurrency)))
+
+                else:
+                    tasks = []
+
+                    for index in range(count):
+                        scheduled = started + index / rps
+                        delay = scheduled - time.monotonic()
+
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+
+                        tasks.append(asyncio.create_task(send(calculator, items[index], scheduled)))
+
+                    await asyncio.gather(*tasks)
+
+                return time.monotonic() - started
+
+        elapsed = asyncio.run(run())
+
+        return LoadReport("async", rps, elapsed, latencies, errors)
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Load generator command
+
+    :param Optional[list] argv: Command line arguments (defaults to sys.argv)
+    :return: Exit code
+    :rtype: int
+    """
+
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="python -m radio_code_calculator.radio_code_load_generator",
+                                     description="Load-test the Radio Code Calculator SDK against a local stand-in "
+                                                 "Web API server.")
+
+    parser.add_argument("--mode", choices=LOAD_MODES, nargs="+", default=["sync"],
+                        help="SDK paths to drive (default sync)")
+    parser.add_argument("--rps", type=float, default=100.0, help="target requests per second (default 100, 0 - unlimited)")
+    parser.add_argument("--duration", type=float, default=10.0, help="duration of each run in seconds (default 10)")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="worker threads, or the max. concurrency of the asyncio client (default 16)")
+    parser.add_argument("--radio-model", default=RadioModels.FORD_M_SERIES.name,
+                        help=f"radio model of the calculated codes (default {RadioModels.FORD_M_SERIES.name})")
+    parser.add_argument("--url", help="Web API endpoint (default - start a local stand-in server)")
+    parser.add_argument("--api-key", help="activation key (default - the key of the stand-in server)")
+    parser.add_argument("--latency", type=float, default=0.05, help="median latency of the local server in seconds (default 0.05)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="spread of the lognormal latency of the local server (default 0.5, 0 - constant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of the HTTP 503 errors of the local server")
+    parser.add_argument("--max-connections", type=int, help="connection limit of the local server")
+    parser.add_argument("--json", help="save the reports to this JSON file")
+
+    args = parser.parse_args(argv)
+
+    radio_model = RadioModels.by_name(args.radio_model)
+
+    if radio_model is None:
+        parser.error(f"unknown radio model {args.radio_model}")
+
+    server = None
+
+    if args.url is None:
+        from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, \
+            lognormal_latency
+
+        latency = lognormal_latency(args.latency, args.latency_sigma) if args.latency and args.latency_sigma else \
+            args.latency
+
+        server = StandInServer(latency=latency, error_rate=args.error_rate, max_connections=args.max_connections).start()
+
+        args.url = server.url
+        args.api_key = args.api_key or STAND_IN_ACTIVATION_KEY
+
+    reports = []
+
+    try:
+        generator = LoadGenerator(args.url, args.api_key or "", radio_model)
+
+        for mode in args.mode:
+            report = generator.run(mode, args.rps, args.duration, args.workers)
+            reports.append(report.to_dict())
+
+            print(report)
+
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(reports, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+
+    import sys
+
+    sys.exit(main())
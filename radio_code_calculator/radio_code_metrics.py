@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - metrics
+#
+# Instrumentation hooks called by the SDK and the default in-process
+# collector with the latency histograms, the outcome counters and the
+# Prometheus text format export.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from bisect import bisect_left
+from typing import Dict, Iterable, Union
+import threading
+
+from radio_code_calculator.radio_code_calculator import RadioErrors
+from radio_code_calculator.radio_code_retry import _failure_kind
+
+#
+# @var tuple[float] default upper bounds of the latency histogram buckets in seconds
+#
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsHook(object):
+    """Instrumentation hooks called by RadioCodeCalculator, AsyncRadioCodeCalculator and the transports
+
+    The methods do nothing, override the ones you need (e.g. to forward the measurements to your own metrics
+    library). The hooks are called from many threads, they must be thread-safe and fast. When no metrics object is
+    set, the SDK doesn't call anything.
+    """
+
+    def record_request(self, command: str, radio_model: str, error: int, latency: float) -> None:
+        """Record the finished Web API command (including the retries, the rate limiting & the hedged requests)
+
+        :param str command: Web API command ("calc", "info", "list" or "login")
+        :param str radio_model: Radio model name ("" for the commands without the radio model)
+        :param int error: One of the RadioErrors
+        :param float latency: Duration of the command in seconds
+        """
+
+    def record_failure(self, command: str, ex: Exception) -> None:
+        """Record the failed HTTP request (the exception is turned into RadioErrors.ERROR_CONNECTION or retried)
+
+        :param str command: Web API command
+        :param Exception ex: Exception raised by the transport
+        """
+
+    def record_transfer(self, bytes_sent: int, bytes_received: int) -> None:
+        """Record the HTTP request sent by the transport
+
+        :param int bytes_sent: Size of the request body in bytes
+        :param int bytes_received: Size of the response body in bytes
+        """
+
+    def record_connection(self) -> None:
+        """Record the new connection opened by the transport (the other requests reuse the pooled connections)"""
+
+    def record_cache(self, layer: str, hit: bool) -> None:
+        """Record the calc() lookup of the previously calculated radio code
+
+        :param str layer: "table" (RadioCodeTable), "cache" (RadioCodeCache) or "store" (RadioCodeStore)
+        :param bool hit: The radio code was found
+        """
+
+
+class _Histogram(object):
+    """Latency histogram with fixed buckets (not thread-safe, guarded by the collector lock)"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int):
+
+        # the last count is for the values above the highest bucket
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+def _error_name(error: int) -> str:
+
+    try:
+        return RadioErrors(error).name
+    except ValueError:
+        return str(error)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class MetricsCollector(MetricsHook):
+    """Default in-process metrics collector, exported as a dictionary or in the Prometheus text format
+
+    It keeps the latency histograms per command & radio model, the RadioErrors outcomes per command, the failures by
+    kind, the transferred bytes, the opened connections and the cache hits & misses.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize the metrics collector
+
+        :param Iterable[float] buckets: Upper bounds of the latency histogram buckets in seconds
+        """
+
+        self.buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all the metrics"""
+
+        with self._lock:
+            # (command, radio model) -> latency histogram
+            self._latency: Dict[tuple[str, str], _Histogram] = {}
+
+            # (command, error) -> count
+            self._errors: Dict[tuple[str, int], int] = {}
+
+            # (command, failure kind) -> count
+            self._failures: Dict[tuple[str, str], int] = {}
+
+            # (layer, hit) -> count
+            self._cache: Dict[tuple[str, bool], int] = {}
+
+            self.http_requests = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.connections = 0
+
+    def record_request(self, command: str, radio_model: str, error: int, latency: float) -> None:
+
+        # find the bucket outside of the lock
+        bucket = bisect_left(self.buckets, latency)
+
+        with self._lock:
+
+            histogram = self._latency.get((command, radio_model))
+
+            if histogram is None:
+                histogram = self._latency[(command, radio_model)] = _Histogram(len(self.buckets))
+
+            histogram.counts[bucket] += 1
+            histogram.sum += latency
+            histogram.count += 1
+
+            key = (command, error)
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def record_failure(self, command: str, ex: Exception) -> None:
+
+        key = (command, _failure_kind(ex))
+
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+
+    def record_transfer(self, bytes_sent: int, bytes_received: int) -> None:
+
+        with self._lock:
+            self.http_requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def record_connection(self) -> None:
+
+        with self._lock:
+            self.connections += 1
+
+    def record_cache(self, layer: str, hit: bool) -> None:
+
+        key = (layer, hit)
+
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Union[int, Dict]]:
+        """Get all the metrics
+
+        :return: A dictionary with the latency histograms ("latency" -> command -> radio model -> count, sum & cumulative
+                 bucket counts by the upper bound), the outcomes ("errors" -> command -> RadioErrors name -> count),
+                 the failures ("failures" -> command -> kind -> count), the cache lookups ("cache" -> layer -> hits &
+                 misses) and the http_requests, bytes_sent, bytes_received, connections & connections_reused counters
+        :rtype: Dict[str, Union[int, Dict]]
+        """
+
+        with self._lock:
+
+            latency: Dict[str, Dict[str, Dict]] = {}
+
+            for (command, radio_model), histogram in self._latency.items():
+
+                cumulative = 0
+                buckets = {}
+
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+
+                latency.setdefault(command, {})[radio_model] = {"count": histogram.count, "sum": histogram.sum,
+                                                                "buckets": buckets}
+
+            errors: Dict[str, Dict[str, int]] = {}
+
+            for (command, error), count in self._errors.items():
+                errors.setdefault(command, {})[_error_name(error)] = count
+
+            failures: Dict[str, Dict[str, int]] = {}
+
+            for (command, kind), count in self._failures.items():
+                failures.setdefault(command, {})[kind] = count
+
+            cache: Dict[str, Dict[str, int]] = {}
+
+            for (layer, hit), count in self._cache.items():
+                cache.setdefault(layer, {"hits": 0, "misses": 0})["hits" if hit else "misses"] = count
+
+            return {
+                "latency": latency,
+                "errors": errors,
+                "failures": failures,
+                "cache": cache,
+                "http_requests": self.http_requests,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "connections": self.connections,
+                "connections_reused": max(0, self.http_requests - self.connections),
+            }
+
+    def prometheus(self, prefix: str = "radio_code_calculator") -> str:
+        """Export the metrics in the Prometheus text exposition format
+
+        :param str prefix: Metric name prefix
+        :return: Metrics text (e.g. served on the /metrics endpoint)
+        :rtype: str
+        """
+
+        snapshot = self.snapshot()
+
+        lines = [f"# HELP {prefix}_request_duration_seconds Web API command duration including the retries",
+                 f"# TYPE {prefix}_request_duration_seconds histogram"]
+
+        for command, radio_models in snapshot["latency"].items():
+            for radio_model, histogram in radio_models.items():
+
+                for bound, count in histogram["buckets"].items():
+                    lines.append(f"{prefix}_request_duration_seconds_bucket"
+                                 f"{_labels(command=command, radio_model=radio_model, le=repr(float(bound)))} {count}")
+
+                labels = _labels(command=command, radio_model=radio_model)
+
+                lines.append(f"{prefix}_request_duration_seconds_bucket"
+                             f"{_labels(command=command, radio_model=radio_model, le='+Inf')} {histogram['count']}")
+                lines.append(f"{prefix}_request_duration_seconds_sum{labels} {histogram['sum']!r}")
+                lines.append(f"{prefix}_request_duration_seconds_count{labels} {histogram['count']}")
+
+        lines += [f"# HELP {prefix}_responses_total Web API command outcomes by the error code",
+                  f"# TYPE {prefix}_responses_total counter"]
+
+        for command, errors in snapshot["errors"].items():
+            for error, count in errors.items():
+                lines.append(f"{prefix}_responses_total{_labels(command=command, error=error)} {count}")
+
+        lines += [f"# HELP {prefix}_failures_total Failed HTTP requests by the failure kind",
+                  f"# TYPE {prefix}_failures_total counter"]
+
+        for command, failures in snapshot["failures"].items():
+            for kind, count in failures.items():
+                lines.append(f"{prefix}_failures_total{_labels(command=command, kind=kind)} {count}")
+
+        lines += [f"# HELP {prefix}_cache_lookups_total Radio code lookups by the cache layer and the result",
+                  f"# TYPE {prefix}_cache_lookups_total counter"]
+
+        for layer, lookups in snapshot["cache"].items():
+            for result, count in (("hit", lookups["hits"]), ("miss", lookups["misses"])):
+                lines.append(f"{prefix}_cache_lookups_total{_labels(layer=layer, result=result)} {count}")
+
+        for name, help_text in (("http_requests", "HTTP requests sent by the transport"),
+                                ("bytes_sent", "Request body bytes sent"),
+                                ("bytes_received", "Response body bytes received"),
+                                ("connections", "Connections opened by the transport"),
+                                ("connections_reused", "HTTP requests sent over the pooled connections")):
+
+            lines += [f"# HELP {prefix}_{name}_total {help_text}",
+                      f"# TYPE {prefix}_{name}_total counter",
+                      f"{prefix}_{name}_total {snapshot[name]}"]
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - client-side rate limiter
+#
+# Token bucket shared by the threads and the asyncio tasks, keeps the Web
+# API requests within the license limits.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Union
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors
+
+#
+# @var Dict[str, float] license limit fields of the login command results, and their periods in seconds
+#
+LICENSE_RATE_LIMITS = {
+    "requestsPerSecond": 1.0,
+    "requestsPerMinute": 60.0,
+    "requestsPerHour": 3600.0,
+    "requestsPerDay": 86400.0,
+}
+
+
+class RateLimiter(object):
+    """Thread-safe token bucket limiting the number of the Web API requests per second
+
+    The callers over the limit are queued (they wait for their turn in the arrival order) instead of failing. The same
+    limiter can be shared by many RadioCodeCalculator & AsyncRadioCodeCalculator instances.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        """Initialize the rate limiter
+
+        :param Optional[float] rate: Number of the requests per second (None - no limit until configured with login())
+        :param Optional[int] burst: Max. number of the requests sent at once after an idle period (defaults to 1 second of requests)
+        """
+
+        self._lock = threading.Lock()
+
+        self.rate: Optional[float] = None
+        self.burst = 1.0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+
+        # statistics
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.queued = 0
+
+        self.configure(rate, burst)
+
+    def configure(self, rate: Optional[float], burst: Optional[int] = None) -> None:
+        """Change the limits (the waiting callers keep their reserved turns)
+
+        :param Optional[float] rate: Number of the requests per second (None - no limit)
+        :param Optional[int] burst: Max. number of the requests sent at once after an idle period (defaults to 1 second of requests)
+        """
+
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+
+        with self._lock:
+            self._refill(time.monotonic())
+
+            # the bucket starts full when the limit is set for the first time
+            unlimited = self.rate is None
+
+            self.rate = rate
+            self.burst = float(burst if burst is not None else max(1.0, rate or 1.0))
+            self._tokens = self.burst if unlimited else min(self._tokens, self.burst)
+
+    def update_from_license(self, result: Dict) -> bool:
+        """Configure the limits from the login command results
+
+        The rate is taken from the strictest of the LICENSE_RATE_LIMITS fields found in result["license"], the limits
+        stay unchanged when the license doesn't define any of them.
+
+        :param Dict result: Raw results of the login command
+        :return: True if the limits were changed
+        :rtype: bool
+        """
+
+        if result.get("error") != RadioErrors.SUCCESS:
+            return False
+
+        license_info = result.get("license") or {}
+
+        rates = [float(license_info[field]) / period for field, period in LICENSE_RATE_LIMITS.items()
+                 if isinstance(license_info.get(field), (int, float)) and license_info[field] > 0]
+
+        if not rates:
+            return False
+
+        burst = license_info.get("burst")
+
+        self.configure(min(rates), int(burst) if isinstance(burst, (int, float)) and burst > 0 else None)
+        return True
+
+    def _refill(self, now: float) -> None:
+
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+
+        self._updated = now
+
+    def _reserve(self, tokens: float) -> float:
+        """Take the tokens (going into debt if there are not enough) and return how long the caller has to wait
+
+        :param float tokens: Number of the tokens
+        :return: Wait time in seconds
+        :rtype: float
+        """
+
+        with self._lock:
+
+            self.acquired += 1
+
+            if self.rate is None:
+                return 0.0
+
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+
+            wait = -self._tokens / self.rate
+
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.queued += 1
+
+            return wait
+
+    def _release(self) -> None:
+
+        with self._lock:
+            self.queued -= 1
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until the request can be sent
+
+        :param float tokens: Number of the tokens (requests)
+        :return: Time spent waiting in seconds
+        :rtype: float
+        """
+
+        wait = self._reserve(tokens)
+
+        if wait:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release()
+
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Asyncio version of acquire()
+
+        :param float tokens: Number of the tokens (requests)
+        :return: Time spent waiting in seconds
+        :rtype: float
+        """
+
+        wait = self._reserve(tokens)
+
+        if wait:
+            import asyncio
+
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release()
+
+        return wait
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get the rate limiter statistics
+
+        :return: A dictionary with the acquired, waited, queued counters and the total, average & max. wait time in seconds
+        :rtype: Dict[str, Union[int, float]]
+        """
+
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "queued": self.queued,
+                "total_wait": self.total_wait,
+                "average_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait": self.max_wait,
+            }
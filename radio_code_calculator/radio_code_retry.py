@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - retry policy & circuit breaker
+#
+# Retry the transient Web API failures with exponential backoff and stop
+# sending the requests while the Web API is down.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Iterable, Callable, Union
+import threading
+import time
+
+from radio_code_calculator.radio_code_transport import TransportConnectionError, TransportTimeoutError, \
+    TransportStatusError
+
+
+def _failure_kind(ex: Exception) -> str:
+    """Classify the failed request
+
+    :param Exception ex: Exception raised by the transport
+    :return: "timeout", "connection", "status" or "other"
+    :rtype: str
+    """
+
+    if isinstance(ex, TransportTimeoutError):
+        return "timeout"
+    if isinstance(ex, TransportConnectionError):
+        return "connection"
+    if isinstance(ex, TransportStatusError):
+        return "status"
+    return "other"
+
+
+class RetryPolicy(object):
+    """Retry the transient failures (timeouts, broken connections, 429 & 5xx responses) with exponential backoff"""
+
+    #
+    # @var frozenset[str] commands safe to send again (all the Web API commands are read-only)
+    #
+    IDEMPOTENT_COMMANDS = frozenset(["login", "list", "info", "calc"])
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 0.1,
+                 max_delay: float = 5.0,
+                 multiplier: float = 2.0,
+                 jitter: bool = True,
+                 deadline: Optional[float] = None,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 retry_timeouts: bool = True):
+        """Initialize the retry policy
+
+        :param int max_attempts: Max. number of the attempts (including the first one)
+        :param float base_delay: Delay before the first retry in seconds
+        :param float max_delay: Max. delay between the attempts in seconds
+        :param float multiplier: Delay multiplier for each subsequent retry
+        :param bool jitter: Randomize the delays (full jitter), so the clients don't retry in lockstep
+        :param Optional[float] deadline: Max. total time of all the attempts in seconds (None - no deadline)
+        :param Iterable[int] retry_statuses: HTTP response codes worth retrying
+        :param bool retry_timeouts: Retry the requests that timed out
+        """
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_timeouts = retry_timeouts
+
+        self._lock = threading.Lock()
+
+        # statistics
+        self.retries = 0
+        self.exhausted = 0
+        self.failures: Dict[str, int] = {"timeout": 0, "connection": 0, "status": 0, "other": 0}
+
+    def retryable(self, ex: Exception) -> bool:
+        """Check if the failure is transient
+
+        :param Exception ex: Exception raised by the transport
+        :return: True if the request is worth sending again
+        :rtype: bool
+        """
+
+        if isinstance(ex, TransportTimeoutError):
+            return self.retry_timeouts
+        if isinstance(ex, TransportConnectionError):
+            return True
+        if isinstance(ex, TransportStatusError):
+            return ex.status_code in self.retry_statuses
+        return False
+
+    def delay(self, attempt: int) -> float:
+        """Get the delay before the retry
+
+        :param int attempt: Number of the failed attempts so far (starting with 1)
+        :return: Delay in seconds
+        :rtype: float
+        """
+
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+
+        if self.jitter:
+            import random
+            delay = random.uniform(0.0, delay)
+
+        return delay
+
+    def backoff(self, attempt: int, started: float, ex: Exception, command: Optional[str] = None) -> Optional[float]:
+        """Decide if the failed request should be sent again
+
+        :param int attempt: Number of the failed attempts so far (starting with 1)
+        :param float started: time.monotonic() of the first attempt
+        :param Exception ex: Exception raised by the transport
+        :param Optional[str] command: Web API command
+        :return: Delay before the retry in seconds or None if the request shouldn't be retried
+        :rtype: Optional[float]
+        """
+
+        with self._lock:
+            self.failures[_failure_kind(ex)] += 1
+
+        if not self.retryable(ex) or (command is not None and command not in self.IDEMPOTENT_COMMANDS):
+            return None
+
+        delay = self.delay(attempt)
+
+        if attempt >= self.max_attempts or \
+                (self.deadline is not None and time.monotonic() + delay - started >= self.deadline):
+
+            with self._lock:
+                self.exhausted += 1
+
+            return None
+
+        with self._lock:
+            self.retries += 1
+
+        return delay
+
+    def stats(self) -> Dict[str, int]:
+        """Get the retry statistics
+
+        :return: A dictionary with the retries & exhausted counters and the failures by kind (timeout_failures,
+                 connection_failures, status_failures & other_failures)
+        :rtype: Dict[str, int]
+        """
+
+        with self._lock:
+            stats = {"retries": self.retries, "exhausted": self.exhausted}
+            stats.update({f"{kind}_failures": count for kind, count in self.failures.items()})
+            return stats
+
+
+class CircuitBreaker(object):
+    """Fail fast while the Web API is down
+
+    After failure_threshold consecutive failures the circuit opens and the requests fail immediately with
+    ERROR_CONNECTION. After recovery_timeout a single trial request is let through (half-open state), its success
+    closes the circuit, its failure opens it again. A trial without an outcome (e.g. a cancelled request) is given back
+    with release(), an abandoned trial expires after another recovery_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 on_state_change: Optional[Callable[[str, str], None]] = None):
+        """Initialize the circuit breaker
+
+        :param int failure_threshold: Number of the consecutive failures opening the circuit
+        :param float recovery_timeout: Number of seconds before a trial request is let through the open circuit
+        :param Optional[Callable[[str, str], None]] on_state_change: Called with the old and the new state on each state change
+        """
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.on_state_change = on_state_change
+
+        self._lock = threading.Lock()
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._trial_started = 0.0
+
+        # statistics
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {self.CLOSED: 0, self.OPEN: 0, self.HALF_OPEN: 0}
+
+    def _change_state(self, state: str) -> Optional[tuple[str, str]]:
+
+        if state == self.state:
+            return None
+
+        change = (self.state, state)
+
+        self.state = state
+        self.transitions[state] += 1
+
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+
+        return change
+
+    def _notify(self, change: Optional[tuple[str, str]]) -> None:
+
+        # the callback runs outside of the lock
+        if change is not None and self.on_state_change is not None:
+            self.on_state_change(*change)
+
+    def allow(self) -> bool:
+        """Check if the request can be sent
+
+        :return: True if the request can be sent, False if it should fail fast
+        :rtype: bool
+        """
+
+        change = None
+
+        with self._lock:
+
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                change = self._change_state(self.HALF_OPEN)
+                self._trial = False
+
+            now = time.monotonic()
+
+            if self.state == self.CLOSED:
+                allowed = True
+            elif self.state == self.HALF_OPEN and (not self._trial or now - self._trial_started >= self.recovery_timeout):
+                # only one trial request at a time (the lease of an abandoned trial expires)
+                self._trial = allowed = True
+                self._trial_started = now
+            else:
+                allowed = False
+                self.rejected += 1
+
+        self._notify(change)
+        return allowed
+
+    def release(self) -> None:
+        """Give back the half-open trial without an outcome (the request wasn't sent or it was cancelled)"""
+
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial = False
+
+    def record_success(self) -> None:
+        """Record the successful request"""
+
+        with self._lock:
+            self._failures = 0
+            self._trial = False
+            change = self._change_state(self.CLOSED)
+
+        self._notify(change)
+
+    def record_failure(self) -> None:
+        """Record the failed request"""
+
+        change = None
+
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                change = self._change_state(self.OPEN)
+
+                # restart the recovery timeout even if another thread opened the circuit already
+                self._opened_at = time.monotonic()
+
+        self._notify(change)
+
+    def record_exception(self, ex: Exception) -> None:
+        """Record the request failed with the exception (the client errors like 404 mean the Web API is up)
+
+        :param Exception ex: Exception raised by the transport
+        """
+
+        if isinstance(ex, TransportStatusError) and ex.status_code < 500 and ex.status_code != 429:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """Get the circuit breaker statistics
+
+        :return: A dictionary with the current state, the number of the consecutive failures, the rejected requests and
+                 the number of the transitions to each state (opened, half_opened & closed)
+        :rtype: Dict[str, Union[str, int]]
+        """
+
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self._failures,
+                "rejected": self.rejected,
+                "opened": self.transitions[self.OPEN],
+                "half_opened": self.transitions[self.HALF_OPEN],
+                "closed": self.transitions[self.CLOSED],
+            }
+
@@ -0,0 +1,413 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - local stand-in Web API server
+#
+# HTTP server implementing the login, calc, info & list commands and their
+# error codes, with configurable latency, error injection and connection
+# limits. Point RadioCodeCalculator.API_URL at it to test or load-test the
+# SDK without the network and without using the license quota.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Callable, Iterable, Union
+from urllib.parse import parse_qs
+import json
+import random
+import socket
+import sys
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioModels
+
+#
+# @var str activation key accepted by the stand-in server
+#
+STAND_IN_ACTIVATION_KEY = "ABCD-ABCD-ABCD-ABCD"
+
+#
+# @var list[RadioModel] radio models known to the stand-in server by default
+#
+STAND_IN_RADIO_MODELS = RadioModels.all()
+
+
+def stand_in_code(radio_model: str, serial: str, extra: str = "") -> str:
+    """Deterministic (fake) radio code for the given input
+
+    :param str radio_model: Radio model name
+    :param str serial: Radio serial number
+    :param str extra: Extra data
+    :return: Radio code
+    :rtype: str
+    """
+
+    return f"{sum(map(ord, radio_model + serial + extra)) % 10000:04d}"
+
+
+def model_params(radio_model: RadioModel) -> Dict:
+    """Radio model parameters as returned by the info & list commands
+
+    :param RadioModel radio_model: Radio model
+    :return: serialMaxLen, serialRegexPattern, extraMaxLen & extraRegexPattern
+    :rtype: Dict
+    """
+
+    return {
+        "serialMaxLen": radio_model.serial_max_len,
+        "serialRegexPattern": {"python": radio_model.serial_regex_pattern},
+        "extraMaxLen": radio_model.extra_max_len,
+        "extraRegexPattern": None if radio_model.extra_regex_pattern is None else
+        {"python": radio_model.extra_regex_pattern},
+    }
+
+
+#
+# @var Dict[str, RadioModel] default radio models by name
+#
+_STAND_IN_MODELS = {radio_model.name: radio_model for radio_model in STAND_IN_RADIO_MODELS}
+
+
+def stand_in_response(params: Dict[str, str],
+                      radio_models: Optional[Dict[str, RadioModel]] = None,
+                      api_key: str = STAND_IN_ACTIVATION_KEY) -> Dict:
+    """Web API response for the request parameters (shared with the in-process fake transports)
+
+    :param Dict[str, str] params: Request parameters
+    :param Optional[Dict[str, RadioModel]] radio_models: Known radio models by name (defaults to STAND_IN_RADIO_MODELS)
+    :param str api_key: Accepted activation key
+    :return: Web API response
+    :rtype: Dict
+    """
+
+    if params.get("key") != api_key:
+        return {"error": RadioErrors.INVALID_LICENSE}
+
+    command = params.get("command")
+    models = _STAND_IN_MODELS if radio_models is None else radio_models
+
+    if command == "login":
+        return {"error": RadioErrors.SUCCESS,
+                "license": {"activationStatus": True, "userName": "Stand-in", "type": 1,
+                            "expirationDate": "2099-12-31"}}
+
+    if command == "list":
+        return {"error": RadioErrors.SUCCESS,
+                "supportedRadioModels": {name: model_params(model) for name, model in models.items()}}
+
+    if command not in ("info", "calc"):
+        return {"error": RadioErrors.INVALID_COMMAND}
+
+    model = models.get(params.get("radio_model"))
+
+    if model is None:
+        return {"error": RadioErrors.INVALID_RADIO_MODEL}
+
+    if command == "info":
+        return {"error": RadioErrors.SUCCESS, **model_params(model)}
+
+    error = model.validate(params.get("serial", ""), params.get("extra", ""))
+
+    if error != RadioErrors.SUCCESS:
+        return {"error": error, **model_params(model)}
+
+    return {"error": RadioErrors.SUCCESS,
+            "code": stand_in_code(model.name, params["serial"], params.get("extra", ""))}
+
+
+def uniform_latency(low: float, high: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency distribution with the response times spread evenly between the bounds
+
+    :param float low: Min. latency in seconds
+    :param float high: Max. latency in seconds
+    :param Optional[int] seed: Random seed (for reproducible runs)
+    :return: Function returning the latency of the next request in seconds
+    :rtype: Callable[[], float]
+    """
+
+    generator = random.Random(seed)
+
+    return lambda: generator.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency distribution with the long tail of the real web services
+
+    :param float median: Median latency in seconds
+    :param float sigma: Spread of the distribution (0.5 - the p99 latency is about 3.2 x the median)
+    :param Optional[int] seed: Random seed (for reproducible runs)
+    :return: Function returning the latency of the next request in seconds
+    :rtype: Callable[[], float]
+    """
+
+    import math
+
+    generator = random.Random(seed)
+    mu = math.log(median)
+
+    return lambda: generator.lognormvariate(mu, sigma)
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Web API endpoint of the stand-in server"""
+
+    # keep the connections open (HTTP keep-alive)
+    protocol_version = "HTTP/1.1"
+
+    # send the headers & the body in a single write (separate small writes stall on the delayed ACKs)
+    wbufsize = -1
+
+    def setup(self):
+
+        # close the idle keep-alive connections
+        self.timeout = self.server.idle_timeout
+
+        super().setup()
+
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+
+        server = self.server
+
+        length = int(self.headers.get("Content-Length", 0))
+        params = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode(), keep_blank_values=True).items()}
+
+        with server.stats_lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+
+            # decide the injected failures under the lock (the random generator is shared)
+            failure = server._random.random()
+
+        try:
+            latency = server.latency() if callable(server.latency) else server.latency
+
+            if latency:
+                time.sleep(latency)
+
+        finally:
+            with server.stats_lock:
+                server.in_flight -= 1
+
+        # the connection drops without a response
+        if failure < server.disconnect_rate:
+
+            with server.stats_lock:
+                server.disconnects += 1
+
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+
+        # only the Web API endpoint exists
+        if self.path != "/":
+            status, body = 404, b""
+
+        # e.g. an overloaded load balancer
+        elif failure < server.disconnect_rate + server.error_rate:
+
+            with server.stats_lock:
+                server.injected_errors += 1
+
+            status, body = server.error_status, b""
+
+        else:
+            status, body = 200, json.dumps(stand_in_response(params, server.radio_models, server.api_key)).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in Web API server running in a background thread
+
+    Each connection is served by its own thread. The latency, the injected failures and the connection limit can be
+    changed while the server is running.
+    """
+
+    daemon_threads = True
+
+    # backlog of the connections waiting for a free connection slot
+    request_queue_size = 128
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: Union[float, Callable[[], float]] = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 disconnect_rate: float = 0.0,
+                 max_connections: Optional[int] = None,
+                 idle_timeout: Optional[float] = 5.0,
+                 radio_models: Optional[Iterable[RadioModel]] = None,
+                 api_key: str = STAND_IN_ACTIVATION_KEY,
+                 seed: Optional[int] = None):
+        """Initialize the server (call start() to serve the requests)
+
+        :param str host: Address to listen on
+        :param int port: Port to listen on (0 - any free port, see url)
+        :param Union[float, Callable[[], float]] latency: Response time of each request in seconds, or a function
+                                                          returning it (e.g. lognormal_latency())
+        :param float error_rate: Fraction of the requests answered with the error_status HTTP code
+        :param int error_status: HTTP status code of the injected errors
+        :param float disconnect_rate: Fraction of the requests with the connection closed without a response
+        :param Optional[int] max_connections: Max. number of the connections served at the same time, the others wait
+                                              in the backlog (None - unlimited)
+        :param Optional[float] idle_timeout: Keep-alive connections idle this many seconds are closed (None - never)
+        :param Optional[Iterable[RadioModel]] radio_models: Supported radio models (defaults to STAND_IN_RADIO_MODELS)
+        :param str api_key: Accepted activation key
+        :param Optional[int] seed: Random seed of the injected failures (for reproducible runs)
+        """
+
+        super().__init__((host, port), StandInRequestHandler)
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.disconnect_rate = disconnect_rate
+        self.idle_timeout = idle_timeout
+        self.radio_models = None if radio_models is None else {model.name: model for model in radio_models}
+        self.api_key = api_key
+
+        self._random = random.Random(seed)
+        self._connection_slots = None if max_connections is None else threading.BoundedSemaphore(max_connections)
+        self._stopping = False
+
+        # statistics
+        self.stats_lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.injected_errors = 0
+        self.disconnects = 0
+
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Web API endpoint URL (for RadioCodeCalculator.API_URL)"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def process_request(self, request, client_address):
+
+        # wait for a free connection slot, the new connections queue up in the backlog meanwhile
+        if self._connection_slots is not None:
+            while not self._connection_slots.acquire(timeout=0.1):
+                if self._stopping:
+                    self.shutdown_request(request)
+                    return
+
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            if self._connection_slots is not None:
+                self._connection_slots.release()
+
+    def handle_error(self, request, client_address):
+
+        # the clients give up on the slow requests (timeouts, hedged requests)
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+
+        super().handle_error(request, client_address)
+
+    def start(self) -> "StandInServer":
+        """Serve the requests in a background thread
+
+        :return: The server
+        :rtype: StandInServer
+        """
+
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close the listening socket"""
+
+        self._stopping = True
+
+        if self._thread.is_alive():
+            self.shutdown()
+            self._thread.join()
+
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Run the stand-in server in the foreground
+
+    :param Optional[list] argv: Command line arguments (defaults to sys.argv)
+    :return: Exit code
+    :rtype: int
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m radio_code_calculator.radio_code_stand_in_server",
+                                     description="Run a local stand-in Radio Code Calculator Web API server.")
+
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default 8080)")
+    parser.add_argument("--latency", type=float, default=0.0, help="median response time in seconds (default 0)")
+    parser.add_argument("--latency-sigma", type=float, default=0.0,
+                        help="spread of the lognormal latency distribution (default 0 - constant latency)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of the requests failing with --error-status")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status code of the injected errors (default 503)")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="fraction of the requests dropped without a response")
+    parser.add_argument("--max-connections", type=int, help="max. number of the connections served at the same time")
+    parser.add_argument("--api-key", default=STAND_IN_ACTIVATION_KEY,
+                        help=f"accepted activation key (default {STAND_IN_ACTIVATION_KEY})")
+
+    args = parser.parse_args(argv)
+
+    latency = lognormal_latency(args.latency, args.latency_sigma) if args.latency and args.latency_sigma else args.latency
+
+    server = StandInServer(args.host, args.port, latency=latency, error_rate=args.error_rate,
+                           error_status=args.error_status, disconnect_rate=args.disconnect_rate,
+                           max_connections=args.max_connections, api_key=args.api_key)
+
+    print(f"stand-in Web API server listening on {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
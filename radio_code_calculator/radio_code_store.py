@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - persistent radio code store
+#
+# SQLite database of the calc() results shared between the processes and
+# preserved between the restarts.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Iterable, Iterator
+import json
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors
+
+
+class RadioCodeStore(object):
+    """Persistent SQLite (WAL mode) store of the calc() results, safe to share between threads and processes"""
+
+    def __init__(self,
+                 database_path: str,
+                 batch_size: int = 100,
+                 negative_errors: Iterable[int] = (),
+                 timeout: float = 30.0):
+        """Open (or create) the store
+
+        :param str database_path: SQLite database file path
+        :param int batch_size: Number of the results buffered in memory before they are written in a single transaction
+        :param Iterable[int] negative_errors: Deterministic RadioErrors to store besides SUCCESS e.g. INVALID_SERIAL_NOT_SUPPORTED
+        :param float timeout: How long to wait for the database lock held by other processes (in seconds)
+        """
+
+        self.database_path = database_path
+        self.batch_size = batch_size
+        self.negative_errors = frozenset(negative_errors)
+        self.timeout = timeout
+
+        # SQLite connections can't be shared between the threads, each thread opens its own
+        self._local = threading.local()
+        self._connections: list["sqlite3.Connection"] = []
+
+        # results waiting to be written (visible to get() until they're committed), one writer at a time
+        self._pending: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        with self._connection() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS radio_codes (
+                                    radio_model TEXT NOT NULL,
+                                    serial TEXT NOT NULL,
+                                    extra TEXT NOT NULL,
+                                    error INTEGER NOT NULL,
+                                    result TEXT NOT NULL,
+                                    created REAL NOT NULL,
+                                    PRIMARY KEY (radio_model, serial, extra)
+                                  ) WITHOUT ROWID""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _connection(self) -> "sqlite3.Connection":
+        """Return the database connection of the current thread, open it on the first use
+
+        :return: SQLite connection
+        :rtype: sqlite3.Connection
+        """
+
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+
+            import sqlite3
+
+            connection = sqlite3.connect(self.database_path, timeout=self.timeout, check_same_thread=False)
+
+            # readers don't block the writer (and the other way round) in WAL mode
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self._local.connection = connection
+
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def _storable(self, result: Dict) -> bool:
+        error = result.get("error")
+        return error == RadioErrors.SUCCESS or error in self.negative_errors
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        """Get the stored result
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :return: The stored result or None
+        :rtype: Optional[Dict]
+        """
+
+        with self._lock:
+            result = self._pending.get(key)
+
+        if result is not None:
+            return dict(result)
+
+        row = self._connection().execute("SELECT result FROM radio_codes WHERE radio_model = ? AND serial = ? AND extra = ?",
+                                         key).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: tuple, result: Dict) -> bool:
+        """Store the result if it's a successful one (or one of the configured deterministic errors)
+
+        The results are buffered and written in batches, call flush() to write them immediately.
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :param Dict result: Raw calc() result
+        :return: True if the result was stored
+        :rtype: bool
+        """
+
+        if not self._storable(result):
+            return False
+
+        with self._lock:
+            self._pending[key] = dict(result)
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self.flush()
+
+        return True
+
+    def flush(self) -> None:
+        """Write all the buffered results to the database"""
+
+        with self._flush_lock:
+
+            with self._lock:
+                pending = dict(self._pending)
+
+            if not pending:
+                return
+
+            self._write(pending.items())
+
+            # drop the written results, unless they were replaced in the meantime
+            with self._lock:
+                for key, result in pending.items():
+                    if self._pending.get(key) is result:
+                        del self._pending[key]
+
+    def _write(self, items: Iterable[tuple[tuple, Dict]]) -> int:
+
+        created = time.time()
+
+        rows = [(radio_model, serial, extra or "", int(result["error"]), json.dumps(result), created)
+                for (radio_model, serial, extra), result in items]
+
+        with self._connection() as connection:
+            connection.executemany("INSERT OR REPLACE INTO radio_codes VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        return len(rows)
+
+    def import_codes(self, items: Iterable[tuple[tuple, Dict]], batch_size: int = 10000) -> int:
+        """Bulk import the results e.g. exported from another node
+
+        :param Iterable[tuple[tuple, Dict]] items: ((radio model name, serial number, extra data), result) pairs
+        :param int batch_size: Number of the results written in a single transaction
+        :return: Number of the imported results
+        :rtype: int
+        """
+
+        count = 0
+        batch = []
+
+        for key, result in items:
+
+            if not self._storable(result):
+                continue
+
+            batch.append((tuple(key), result))
+
+            if len(batch) >= batch_size:
+                count += self._write(batch)
+                batch = []
+
+        if batch:
+            count += self._write(batch)
+
+        return count
+
+    def export_codes(self) -> Iterator[tuple[tuple, Dict]]:
+        """Export all the stored results
+
+        :return: An iterator of ((radio model name, serial number, extra data), result) pairs
+        :rtype: Iterator[tuple[tuple, Dict]]
+        """
+
+        self.flush()
+
+        cursor = self._connection().execute("SELECT radio_model, serial, extra, result FROM radio_codes")
+
+        for radio_model, serial, extra, result in cursor:
+            yield (radio_model, serial, extra), json.loads(result)
+
+    def import_jsonl(self, file_path: str) -> int:
+        """Bulk import the results from the JSON Lines file created with export_jsonl()
+
+        :param str file_path: Input file path
+        :return: Number of the imported results
+        :rtype: int
+        """
+
+        def read(file):
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    yield (record["radio_model"], record["serial"], record["extra"]), record["result"]
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            return self.import_codes(read(file))
+
+    def export_jsonl(self, file_path: str) -> int:
+        """Export all the stored results to the JSON Lines file
+
+        :param str file_path: Output file path
+        :return: Number of the exported results
+        :rtype: int
+        """
+
+        count = 0
+
+        with open(file_path, "w", encoding="utf-8") as file:
+            for (radio_model, serial, extra), result in self.export_codes():
+                file.write(json.dumps({"radio_model": radio_model, "serial": serial, "extra": extra, "result": result}) + "\n")
+                count += 1
+
+        return count
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection().execute("SELECT COUNT(*) FROM radio_codes").fetchone()[0]
+
+    def close(self) -> None:
+        """Write the buffered results and close all the database connections"""
+
+        self.flush()
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+
+        for connection in connections:
+            connection.close()
+
+        self._local = threading.local()
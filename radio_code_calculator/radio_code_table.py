@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - memory-mapped radio code tables
+#
+# Dense, array-backed tables of the radio codes for the radio models with
+# numeric serial numbers, indexed directly by the serial number value.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Union
+import os
+import re
+import struct
+import threading
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioModels
+
+#
+# @var bytes file signature
+#
+TABLE_MAGIC = b"RCTABLE1"
+
+#
+# @var int max. length of the radio model name (ASCII) in the file header
+#
+_MAX_NAME_LENGTH = 48
+
+#
+# @var struct.Struct file header - signature, serial number length, code cell width & radio model name
+#
+_HEADER = struct.Struct(f"<8sHH{_MAX_NAME_LENGTH}s")
+
+#
+# @var int offset of the presence bitmap (the header is padded to 64 bytes)
+#
+_BITMAP_OFFSET = 64
+
+#
+# @var RadioErrors the only error code stored (looking up the enum member is not free)
+#
+_SUCCESS = RadioErrors.SUCCESS
+
+#
+# @var re.Pattern serial number patterns of the radio models with fixed length numeric serial numbers
+#
+_NUMERIC_SERIAL_PATTERN = re.compile(r"\^\(?\[0-9]\{(\d+)}\)?\$")
+
+
+def numeric_serial_length(radio_model: RadioModel) -> Optional[int]:
+    """Get the serial number length of the radio model with fixed length numeric serial numbers
+
+    :param RadioModel radio_model: Radio model
+    :return: Number of the digits or None if the serial numbers are not fixed length numbers
+    :rtype: Optional[int]
+    """
+
+    match = _NUMERIC_SERIAL_PATTERN.fullmatch(radio_model.serial_regex_pattern)
+
+    return int(match.group(1)) if match else None
+
+
+class RadioCodeTable(object):
+    """Memory-mapped table of the radio codes of a single radio model with fixed length numeric serial numbers
+
+    The file holds a presence bitmap and a fixed width code cell for every possible serial number, the cell index is the
+    serial number value, so a lookup doesn't need any hashing or parsing. The file is sparse, only the pages with the
+    stored codes take the disk space. Any number of processes can map the same file read-only, the codes written by
+    the (single) writer process are visible to them immediately.
+
+    Only the results without the extra data are stored.
+    """
+
+    def __init__(self,
+                 path: str,
+                 radio_model: Union[RadioModel, str, None] = None,
+                 code_width: int = 8,
+                 readonly: bool = False,
+                 max_digits: int = 7):
+        """Open (or create) the radio code table
+
+        :param str path: Table file path
+        :param Union[RadioModel, str, None] radio_model: Radio model (required to create the table, an existing table
+                                                          must be for the same radio model)
+        :param int code_width: Max. length of the radio codes (longer codes are not stored)
+        :param bool readonly: Map the table read-only (put() is not allowed)
+        :param int max_digits: Max. serial number length (a table of 7 digit serial numbers takes 10 million cells)
+        """
+
+        import mmap
+
+        if isinstance(radio_model, str):
+            radio_model = RadioModels.by_name(radio_model)
+
+            if radio_model is None:
+                raise ValueError("unknown radio model")
+
+        self.path = path
+        self.readonly = readonly
+
+        self._lock = threading.Lock()
+
+        if not os.path.exists(path):
+
+            if readonly or radio_model is None:
+                raise FileNotFoundError(path)
+
+            digits = numeric_serial_length(radio_model)
+
+            if digits is None or digits > max_digits:
+                raise ValueError(f"{radio_model.name} doesn't have short numeric serial numbers")
+
+            # the name is not truncated in the header, the table wouldn't match the radio model
+            if not radio_model.name.isascii() or len(radio_model.name) > _MAX_NAME_LENGTH:
+                raise ValueError(f"radio model name longer than {_MAX_NAME_LENGTH} ASCII characters")
+
+            self._create(path, radio_model.name, digits, code_width)
+
+        with open(path, "rb" if readonly else "r+b") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+
+        magic, digits, code_width, name = _HEADER.unpack_from(self._mmap)
+
+        if magic != TABLE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a radio code table")
+
+        self.radio_model = name.rstrip(b"\0").decode("ascii")
+        self.digits = digits
+        self.code_width = code_width
+        self.size = 10 ** digits
+
+        if radio_model is not None and radio_model.name != self.radio_model:
+            self._mmap.close()
+            raise ValueError(f"{path} is a table of the {self.radio_model} radio model")
+
+        self._cells_offset = _BITMAP_OFFSET + (self.size + 7) // 8
+
+    @staticmethod
+    def _create(path: str, name: str, digits: int, code_width: int) -> None:
+
+        size = 10 ** digits
+
+        # write the complete file under a temporary name, so the readers never see a partial header
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(TABLE_MAGIC, digits, code_width, name.encode("ascii")).ljust(_BITMAP_OFFSET, b"\0"))
+
+            # sparse file, zero bitmap - no codes
+            file.truncate(_BITMAP_OFFSET + (size + 7) // 8 + size * code_width)
+
+        os.replace(temp_path, path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _index(self, key: tuple) -> int:
+        """Get the cell index of the key
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :return: Cell index or -1 if the key doesn't belong to the table
+        :rtype: int
+        """
+
+        radio_model, serial, extra = key
+
+        if radio_model != self.radio_model or extra or len(serial) != self.digits or \
+                not (serial.isascii() and serial.isdigit()):
+            return -1
+
+        return int(serial)
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        """Get the stored result
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :return: The stored result or None
+        :rtype: Optional[Dict]
+        """
+
+        radio_model, serial, extra = key
+
+        # the lookup path of every calc(), _index() inlined
+        if radio_model != self.radio_model or extra or len(serial) != self.digits or \
+                not (serial.isascii() and serial.isdigit()):
+            return None
+
+        index = int(serial)
+        mm = self._mmap
+
+        if not mm[_BITMAP_OFFSET + (index >> 3)] >> (index & 7) & 1:
+            return None
+
+        offset = self._cells_offset + index * self.code_width
+
+        return {"error": _SUCCESS, "code": mm[offset:offset + self.code_width].rstrip(b"\0").decode("ascii")}
+
+    def put(self, key: tuple, result: Dict) -> bool:
+        """Store the successful result
+
+        :param tuple key: (radio model name, serial number, extra data)
+        :param Dict result: Raw calc() result
+        :return: True if the result was stored
+        :rtype: bool
+        """
+
+        if self.readonly or result.get("error") != RadioErrors.SUCCESS:
+            return False
+
+        index = self._index(key)
+
+        code = str(result.get("code", ""))
+
+        # the codes that can't be stored unchanged (the cells are ASCII padded with zeros) are not stored
+        if index < 0 or not code or len(code) > self.code_width or not code.isascii() or "\0" in code:
+            return False
+
+        code = code.encode("ascii")
+
+        offset = self._cells_offset + index * self.code_width
+        bitmap_offset = _BITMAP_OFFSET + (index >> 3)
+
+        with self._lock:
+            # the code is in place before its presence bit is set
+            self._mmap[offset:offset + self.code_width] = code.ljust(self.code_width, b"\0")
+            self._mmap[bitmap_offset] |= 1 << (index & 7)
+
+        return True
+
+    def __contains__(self, key: tuple) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+
+        count = 0
+
+        for offset in range(_BITMAP_OFFSET, self._cells_offset, 1 << 16):
+            chunk = self._mmap[offset:min(offset + (1 << 16), self._cells_offset)]
+            count += bin(int.from_bytes(chunk, "little")).count("1")
+
+        return count
+
+    def flush(self) -> None:
+        """Write the changes to the disk"""
+
+        if not self.readonly:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """Write the changes to the disk and unmap the table"""
+
+        if not self._mmap.closed:
+            self.flush()
+            self._mmap.close()
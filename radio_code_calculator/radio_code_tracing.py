@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - request tracing
+#
+# Sampled traces of the SDK calls with the per-phase spans (queue wait,
+# connect, time to first byte, body read, JSON decoding, RadioModel
+# construction) sent to a callback or to OpenTelemetry.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from contextvars import ContextVar
+from typing import Optional, Dict, Callable, Union
+import functools
+import threading
+import time
+
+#
+# @var int offset between time.perf_counter_ns() and the Unix epoch in nanoseconds (the spans are timed with the
+#          high resolution clock and reported with the epoch timestamps)
+#
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def _now_ns() -> int:
+    return time.perf_counter_ns() + _EPOCH_OFFSET_NS
+
+
+class Span(object):
+    """A single timed phase of the traced call"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str], start_ns: int,
+                 end_ns: int = 0, attributes: Optional[Dict] = None):
+        """Initialize the span
+
+        :param str name: Span name e.g. "calc", "queue", "connect", "ttfb", "body", "decode" or "model"
+        :param str trace_id: Trace ID (32 hex digits)
+        :param str span_id: Span ID (16 hex digits)
+        :param Optional[str] parent_id: Parent span ID (None for the root span)
+        :param int start_ns: Start time (nanoseconds since the epoch)
+        :param int end_ns: End time (nanoseconds since the epoch)
+        :param Optional[Dict] attributes: Span attributes
+        """
+
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.attributes = attributes or {}
+
+    @property
+    def duration(self) -> float:
+        """Duration of the span in seconds"""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict:
+        """Convert the span to a dictionary (e.g. to log it as JSON)
+
+        :return: A dictionary with the span fields and its duration
+        :rtype: Dict
+        """
+
+        return {"name": self.name, "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+                "start_ns": self.start_ns, "end_ns": self.end_ns, "duration": self.duration,
+                "attributes": dict(self.attributes)}
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, duration={self.duration:.6f}, attributes={self.attributes!r})"
+
+
+class _SpanContext(object):
+    """Times the with block as a child span of the trace"""
+
+    __slots__ = ("_trace", "_name", "_attributes", "_start_ns")
+
+    def __init__(self, trace: "Trace", name: str, attributes: Dict):
+        self._trace = trace
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self):
+        self._start_ns = _now_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        if exc_type is not None:
+            self._attributes["exception"] = exc_type.__name__
+
+        self._trace.add(self._name, self._start_ns, _now_ns(), **self._attributes)
+
+
+class _NullSpanContext(object):
+    """The with block outside of the sampled trace"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpanContext()
+
+
+class Trace(object):
+    """Spans of a single traced call (the root span and its phases)"""
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict):
+
+        self.tracer = tracer
+        self.trace_id = f"{tracer._random.getrandbits(128):032x}"
+        self.root = Span(name, self.trace_id, self._span_id(), None, _now_ns(), attributes=attributes)
+
+        # the spans are added by the hedged requests running in the other threads too (list.append is atomic)
+        self.spans: list[Span] = [self.root]
+
+    def _span_id(self) -> str:
+        return f"{self.tracer._random.getrandbits(64):016x}"
+
+    def add(self, name: str, start_ns: int, end_ns: int, **attributes) -> Span:
+        """Add the child span timed by the caller
+
+        :param str name: Span name
+        :param int start_ns: Start time (nanoseconds since the epoch)
+        :param int end_ns: End time (nanoseconds since the epoch)
+        :param attributes: Span attributes
+        :return: The new span
+        :rtype: Span
+        """
+
+        span = Span(name, self.trace_id, self._span_id(), self.root.span_id, start_ns, end_ns, attributes)
+        self.spans.append(span)
+        return span
+
+    def span(self, name: str, **attributes) -> _SpanContext:
+        """Time the with block as a child span
+
+        :param str name: Span name
+        :param attributes: Span attributes
+        :return: Context manager
+        :rtype: _SpanContext
+        """
+
+        return _SpanContext(self, name, attributes)
+
+    def finish(self, **attributes) -> None:
+        """Finish the root span and send all the spans to the sink
+
+        :param attributes: Additional root span attributes e.g. the error code
+        """
+
+        self.root.end_ns = _now_ns()
+        self.root.attributes.update(attributes)
+
+        self.tracer._export(self.spans)
+
+
+#
+# @var ContextVar[Optional[Trace]] trace of the current call (the asyncio tasks and the hedged request threads inherit it)
+#
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("radio_code_calculator_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the current call
+
+    :return: The sampled trace or None if the current call isn't traced
+    :rtype: Optional[Trace]
+    """
+
+    return _current_trace.get()
+
+
+def trace_span(name: str, **attributes) -> Union[_SpanContext, _NullSpanContext]:
+    """Time the with block as a child span of the current trace (does nothing outside of a sampled trace)
+
+    :param str name: Span name
+    :param attributes: Span attributes
+    :return: Context manager
+    :rtype: Union[_SpanContext, _NullSpanContext]
+    """
+
+    trace = _current_trace.get()
+
+    return _NULL_SPAN if trace is None else _SpanContext(trace, name, attributes)
+
+
+class Tracer(object):
+    """Samples the SDK calls and sends their spans to the sink
+
+    The sink is called with the list of the spans of each finished trace (the root span first). It can be any callable
+    e.g. a list.append, a logging function or an OpenTelemetrySink.
+    """
+
+    def __init__(self, sink: Callable[[list], None], sample_rate: float = 1.0):
+        """Initialize the tracer
+
+        :param Callable[[list], None] sink: Function called with the list of the spans of each finished trace
+        :param float sample_rate: Fraction of the calls to trace (0.0 - 1.0), the other calls are not measured at all
+        """
+
+        import random
+
+        self.sink = sink
+        self.sample_rate = sample_rate
+
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+        # statistics
+        self.traces = 0
+        self.sink_errors = 0
+
+    def start(self, name: str, **attributes) -> Optional[Trace]:
+        """Start the trace of the call if it's sampled
+
+        :param str name: Root span name (the SDK uses the command name)
+        :param attributes: Root span attributes
+        :return: The new trace or None if the call isn't sampled
+        :rtype: Optional[Trace]
+        """
+
+        if not self._sampled():
+            return None
+
+        return Trace(self, name, attributes)
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def _export(self, spans: list) -> None:
+
+        with self._lock:
+            self.traces += 1
+
+        # a broken sink must not break the traced calls
+        try:
+            self.sink(spans)
+        except Exception:
+            with self._lock:
+                self.sink_errors += 1
+
+
+class OpenTelemetrySink(object):
+    """Sends the spans to OpenTelemetry (requires "pip install opentelemetry-api" and a configured SDK)
+
+    The root span is a child of the OpenTelemetry span active when the traced call finishes.
+    """
+
+    def __init__(self, tracer=None):
+        """Initialize the sink
+
+        :param tracer: OpenTelemetry tracer (defaults to the tracer of the global tracer provider)
+        """
+
+        # optional external package - install with "pip install opentelemetry-api"
+        from opentelemetry import trace
+
+        self._tracer = tracer or trace.get_tracer("radio_code_calculator")
+
+    def __call__(self, spans: list) -> None:
+
+        from opentelemetry import trace
+
+        root, *children = spans
+
+        root_span = self._tracer.start_span(root.name, start_time=root.start_ns, attributes=root.attributes)
+        context = trace.set_span_in_context(root_span)
+
+        for span in children:
+            self._tracer.start_span(span.name, context=context, start_time=span.start_ns,
+                                    attributes=span.attributes).end(end_time=span.end_ns)
+
+        root_span.end(end_time=root.end_ns)
+
+
+def _radio_model_name(radio_model) -> str:
+    return radio_model if isinstance(radio_model, str) else getattr(radio_model, "name", "")
+
+
+def _start_trace(calculator, command: str, args: tuple, kwargs: Dict) -> Optional[Trace]:
+
+    tracer = calculator._tracer
+
+    # the calls not sampled don't pay for the attributes
+    if not tracer._sampled():
+        return None
+
+    attributes = {"command": command}
+
+    radio_model = args[0] if args else kwargs.get("radio_model")
+
+    if command in ("calc", "info") and radio_model is not None:
+        attributes["radio_model"] = _radio_model_name(radio_model)
+
+    return Trace(tracer, command, attributes)
+
+
+def _traced(command: str) -> Callable:
+    """Trace the calculator command method (returning an error code & the results)
+
+    :param str command: Command name
+    :return: Method decorator
+    :rtype: Callable
+    """
+
+    def decorator(method: Callable) -> Callable:
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+
+            if self._tracer is None:
+                return method(self, *args, **kwargs)
+
+            trace = _start_trace(self, command, args, kwargs)
+
+            if trace is None:
+                return method(self, *args, **kwargs)
+
+            token = _current_trace.set(trace)
+
+            try:
+                error, result = method(self, *args, **kwargs)
+            except BaseException as ex:
+                trace.finish(exception=type(ex).__name__)
+                raise
+            finally:
+                _current_trace.reset(token)
+
+            trace.finish(error=int(error))
+
+            return error, result
+
+        return wrapper
+
+    return decorator
+
+
+def _traced_async(command: str) -> Callable:
+    """Trace the asyncio calculator command method (returning an error code & the results)
+
+    :param str command: Command name
+    :return: Method decorator
+    :rtype: Callable
+    """
+
+    def decorator(method: Callable) -> Callable:
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+
+            if self._tracer is None:
+                return await method(self, *args, **kwargs)
+
+            trace = _start_trace(self, command, args, kwargs)
+
+            if trace is None:
+                return await method(self, *args, **kwargs)
+
+            token = _current_trace.set(trace)
+
+            try:
+                error, result = await method(self, *args, **kwargs)
+            except BaseException as ex:
+                trace.finish(exception=type(ex).__name__)
+                raise
+            finally:
+                _current_trace.reset(token)
+
+            trace.finish(error=int(error))
+
+            return error, result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,645 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - HTTP transports
+#
+# Send the Web API requests. The HTTP stack of each transport is loaded on
+# the first request, so importing the SDK for the offline validation stays
+# fast.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Dependencies : requests (https://pypi.python.org/pypi/requests/), optional
+#                urllib3 (https://pypi.python.org/pypi/urllib3/) or
+#                httpx (https://pypi.python.org/pypi/httpx/)
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Callable, Union
+from abc import ABC, abstractmethod
+import threading
+import time
+
+from radio_code_calculator.radio_code_tracing import trace_span, _current_trace, _now_ns
+
+
+class TransportError(Exception):
+    """The Web API request failed (network error, invalid response code or response)"""
+
+
+class TransportConnectionError(TransportError):
+    """Cannot connect to the Web API or the connection was broken"""
+
+
+class TransportTimeoutError(TransportError):
+    """The Web API didn't respond in time"""
+
+
+class TransportStatusError(TransportError):
+    """The Web API responded with an invalid HTTP response code"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"invalid response code {status_code}")
+        self.status_code = status_code
+
+
+class Transport(ABC):
+    """Base class of the transports sending the form encoded POST requests and decoding the JSON responses
+
+    The subclasses implement post(). The transports raise TransportError (or its subclasses) on failures, RadioCodeCalculator turns all the
+    failures into RadioErrors.ERROR_CONNECTION. The transports must be safe to use from many threads.
+
+    When the metrics hook is set (the calculators set it to their metrics), the transports report the transferred
+    bytes and the opened connections to it. Within a sampled trace (see Tracer) the transports add the connect, time
+    to first byte, body read & JSON decoding spans to it.
+    """
+
+    #
+    # @var Optional[MetricsHook] metrics hook (None - disabled)
+    #
+    metrics = None
+
+    @abstractmethod
+    def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+        """Send a form encoded POST request and decode the JSON response
+
+        :param str url: Web API endpoint
+        :param Dict[str, str] data: Request parameters
+        :param Optional[float] timeout: Time left for the request in seconds, caps the connect & read timeouts (optional)
+        :return: Decoded JSON response
+        :rtype: Dict
+        :raises TransportError: on a network error, an invalid response code or response
+        """
+
+    def close(self) -> None:
+        """Release all the pooled connections"""
+
+
+class AsyncTransport(ABC):
+    """Base class of the asyncio transports (see Transport)"""
+
+    #
+    # @var Optional[MetricsHook] metrics hook (None - disabled)
+    #
+    metrics = None
+
+    @abstractmethod
+    async def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+        """Send a form encoded POST request and decode the JSON response
+
+        :param str url: Web API endpoint
+        :param Dict[str, str] data: Request parameters
+        :param Optional[float] timeout: Time left for the request in seconds, caps the connect & read timeouts (optional)
+        :return: Decoded JSON response
+        :rtype: Dict
+        :raises TransportError: on a network error, an invalid response code or response
+        """
+
+    async def close(self) -> None:
+        """Release all the pooled connections"""
+
+
+def _timeouts(connect_timeout: Optional[float], read_timeout: Optional[float], timeout: Optional[float]) -> tuple:
+    """Cap the connect & read timeouts of the transport with the time left for the request
+
+    :return: (connect timeout, read timeout), None - wait forever
+    :rtype: tuple[Optional[float], Optional[float]]
+    """
+
+    if timeout is None:
+        return connect_timeout, read_timeout
+
+    return (timeout if connect_timeout is None else min(connect_timeout, timeout),
+            timeout if read_timeout is None else min(read_timeout, timeout))
+
+
+def _decode_json(body: bytes) -> Dict:
+
+    import json
+
+    try:
+        with trace_span("decode", size=len(body)):
+            return json.loads(body)
+    except ValueError as ex:
+        raise TransportError(f"invalid response {ex}") from ex
+
+
+def _instrumented_pool_classes(transport) -> Dict[str, type]:
+    """Create the urllib3 connection pool classes reporting the new connections to the metrics of the transport and
+    timing the connects in the current trace
+
+    :param transport: Transport with the metrics attribute
+    :return: Pool classes by the URL scheme (for PoolManager.pool_classes_by_scheme)
+    :rtype: Dict[str, type]
+    """
+
+    import urllib3
+
+    def instrumented(pool_class: type) -> type:
+
+        class TracedConnection(pool_class.ConnectionCls):
+
+            def connect(self):
+
+                # including the TLS handshake
+                with trace_span("connect"):
+                    return super().connect()
+
+        class InstrumentedPool(pool_class):
+
+            ConnectionCls = TracedConnection
+
+            def _new_conn(self):
+
+                if transport.metrics is not None:
+                    transport.metrics.record_connection()
+
+                return super()._new_conn()
+
+        return InstrumentedPool
+
+    return {"http": instrumented(urllib3.HTTPConnectionPool), "https": instrumented(urllib3.HTTPSConnectionPool)}
+
+
+#
+# @var Dict[str, str] httpcore trace events reported as the spans (the time to first byte starts with the request headers)
+#
+_HTTPX_SPANS = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "body",
+}
+
+
+def _httpx_extensions(metrics, trace, asynchronous: bool = False) -> Optional[Dict]:
+    """Create the httpx trace extension reporting the new connections to the metrics and the request phases to the trace
+
+    :param Optional[MetricsHook] metrics: Metrics hook
+    :param Optional[Trace] trace: Trace of the current command
+    :param bool asynchronous: Create the trace function for the asyncio client
+    :return: Request extensions (None - nothing to report)
+    :rtype: Optional[Dict]
+    """
+
+    if metrics is None and trace is None:
+        return None
+
+    # event name -> start time
+    started: Dict[str, int] = {}
+
+    def on_event(event_name: str, info: Dict) -> None:
+
+        # e.g. "connection.connect_tcp.complete" or "http11.receive_response_body.started"
+        _, name, stage = event_name.rsplit(".", 2)
+
+        if metrics is not None and name == "connect_tcp" and stage == "complete":
+            metrics.record_connection()
+
+        if trace is None:
+            return
+
+        if stage == "started":
+            started[name] = _now_ns()
+            return
+
+        span = _HTTPX_SPANS.get(name)
+        start_ns = started.get("send_request_headers" if span == "ttfb" else name)
+
+        if span is not None and start_ns is not None:
+            trace.add(span, start_ns, _now_ns(), **({} if stage == "complete" else {"exception": stage}))
+
+    if not asynchronous:
+        return {"trace": on_event}
+
+    async def async_on_event(event_name: str, info: Dict) -> None:
+        on_event(event_name, info)
+
+    return {"trace": async_on_event}
+
+
+class _LazyClient(object):
+    """Thread-safe lazy creation & shutdown of the HTTP client"""
+
+    def __init__(self, create: Callable[[], object], close: Callable[[object], None]):
+        self._create = create
+        self._close = close
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get(self):
+
+        client = self._client
+
+        if client is not None:
+            return client
+
+        with self._lock:
+
+            # another thread might have created the client in the meantime
+            if self._client is None:
+                self._client = self._create()
+
+            return self._client
+
+    def close(self) -> None:
+
+        with self._lock:
+            if self._client is not None:
+                self._close(self._client)
+                self._client = None
+
+
+class RequestsTransport(Transport):
+    """HTTP transport built on a shared requests session with a pool of keep-alive connections (default)"""
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 keep_alive: bool = True,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0):
+        """Initialize the transport
+
+        :param int pool_connections: Number of per-host connection pools to cache
+        :param int pool_maxsize: Max. number of connections kept open per host (set it to the number of worker threads)
+        :param bool keep_alive: Keep the connections open between the requests (HTTP keep-alive)
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        """
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._session = _LazyClient(self._create_session, lambda session: session.close())
+
+    def _create_session(self):
+
+        # required external package - install with "pip install requests"
+        import requests
+        import requests.adapters
+
+        session = requests.Session()
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        # count & trace the new connections
+        adapter.poolmanager.pool_classes_by_scheme = _instrumented_pool_classes(self)
+
+        return session
+
+    def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        import requests
+
+        timeouts = _timeouts(self.connect_timeout, self.read_timeout, timeout)
+        trace = _current_trace.get()
+
+        try:
+            if trace is None:
+                response = self._session.get().post(url, data=data, timeout=timeouts)
+
+            else:
+                # stream the traced responses to time the headers & the body separately
+                with trace.span("ttfb"):
+                    response = self._session.get().post(url, data=data, timeout=timeouts, stream=True)
+
+                with trace.span("body"):
+                    response.content
+
+        except requests.Timeout as ex:
+            raise TransportTimeoutError(str(ex)) from ex
+        except requests.RequestException as ex:
+            raise TransportConnectionError(str(ex)) from ex
+
+        if self.metrics is not None:
+            body = response.request.body or b""
+
+            # the encoded length, not the number of the characters
+            self.metrics.record_transfer(len(body.encode("utf-8") if isinstance(body, str) else body), len(response.content))
+
+        # no response at all or an invalid response code (response.ok accepts the redirects that weren't followed)
+        if not 200 <= response.status_code < 300:
+            raise TransportStatusError(response.status_code)
+
+        # decode to json array
+        return _decode_json(response.content)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class Urllib3Transport(Transport):
+    """Low overhead HTTP transport built directly on a urllib3 connection pool"""
+
+    def __init__(self,
+                 num_pools: int = 10,
+                 maxsize: int = 10,
+                 keep_alive: bool = True,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0):
+        """Initialize the transport
+
+        :param int num_pools: Number of per-host connection pools to cache
+        :param int maxsize: Max. number of connections kept open per host (set it to the number of worker threads)
+        :param bool keep_alive: Keep the connections open between the requests (HTTP keep-alive)
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        """
+
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._pool_manager = _LazyClient(self._create_pool_manager, lambda pool_manager: pool_manager.clear())
+
+    def _create_pool_manager(self):
+
+        # required external package - install with "pip install urllib3"
+        import urllib3
+
+        headers = {} if self.keep_alive else {"Connection": "close"}
+
+        pool_manager = urllib3.PoolManager(num_pools=self.num_pools, maxsize=self.maxsize, headers=headers, retries=False)
+
+        # count & trace the new connections
+        pool_manager.pool_classes_by_scheme = _instrumented_pool_classes(self)
+
+        return pool_manager
+
+    def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        import urllib3
+        import urllib3.exceptions
+
+        connect_timeout, read_timeout = _timeouts(self.connect_timeout, self.read_timeout, timeout)
+        trace = _current_trace.get()
+
+        try:
+            if trace is None:
+                response = self._pool_manager.get().request("POST", url, fields=data, encode_multipart=False,
+                                                            timeout=urllib3.Timeout(connect=connect_timeout,
+                                                                                    read=read_timeout))
+
+            else:
+                # read the traced responses separately to time the headers & the body
+                with trace.span("ttfb"):
+                    response = self._pool_manager.get().request("POST", url, fields=data, encode_multipart=False,
+                                                                timeout=urllib3.Timeout(connect=connect_timeout,
+                                                                                        read=read_timeout),
+                                                                preload_content=False)
+
+                try:
+                    with trace.span("body"):
+                        response.data
+                finally:
+                    response.release_conn()
+
+        except urllib3.exceptions.TimeoutError as ex:
+            raise TransportTimeoutError(str(ex)) from ex
+        except urllib3.exceptions.HTTPError as ex:
+            raise TransportConnectionError(str(ex)) from ex
+
+        if self.metrics is not None:
+            from urllib.parse import urlencode
+            self.metrics.record_transfer(len(urlencode(data)), len(response.data))
+
+        # only 2xx, the redirects are not followed (retries=False) and their bodies are not the Web API responses
+        if not 200 <= response.status < 300:
+            raise TransportStatusError(response.status)
+
+        return _decode_json(response.data)
+
+    def close(self) -> None:
+        self._pool_manager.close()
+
+
+def _httpx_error(ex: Exception) -> TransportError:
+
+    import httpx
+
+    if isinstance(ex, httpx.TimeoutException):
+        return TransportTimeoutError(str(ex))
+
+    return TransportConnectionError(str(ex))
+
+
+def _httpx_timeout(transport, timeout: Optional[float]) -> "httpx.Timeout":
+
+    import httpx
+
+    connect_timeout, read_timeout = _timeouts(transport.connect_timeout, transport.read_timeout, timeout)
+
+    return httpx.Timeout(read_timeout, connect=connect_timeout)
+
+
+class HttpxTransport(Transport):
+    """HTTP transport built on httpx, optionally with HTTP/2 (many requests multiplexed over one connection)"""
+
+    def __init__(self,
+                 http2: bool = False,
+                 max_connections: int = 10,
+                 max_keepalive_connections: int = 10,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0):
+        """Initialize the transport
+
+        :param bool http2: Use HTTP/2 if the server supports it (requires "pip install httpx[http2]")
+        :param int max_connections: Max. number of the connections in the pool
+        :param int max_keepalive_connections: Max. number of idle keep-alive connections kept in the pool
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        """
+
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._client = _LazyClient(self._create_client, lambda client: client.close())
+
+    def _create_client(self):
+
+        # required external package - install with "pip install httpx"
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections)
+
+        return httpx.Client(http2=self.http2, limits=limits, timeout=None)
+
+    def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        import httpx
+
+        metrics = self.metrics
+
+        try:
+            response = self._client.get().post(url, data=data, timeout=_httpx_timeout(self, timeout),
+                                               extensions=_httpx_extensions(metrics, _current_trace.get()))
+        except httpx.HTTPError as ex:
+            raise _httpx_error(ex) from ex
+
+        if metrics is not None:
+            metrics.record_transfer(len(response.request.content), len(response.content))
+
+        if not response.is_success:
+            raise TransportStatusError(response.status_code)
+
+        return _decode_json(response.content)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """Asyncio HTTP transport built on httpx, optionally with HTTP/2 (default for AsyncRadioCodeCalculator)"""
+
+    def __init__(self,
+                 http2: bool = False,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0):
+        """Initialize the transport
+
+        :param bool http2: Use HTTP/2 if the server supports it (requires "pip install httpx[http2]")
+        :param int max_connections: Max. number of the connections in the pool
+        :param int max_keepalive_connections: Max. number of idle keep-alive connections kept in the pool
+        :param Optional[float] connect_timeout: Max. time to establish the connection in seconds (None - wait forever)
+        :param Optional[float] read_timeout: Max. time to wait for the response data in seconds (None - wait forever)
+        """
+
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # the client is created on the first request (in the running event loop)
+        self._client = None
+
+    def _get_client(self):
+
+        if self._client is None:
+
+            # required external package - install with "pip install httpx"
+            import httpx
+
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_keepalive_connections)
+            self._client = httpx.AsyncClient(http2=self.http2, limits=limits, timeout=None)
+
+        return self._client
+
+    async def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        import httpx
+
+        metrics = self.metrics
+
+        try:
+            response = await self._get_client().post(url, data=data, timeout=_httpx_timeout(self, timeout),
+                                                     extensions=_httpx_extensions(metrics, _current_trace.get(),
+                                                                                  asynchronous=True))
+        except httpx.HTTPError as ex:
+            raise _httpx_error(ex) from ex
+
+        if metrics is not None:
+            metrics.record_transfer(len(response.request.content), len(response.content))
+
+        if not response.is_success:
+            raise TransportStatusError(response.status_code)
+
+        return _decode_json(response.content)
+
+    async def close(self) -> None:
+
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+
+class FakeTransport(Transport):
+    """In-process transport answering the requests with a function, for the tests and the benchmarks"""
+
+    def __init__(self, handler: Callable[[Dict[str, str]], Dict], latency: Union[float, Callable[[], float]] = 0.0):
+        """Initialize the transport
+
+        :param Callable[[Dict[str, str]], Dict] handler: Function returning the Web API response for the request
+                                                          parameters (it can raise TransportError to simulate failures)
+        :param Union[float, Callable[[], float]] latency: Simulated latency of each request in seconds (or a function returning it)
+        """
+
+        self.handler = handler
+        self.latency = latency
+
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        with self._lock:
+            self.requests += 1
+
+        latency = self.latency() if callable(self.latency) else self.latency
+
+        # the response doesn't come in time
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TransportTimeoutError(f"no response within {timeout} seconds")
+
+        if latency:
+            time.sleep(latency)
+
+        return self.handler(dict(data))
+
+
+class AsyncFakeTransport(AsyncTransport):
+    """In-process asyncio transport answering the requests with a function (see FakeTransport)"""
+
+    def __init__(self, handler: Callable[[Dict[str, str]], Dict], latency: Union[float, Callable[[], float]] = 0.0):
+        """Initialize the transport
+
+        :param Callable[[Dict[str, str]], Dict] handler: Function returning the Web API response for the request parameters
+        :param Union[float, Callable[[], float]] latency: Simulated latency of each request in seconds (or a function returning it)
+        """
+
+        self.handler = handler
+        self.latency = latency
+
+        self.requests = 0
+
+    async def post(self, url: str, data: Dict[str, str], timeout: Optional[float] = None) -> Dict:
+
+        import asyncio
+
+        self.requests += 1
+
+        latency = self.latency() if callable(self.latency) else self.latency
+
+        # the response doesn't come in time
+        if timeout is not None and latency > timeout:
+            await asyncio.sleep(timeout)
+            raise TransportTimeoutError(f"no response within {timeout} seconds")
+
+        if latency:
+            await asyncio.sleep(latency)
+
+        return self.handler(dict(data))
@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - radio model registry
+#
+# Index of radio models by name, serial number length and per-position
+# character class, used to detect which models accept a serial number.
+#
+# Version      : v1.1.6
+# Python       : Python v3
+# Author       : Bartosz Wójcik (support@pelock.com)
+# Project      : https://www.pelock.com/products/radio-code-calculator
+# Homepage     : https://www.pelock.com
+# Copyright     : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+from typing import Optional, Dict, Iterable, Iterator, Callable, Awaitable
+import json
+import os
+import threading
+import time
+
+from radio_code_calculator.radio_code_calculator import RadioErrors, RadioModel, RadioModels, _radio_models_from_list
+
+
+class _LengthIndex(object):
+    """Index of the radio models accepting serial numbers of the same length"""
+
+    def __init__(self, serial_len: int):
+
+        # models in the registration order, bit N of the masks below is the model N
+        self.models: list[RadioModel] = []
+
+        # character -> mask of the models allowing it, for each position
+        self.positions: list[Dict[str, int]] = [{} for _ in range(serial_len)]
+
+        # mask of the models indexed per-position
+        self.indexed_mask = 0
+
+        # models with complex patterns, validated one by one
+        self.unindexed: list[RadioModel] = []
+
+    def add(self, radio_model: RadioModel) -> None:
+
+        bit = 1 << len(self.models)
+        self.models.append(radio_model)
+
+        if radio_model._serial_positions is None:
+            self.unindexed.append(radio_model)
+            return
+
+        self.indexed_mask |= bit
+
+        for position, characters in zip(self.positions, radio_model._serial_positions):
+            for character in characters:
+                position[character] = position.get(character, 0) | bit
+
+    def candidates(self, serial: str) -> list[RadioModel]:
+
+        mask = self.indexed_mask
+
+        for position, character in zip(self.positions, serial):
+            mask &= position.get(character, 0)
+            if not mask:
+                break
+
+        candidates = []
+
+        # decode the mask (models in the registration order)
+        while mask:
+            lowest = mask & -mask
+            candidates.append(self.models[lowest.bit_length() - 1])
+            mask ^= lowest
+
+        for radio_model in self.unindexed:
+            if radio_model.validate(serial) == RadioErrors.SUCCESS:
+                candidates.append(radio_model)
+
+        return candidates
+
+
+class RadioModelRegistry(object):
+    """Radio models indexed by name, serial number length and per-position character class"""
+
+    def __init__(self, radio_models: Optional[Iterable[RadioModel]] = None):
+        """Initialize the registry with the radio models
+
+        :param Optional[Iterable[RadioModel]] radio_models: Radio models e.g. from RadioCodeCalculator.list()
+                                                            (defaults to all the predefined RadioModels)
+        """
+
+        self._by_name: Dict[str, RadioModel] = {}
+        self._by_length: Dict[int, _LengthIndex] = {}
+
+        for radio_model in RadioModels.all() if radio_models is None else radio_models:
+            self.add(radio_model)
+
+    def add(self, radio_model: RadioModel) -> None:
+        """Add the radio model to the registry (a model with the same name is replaced)
+
+        :param RadioModel radio_model: Radio model
+        """
+
+        if radio_model.name in self._by_name:
+            self._by_name[radio_model.name] = radio_model
+            self._rebuild()
+            return
+
+        self._by_name[radio_model.name] = radio_model
+
+        index = self._by_length.get(radio_model.serial_max_len)
+
+        if index is None:
+            index = self._by_length[radio_model.serial_max_len] = _LengthIndex(radio_model.serial_max_len)
+
+        index.add(radio_model)
+
+    def _rebuild(self) -> None:
+
+        radio_models = list(self._by_name.values())
+
+        self._by_name = {}
+        self._by_length = {}
+
+        for radio_model in radio_models:
+            self.add(radio_model)
+
+    def get(self, name: str) -> Optional[RadioModel]:
+        """Get the radio model by its name
+
+        :param str name: Radio model name e.g. "ford-m-series"
+        :return: Radio model or None if it's not in the registry
+        :rtype: Optional[RadioModel]
+        """
+        return self._by_name.get(name)
+
+    def __getitem__(self, name: str) -> RadioModel:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[RadioModel]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def candidates(self, serial: str, extra: Optional[str] = None) -> list[RadioModel]:
+        """Find all the radio models accepting the serial number (and the extra data if provided)
+
+        Only the models expecting the serial number of the same length are checked, their per-position
+        character classes are matched with a single dictionary lookup per character.
+
+        :param str serial: Radio serial number
+        :param Optional[str] extra: Extra data (optional)
+        :return: A list of matching RadioModels (in the registration order, models with complex patterns last)
+        :rtype: list[RadioModel]
+        """
+
+        index = self._by_length.get(len(serial))
+
+        if index is None:
+            return []
+
+        candidates = index.candidates(serial)
+
+        if extra:
+            candidates = [radio_model for radio_model in candidates
+                          if radio_model.validate(serial, extra) == RadioErrors.SUCCESS]
+
+        return candidates
+
+    def candidates_many(self, serials: Iterable[str], extras: Optional[Iterable[Optional[str]]] = None) -> Iterator[list[RadioModel]]:
+        """Find the matching radio models for many serial numbers (e.g. lines of a file), lazily
+
+        Trailing new line characters are stripped, so the lines of a text file can be passed directly.
+
+        :param Iterable[str] serials: Radio serial numbers
+        :param Optional[Iterable[Optional[str]]] extras: Extra data for each serial number (optional)
+        :return: An iterator of the matching RadioModels lists, one list for each serial number
+        :rtype: Iterator[list[RadioModel]]
+        """
+
+        if extras is None:
+            for serial in serials:
+                yield self.candidates(serial.rstrip("\r\n"))
+        else:
+            for serial, extra in zip(serials, extras):
+                yield self.candidates(serial.rstrip("\r\n"), extra)
+
+
+class RadioModelCatalog(object):
+    """Cache of the supported radio models downloaded with the list command (stale-while-revalidate)
+
+    The cached models are served until they're older than ttl, then the stale models are still served while they're
+    downloaded again in the background. The snapshot of the list command results can be saved on the disk, so a
+    process can start without downloading them.
+    """
+
+    def __init__(self, ttl: float = 3600.0, snapshot_path: Optional[str] = None):
+        """Initialize the catalog
+
+        :param float ttl: Number of seconds after which the models are downloaded again
+        :param Optional[str] snapshot_path: JSON file with the snapshot of the list command results (optional)
+        """
+
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+
+        self._registry: Optional[RadioModelRegistry] = None
+        self._fetched_at = 0.0
+
+        self._lock = threading.Lock()
+        self._download_lock = threading.Lock()
+        self._refreshing = False
+
+        # the background refresh task (the event loop keeps only weak references to the tasks)
+        self._refresh_task: Optional["asyncio.Task"] = None
+
+        # statistics
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+        if snapshot_path is not None:
+            self._load_snapshot()
+
+    @property
+    def registry(self) -> Optional[RadioModelRegistry]:
+        """Return the cached models (even stale ones) or None if they were never downloaded"""
+        return self._registry
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the cached models should be downloaded again"""
+        return self._registry is None or time.time() - self._fetched_at >= self.ttl
+
+    def _load_snapshot(self) -> None:
+
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+
+            self._registry = RadioModelRegistry(_radio_models_from_list(snapshot))
+            self._fetched_at = snapshot["fetchedAt"]
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_snapshot(self, result: Dict) -> None:
+
+        snapshot = {"fetchedAt": self._fetched_at, "supportedRadioModels": result["supportedRadioModels"]}
+
+        # write the whole file first, so other processes never read a partial snapshot
+        temporary_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+
+        os.replace(temporary_path, self.snapshot_path)
+
+    def update(self, result: Dict) -> int:
+        """Update the catalog with the list command results
+
+        :param Dict result: Raw results of the list command
+        :return: Error code of the list command
+        :rtype: int
+        """
+
+        if result["error"] != RadioErrors.SUCCESS:
+            self.refresh_errors += 1
+            return result["error"]
+
+        registry = RadioModelRegistry(_radio_models_from_list(result))
+
+        with self._lock:
+            self._registry = registry
+            self._fetched_at = time.time()
+            self.refreshes += 1
+
+            if self.snapshot_path is not None:
+                try:
+                    self._save_snapshot(result)
+                except OSError:
+                    pass
+
+        return result["error"]
+
+    def _begin_refresh(self) -> bool:
+
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def _end_refresh(self) -> None:
+
+        with self._lock:
+            self._refreshing = False
+
+    def get(self, fetch: Callable[[], Dict]) -> tuple[int, Optional[RadioModelRegistry]]:
+        """Get the cached models, download them if they're missing, refresh them in the background if they're stale
+
+        :param Callable[[], Dict] fetch: Function sending the list command and returning its raw results
+        :return: A list with an error code, and the registry of the models (or None)
+        :rtype: tuple[int, Optional[RadioModelRegistry]]
+        """
+
+        if not self.stale:
+            return RadioErrors.SUCCESS, self._registry
+
+        if self._registry is not None:
+
+            # serve the stale models while they're downloaded again
+            if self._begin_refresh():
+                threading.Thread(target=self._refresh, args=(fetch,), daemon=True).start()
+
+            return RadioErrors.SUCCESS, self._registry
+
+        # nothing to serve yet, only one caller downloads the models, the others wait for it
+        with self._download_lock:
+            if self._registry is None:
+                error = self.update(fetch())
+
+                if error != RadioErrors.SUCCESS:
+                    return error, None
+
+        return RadioErrors.SUCCESS, self._registry
+
+    def _refresh(self, fetch: Callable[[], Dict]) -> None:
+
+        try:
+            self.update(fetch())
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            self._end_refresh()
+
+    async def get_async(self, fetch: Callable[[], Awaitable[Dict]]) -> tuple[int, Optional[RadioModelRegistry]]:
+        """Asyncio version of get()
+
+        :param Callable[[], Awaitable[Dict]] fetch: Coroutine function sending the list command and returning its raw results
+        :return: A list with an error code, and the registry of the models (or None)
+        :rtype: tuple[int, Optional[RadioModelRegistry]]
+        """
+
+        if not self.stale:
+            return RadioErrors.SUCCESS, self._registry
+
+        if self._registry is not None:
+
+            # serve the stale models while they're downloaded again
+            if self._begin_refresh():
+                import asyncio
+                self._refresh_task = asyncio.ensure_future(self._refresh_async(fetch))
+                self._refresh_task.add_done_callback(self._refresh_done)
+
+            return RadioErrors.SUCCESS, self._registry
+
+        error = self.update(await fetch())
+
+        if error != RadioErrors.SUCCESS:
+            return error, None
+
+        return RadioErrors.SUCCESS, self._registry
+
+    async def _refresh_async(self, fetch: Callable[[], Awaitable[Dict]]) -> None:
+
+        try:
+            self.update(await fetch())
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            self._end_refresh()
+
+    def _refresh_done(self, task: "asyncio.Task") -> None:
+
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+        # retrieve the exception (e.g. the cancellation at the event loop shutdown), so it isn't logged as never retrieved
+        if not task.cancelled():
+            task.exception()
@@ -26,6 +26,18 @@ setuptools.setup(name='radio_code_calculator',
               'requests',
     ],
 
+    extras_require={
+              'async': ['httpx'],
+              'urllib3': ['urllib3'],
+              'http2': ['httpx[http2]'],
+              'numpy': ['numpy'],
+              'opentelemetry': ['opentelemetry-api'],
+    },
+
+    entry_points={
+              'console_scripts': ['radio-code-calculator = radio_code_calculator.radio_code_cli:main'],
+    },
+
     zip_safe=False,
 
     classifiers=[
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - asyncio WebApi interface unit test
+#
+# Validate the asyncio SDK against a local stand-in Web API server
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import asyncio
+import importlib.util
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code
+
+
+@unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+class TestAsyncRadioCodeCalculator(unittest.IsolatedAsyncioTestCase):
+
+    #
+    # local stand-in Web API server
+    #
+    server: StandInServer
+
+    def setUp(self):
+
+        self.server = StandInServer(latency=0.05).start()
+
+        #
+        # create asyncio Radio Code Calculator API class instance pointed at the stand-in server
+        #
+        self.myRadioCodeCalculator = AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, max_concurrency=5)
+        self.myRadioCodeCalculator.API_URL = self.server.url
+
+    async def asyncTearDown(self):
+
+        await self.myRadioCodeCalculator.close()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    async def test_login(self):
+
+        error, result = await self.myRadioCodeCalculator.login()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertIn("license", result)
+
+    async def test_login_invalid(self):
+
+        async with AsyncRadioCodeCalculator("AAAA-BBBB-CCCC-DDDD") as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+            error, result = await radioCodeApi.login()
+
+        self.assertEqual(error, RadioErrors.INVALID_LICENSE)
+
+    async def test_calc(self):
+
+        error, result = await self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+        error, result = await self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "12345A")
+
+        self.assertEqual(error, RadioErrors.INVALID_SERIAL_PATTERN)
+
+    async def test_info_list(self):
+
+        error, radio_model = await self.myRadioCodeCalculator.info("ford-m-series")
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.serial_max_len, 6)
+
+        error, radio_model = await self.myRadioCodeCalculator.info("INVALID RADIO MODEL")
+
+        self.assertEqual(error, RadioErrors.INVALID_RADIO_MODEL)
+        self.assertIsNone(radio_model)
+
+        error, radio_models = await self.myRadioCodeCalculator.list()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertIn("jaguar-alpine", [radio_model.name for radio_model in radio_models])
+
+    async def test_concurrency_cap(self):
+
+        serials = [f"{i:06d}" for i in range(20)]
+
+        results = await asyncio.gather(*[self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, serial)
+                                         for serial in serials])
+
+        self.assertEqual([result["code"] for error, result in results],
+                         [stand_in_code("ford-m-series", serial) for serial in serials])
+        self.assertLessEqual(self.server.peak_in_flight, 5)
+        self.assertLessEqual(self.server.connections, 5)
+
+    async def test_calc_many(self):
+
+        items = [(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(10)] + [(RadioModels.FORD_M_SERIES, "1")]
+
+        results = await self.myRadioCodeCalculator.calc_many(items)
+
+        self.assertEqual([error for error, result in results], [RadioErrors.SUCCESS] * 10 + [RadioErrors.INVALID_SERIAL_LENGTH])
+
+        results = await self.myRadioCodeCalculator.calc_many(items, ordered=False)
+
+        self.assertEqual(sorted(index for index, error, result in results), list(range(11)))
+
+    async def test_calc_iter(self):
+
+        async def items():
+            for i in range(20):
+                yield RadioModels.FORD_M_SERIES, f"{i:06d}"
+
+        # at most the window of the requests in flight
+        results = [result async for result in self.myRadioCodeCalculator.calc_iter(items(), window=3)]
+
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(self.server.peak_in_flight, 3)
+
+        for item, error, result in results:
+            self.assertEqual(result["code"], stand_in_code("ford-m-series", item[1]))
+
+        # plain iterables too
+        results = [result async for result in self.myRadioCodeCalculator.calc_iter([(RadioModels.FORD_M_SERIES, "1")])]
+
+        self.assertEqual(results[0][1], RadioErrors.INVALID_SERIAL_LENGTH)
+
+    async def test_coalesce_requests(self):
+
+        results = await asyncio.gather(*[self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+                                         for _ in range(10)])
+
+        self.assertTrue(all(result["code"] == stand_in_code("ford-m-series", "123456") for error, result in results))
+        self.assertEqual(self.server.requests, 1)
+
+        # cancelled caller doesn't cancel the shared request
+        first = asyncio.ensure_future(self.myRadioCodeCalculator.login())
+        second = asyncio.ensure_future(self.myRadioCodeCalculator.login())
+
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        error, result = await second
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(self.server.requests, 2)
+
+    async def test_coalesce_requests_deadline(self):
+
+        self.server.latency = 0.5
+
+        first = asyncio.ensure_future(self.myRadioCodeCalculator.login())
+
+        await asyncio.sleep(0.1)
+
+        # the waiting caller doesn't wait longer than its own deadline, the shared request isn't cancelled
+        start = time.monotonic()
+
+        self.assertEqual((await self.myRadioCodeCalculator.login(timeout=0.1))[0], RadioErrors.ERROR_CONNECTION)
+        self.assertLess(time.monotonic() - start, 0.3)
+
+        self.assertEqual((await first)[0], RadioErrors.SUCCESS)
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_model_catalog(self):
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, model_catalog=RadioModelCatalog()) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            error, radio_models = await radioCodeApi.list()
+            self.assertEqual(error, RadioErrors.SUCCESS)
+
+            error, radio_model = await radioCodeApi.info("renault-dacia")
+            self.assertEqual(radio_model.validate("Z999"), RadioErrors.SUCCESS)
+
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_connection_error(self):
+
+        self.server.stop()
+
+        error, result = await self.myRadioCodeCalculator.login()
+
+        self.assertEqual(error, RadioErrors.ERROR_CONNECTION)
+        self.assertEqual(result, {"error": RadioErrors.ERROR_CONNECTION})
+
+
+if __name__ == '__main__':
+    unittest.main()
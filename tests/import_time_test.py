@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - lazy imports unit test
+#
+# Make sure importing the SDK doesn't load the HTTP stack (or any other heavy
+# optional dependency) before the first Web API request (the import time
+# itself is measured by the benchmark suite)
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+import os
+import subprocess
+import sys
+import unittest
+
+#
+# modules which must not be loaded by "import radio_code_calculator"
+#
+HEAVY_MODULES = ["requests", "urllib3", "httpx", "asyncio", "sqlite3", "numpy", "concurrent.futures", "http.client"]
+
+#
+# repository root (the tests are run from a source checkout)
+#
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_no_heavy_modules(self):
+
+        loaded = subprocess.run([sys.executable, "-c",
+                                 "import sys\n"
+                                 "import radio_code_calculator\n"
+                                 f"print(' '.join(module for module in {HEAVY_MODULES!r} if module in sys.modules))"],
+                                capture_output=True, text=True, check=True, cwd=ROOT).stdout.split()
+
+        self.assertEqual(loaded, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - benchmark suite unit test
+#
+# Smoke test of the offline benchmarks, their JSON results and the
+# regression check
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+#
+# repository root (the benchmarks are run from a source checkout)
+#
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "benchmarks.radio_code_benchmark", *args],
+                          capture_output=True, text=True, cwd=ROOT)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_run(self):
+
+        process = benchmark("--quick", "-k", "ford-m-series", "-o", self.path("results.json"))
+
+        self.assertEqual(process.returncode, 0, process.stderr)
+
+        with open(self.path("results.json"), encoding="utf-8") as file:
+            results = json.load(file)
+
+        self.assertEqual(sorted(results["benchmarks"]), ["validate.ford-m-series.invalid_length",
+                                                         "validate.ford-m-series.invalid_pattern",
+                                                         "validate.ford-m-series.valid"])
+
+        for result in results["benchmarks"].values():
+            self.assertGreater(result["ns_per_op"], 0)
+            self.assertGreaterEqual(result["median_ns"], result["ns_per_op"])
+
+        self.assertIn("python", results)
+
+    def test_compare(self):
+
+        def save(name: str, times: dict) -> str:
+
+            with open(self.path(name), "w", encoding="utf-8") as file:
+                json.dump({"version": 1, "python": "3", "platform": "test",
+                           "benchmarks": {benchmark_name: {"ns_per_op": ns, "median_ns": ns}
+                                          for benchmark_name, ns in times.items()}}, file)
+
+            return self.path(name)
+
+        baseline = save("baseline.json", {"calc.cached": 1000, "calc.transport": 5000})
+
+        process = benchmark("--compare", baseline, save("same.json", {"calc.cached": 1050, "calc.transport": 4000,
+                                                                      "parse.info": 2000}))
+
+        self.assertEqual(process.returncode, 0, process.stdout)
+        self.assertIn("faster", process.stdout)
+        self.assertIn("new", process.stdout)
+
+        process = benchmark("--compare", baseline, save("slower.json", {"calc.cached": 1200, "calc.transport": 5000}))
+
+        self.assertEqual(process.returncode, 1)
+        self.assertIn("REGRESSION", process.stdout)
+
+        # the threshold is configurable
+        process = benchmark("--compare", baseline, self.path("slower.json"), "--threshold", "0.5")
+
+        self.assertEqual(process.returncode, 0)
+
+    def test_import_time_not_found(self):
+
+        # "sys" is built into the interpreter, -X importtime never reports it
+        process = subprocess.run([sys.executable, "-c", "from benchmarks.radio_code_benchmark import measure_import_time\n"
+                                                        "measure_import_time(1, 'sys')"],
+                                 capture_output=True, text=True, cwd=ROOT)
+
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn("RuntimeError: no -X importtime line for the sys module", process.stderr)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
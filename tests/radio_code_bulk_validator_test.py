@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - bulk validator unit test
+#
+# Validate the multi-core offline validation of the serial number files
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import contextlib
+import io
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+from radio_code_calculator.radio_code_bulk_validator import BulkValidator, _ChunkValidator, main
+
+
+class TestBulkValidator(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def path(self, name: str, content: bytes = None) -> str:
+
+        path = os.path.join(self.directory.name, name)
+
+        if content is not None:
+            with open(path, "wb") as file:
+                file.write(content)
+
+        return path
+
+    def read(self, name: str) -> bytes:
+
+        with open(self.path(name), "rb") as file:
+            return file.read()
+
+    def test_radio_model(self):
+
+        # \r\n line ends, an empty line & no new line at the end of the file
+        input_path = self.path("serials.txt", b"123456\r\n12345\n\n12345A\n654321")
+
+        stats = BulkValidator(RadioModels.FORD_M_SERIES).run(input_path, self.path("codes.txt"))
+
+        self.assertEqual(stats, {"records": 5, "valid": 2, "invalid_length": 2, "invalid_pattern": 1})
+        self.assertEqual(self.read("codes.txt"), b"0\n4\n4\n5\n0\n")
+
+        BulkValidator("ford-m-series", output="valid").run(input_path, self.path("valid.txt"))
+
+        self.assertEqual(self.read("valid.txt"), b"123456\n654321\n")
+
+        with self.assertRaises(ValueError):
+            BulkValidator("unknown")
+
+    def test_detect(self):
+
+        input_path = self.path("serials.txt", b"123456\nTQ1AA1500E2884\nZ123\n12345A\n123\n")
+
+        radio_models = [RadioModels.FORD_M_SERIES, RadioModels.ECLIPSE_ESN, RadioModels.RENAULT_DACIA]
+
+        stats = BulkValidator(radio_models=radio_models).run(input_path, self.path("codes.txt"))
+
+        self.assertEqual(stats, {"records": 5, "valid": 3, "invalid_length": 2, "invalid_pattern": 0})
+        self.assertEqual(self.read("codes.txt"), b"0,ford-m-series|eclipse-esn\n4,\n0,renault-dacia\n0,eclipse-esn\n4,\n")
+
+        # all the predefined radio models
+        BulkValidator(output="valid").run(input_path, self.path("valid.txt"))
+
+        self.assertEqual(self.read("valid.txt"), b"123456\nTQ1AA1500E2884\nZ123\n12345A\n")
+
+    def test_workers(self):
+
+        random.seed(1)
+
+        characters = "0123456789ABCDEFabc-\xe9"
+        lines = ["".join(random.choice(characters) for _ in range(random.choice([0, 4, 5, 6, 7, 14, 16])))
+                 for _ in range(20000)]
+
+        input_path = self.path("serials.txt", "\n".join(lines).encode("latin-1"))
+
+        for radio_model in (RadioModels.FORD_M_SERIES, RadioModels.JEEP_CHEROKEE, None):
+            for output in ("codes", "valid"):
+
+                # the same output from the worker processes (small chunks) and from this process
+                stats = BulkValidator(radio_model, output=output, workers=2, chunk_size=4096).run(input_path, self.path("parallel.txt"))
+                validator = BulkValidator(radio_model, output=output, workers=1)
+
+                self.assertEqual(validator.run(input_path, self.path("serial.txt")), stats)
+                self.assertEqual(self.read("parallel.txt"), self.read("serial.txt"))
+                self.assertEqual(stats["records"], len(lines))
+
+                # the vectorized validation gives the same results as the compiled validators
+                chunk_validator = _ChunkValidator(validator.radio_models, output)
+                chunk_validator._np = None
+
+                self.assertEqual(chunk_validator.validate(self.read("serials.txt"))[0], self.read("serial.txt"))
+
+        expected = sum(RadioModels.FORD_M_SERIES.validate(line) == RadioErrors.SUCCESS for line in lines)
+
+        self.assertEqual(BulkValidator(RadioModels.FORD_M_SERIES, workers=2, chunk_size=4096).run(input_path)["valid"], expected)
+
+    def test_empty_file(self):
+
+        stats = BulkValidator(RadioModels.FORD_M_SERIES).run(self.path("empty.txt", b""), self.path("codes.txt"))
+
+        self.assertEqual(stats, {"records": 0, "valid": 0, "invalid_length": 0, "invalid_pattern": 0})
+        self.assertEqual(self.read("codes.txt"), b"")
+
+    def test_pickle(self):
+
+        # the radio models are sent to the worker processes
+        radio_model = pickle.loads(pickle.dumps(RadioModel("custom", 4, r"^([A-Z]{2}[0-9]{2})$", 2, r"^([0-9]{2})$")))
+
+        self.assertEqual(radio_model.validate("AB12", "34"), RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.validate("1234"), RadioErrors.INVALID_SERIAL_PATTERN)
+        self.assertEqual(radio_model.extra_regex_pattern, r"^([0-9]{2})$")
+
+    def test_main(self):
+
+        input_path = self.path("serials.txt", b"123456\n12345A\n")
+
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(main([input_path, self.path("valid.txt"), "--radio-model", "ford-m-series",
+                                   "--output-mode", "valid"]), 2)
+            self.assertEqual(main([self.path("valid.txt"), "--radio-model", "ford-m-series"]), 0)
+            self.assertEqual(main([self.path("missing.txt")]), 1)
+
+        self.assertIn("records 1 | valid 1", stderr.getvalue())
+        self.assertEqual(self.read("valid.txt"), b"123456\n")
+
+
+if __name__ == '__main__':
+
+    unittest.main()
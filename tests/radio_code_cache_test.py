@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - in-memory radio code cache unit test
+#
+# Validate LRU eviction, expiration & negative caching
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+
+
+class TestRadioCodeCache(unittest.TestCase):
+
+    def test_get_put(self):
+
+        cache = RadioCodeCache()
+
+        self.assertIsNone(cache.get(("ford-m-series", "123456", "")))
+        self.assertTrue(cache.put(("ford-m-series", "123456", ""), {"error": RadioErrors.SUCCESS, "code": "2487"}))
+
+        result = cache.get(("ford-m-series", "123456", ""))
+        self.assertEqual(result, {"error": RadioErrors.SUCCESS, "code": "2487"})
+
+        # the cached result can't be modified through the returned copy
+        result["code"] = "0000"
+        self.assertEqual(cache.get(("ford-m-series", "123456", ""))["code"], "2487")
+
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 0, "expirations": 0, "size": 1})
+
+    def test_only_success_cached(self):
+
+        cache = RadioCodeCache(negative_errors=[RadioErrors.INVALID_SERIAL_NOT_SUPPORTED])
+
+        self.assertFalse(cache.put(("a", "1", ""), {"error": RadioErrors.ERROR_CONNECTION}))
+        self.assertFalse(cache.put(("a", "2", ""), {"error": RadioErrors.INVALID_LICENSE}))
+        self.assertTrue(cache.put(("a", "3", ""), {"error": RadioErrors.INVALID_SERIAL_NOT_SUPPORTED}))
+        self.assertEqual(len(cache), 1)
+
+    def test_compact(self):
+
+        cache = RadioCodeCache(compact=True, negative_errors=[RadioErrors.INVALID_SERIAL_NOT_SUPPORTED])
+
+        cache.put(("ford-m-series", "123456", ""), {"error": RadioErrors.SUCCESS, "code": "2487"})
+        cache.put(("ford-m-series", "654321", ""), {"error": RadioErrors.INVALID_SERIAL_NOT_SUPPORTED, "serialMaxLen": 6})
+
+        # the results with the other fields are kept as they are
+        self.assertIsInstance(cache._entries[("ford-m-series", "123456", "")][1], CalcResult)
+        self.assertIsInstance(cache._entries[("ford-m-series", "654321", "")][1], dict)
+
+        self.assertEqual(cache.get(("ford-m-series", "123456", "")), {"error": RadioErrors.SUCCESS, "code": "2487"})
+        self.assertEqual(cache.get(("ford-m-series", "654321", "")),
+                         {"error": RadioErrors.INVALID_SERIAL_NOT_SUPPORTED, "serialMaxLen": 6})
+
+    def test_lru_eviction(self):
+
+        cache = RadioCodeCache(max_size=2)
+
+        cache.put(("a", "1", ""), {"error": RadioErrors.SUCCESS, "code": "1"})
+        cache.put(("a", "2", ""), {"error": RadioErrors.SUCCESS, "code": "2"})
+
+        # "1" becomes the most recently used one
+        cache.get(("a", "1", ""))
+        cache.put(("a", "3", ""), {"error": RadioErrors.SUCCESS, "code": "3"})
+
+        self.assertIsNotNone(cache.get(("a", "1", "")))
+        self.assertIsNone(cache.get(("a", "2", "")))
+        self.assertIsNotNone(cache.get(("a", "3", "")))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl(self):
+
+        cache = RadioCodeCache(ttl=60, negative_errors=[RadioErrors.INVALID_SERIAL_NOT_SUPPORTED], negative_ttl=0.05)
+
+        cache.put(("a", "1", ""), {"error": RadioErrors.SUCCESS, "code": "1"})
+        cache.put(("a", "2", ""), {"error": RadioErrors.INVALID_SERIAL_NOT_SUPPORTED})
+
+        time.sleep(0.1)
+
+        self.assertIsNotNone(cache.get(("a", "1", "")))
+        self.assertIsNone(cache.get(("a", "2", "")))
+        self.assertEqual(cache.expirations, 1)
+
+    def test_threads(self):
+
+        cache = RadioCodeCache(max_size=100)
+
+        def worker(index: int):
+            for i in range(1000):
+                key = ("a", str((index * 1000 + i) % 150), "")
+                if cache.get(key) is None:
+                    cache.put(key, {"error": RadioErrors.SUCCESS, "code": key[1]})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(worker, range(8)))
+
+        stats = cache.stats()
+
+        self.assertEqual(stats["hits"] + stats["misses"], 8000)
+        self.assertEqual(stats["size"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - WebApi interface offline unit test
+#
+# Validate the SDK against a local stand-in Web API server (no network and
+# no activation key required)
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code
+
+
+class TestRadioCodeCalculatorOffline(unittest.TestCase):
+
+    #
+    # local stand-in Web API server
+    #
+    server: StandInServer
+
+    def setUp(self):
+
+        self.server = StandInServer().start()
+
+        #
+        # create Radio Code Calculator API class instance pointed at the stand-in server
+        #
+        self.myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY)
+        self.myRadioCodeCalculator.API_URL = self.server.url
+
+    def tearDown(self):
+
+        self.myRadioCodeCalculator.close()
+        self.server.stop()
+
+    def test_calc(self):
+
+        error, result = self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+    def test_connection_reuse(self):
+
+        # all the commands share the same keep-alive connection
+        for _ in range(5):
+            error, result = self.myRadioCodeCalculator.login()
+            self.assertEqual(error, RadioErrors.SUCCESS)
+
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_connection_pool_threads(self):
+
+        # the pool never opens more connections than the worker threads
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda serial: self.myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, serial),
+                                        [f"{i:06d}" for i in range(40)]))
+
+        self.assertTrue(all(error == RadioErrors.SUCCESS for error, result in results))
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_no_keep_alive(self):
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, keep_alive=False) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            for _ in range(3):
+                error, result = radioCodeApi.login()
+                self.assertEqual(error, RadioErrors.SUCCESS)
+
+        self.assertEqual(self.server.connections, 3)
+
+    def test_close(self):
+
+        error, result = self.myRadioCodeCalculator.login()
+        self.assertEqual(error, RadioErrors.SUCCESS)
+
+        # the session is re-created on the next request after close()
+        self.myRadioCodeCalculator.close()
+
+        error, result = self.myRadioCodeCalculator.login()
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_calc_many(self):
+
+        items = [(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(20)]
+
+        # one bad serial & one malformed item don't abort the batch
+        items += [(RadioModels.FORD_M_SERIES, "12345A"), ("renault-dacia", "Z999", ""), ("renault-dacia",)]
+
+        results = self.myRadioCodeCalculator.calc_many(items, max_workers=4)
+
+        self.assertEqual(len(results), len(items))
+
+        for (radio_model, serial), (error, result) in zip(items[:20], results):
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertEqual(result["code"], stand_in_code(radio_model.name, serial))
+
+        self.assertEqual(results[20][0], RadioErrors.INVALID_SERIAL_PATTERN)
+        self.assertEqual(results[21][1]["code"], stand_in_code("renault-dacia", "Z999"))
+        self.assertEqual(results[22][0], RadioErrors.INVALID_INPUT)
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_calc_many_unordered(self):
+
+        items = [(RadioModels.JAGUAR_ALPINE, f"{i:05d}") for i in range(10)]
+
+        results = self.myRadioCodeCalculator.calc_many(items, ordered=False)
+
+        self.assertEqual(sorted(index for index, error, result in results), list(range(10)))
+
+        for index, error, result in results:
+            self.assertEqual(result["code"], stand_in_code("jaguar-alpine", items[index][1]))
+
+    def test_calc_iter(self):
+
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield RadioModels.FORD_M_SERIES, f"{i:06d}"
+
+        results = self.myRadioCodeCalculator.calc_iter(items(), max_workers=4, window=8)
+
+        # the input is read lazily, only the window ahead
+        item, error, result = next(results)
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(result["code"], stand_in_code("ford-m-series", item[1]))
+        self.assertLessEqual(len(consumed), 8 + 4)
+
+        rest = list(results)
+
+        self.assertEqual(len(rest), 99)
+        self.assertTrue(all(result["code"] == stand_in_code("ford-m-series", item[1]) for item, error, result in rest))
+
+    def test_calc_iter_stop_early(self):
+
+        items = ((RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(1000))
+
+        for item, error, result in self.myRadioCodeCalculator.calc_iter(items, max_workers=2, window=4):
+            break
+
+        # the requests not sent yet are dropped
+        self.assertLess(self.server.requests, 10)
+
+    def test_offline_validation(self):
+
+        radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, offline_validation=True)
+        radioCodeApi.API_URL = self.server.url
+
+        # invalid input is rejected with the same error as the Web API would return
+        for radio_model, serial in [(RadioModels.FORD_M_SERIES, "1"), ("ford-m-series", "12345A"), ("renault-dacia", "9999")]:
+
+            error, result = radioCodeApi.calc(radio_model, serial)
+            expected_error, expected_result = self.myRadioCodeCalculator.calc(radio_model, serial)
+
+            self.assertEqual(error, expected_error)
+            self.assertEqual(result, expected_result)
+
+        self.assertEqual(self.server.requests, 3)
+
+        # the results don't share the patterns of the radio model
+        error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "1")
+        result["serialRegexPattern"]["python"] = "modified"
+
+        self.assertNotEqual(RadioModels.FORD_M_SERIES.serial_regex_pattern, "modified")
+
+        # valid input & unknown radio models are sent to the Web API
+        error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+        self.assertEqual(error, RadioErrors.SUCCESS)
+
+        error, result = radioCodeApi.calc("INVALID RADIO MODEL", "1234")
+        self.assertEqual(error, RadioErrors.INVALID_RADIO_MODEL)
+
+        # bulk requests are validated too
+        results = radioCodeApi.calc_many([(RadioModels.JAGUAR_ALPINE, "1234"), (RadioModels.JAGUAR_ALPINE, "12345")])
+        self.assertEqual([error for error, result in results], [RadioErrors.INVALID_SERIAL_LENGTH, RadioErrors.SUCCESS])
+
+        self.assertEqual(self.server.requests, 6)
+        radioCodeApi.close()
+
+    def test_offline_validation_list(self):
+
+        radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, offline_validation=True)
+        radioCodeApi.API_URL = self.server.url
+
+        # models downloaded with list() take precedence over the predefined ones
+        error, radio_models = radioCodeApi.list()
+        self.assertEqual(error, RadioErrors.SUCCESS)
+
+        radioCodeApi._radio_models["jaguar-alpine"] = RadioModel("jaguar-alpine", 4, r"^([0-9]{4})$")
+
+        error, result = radioCodeApi.calc("jaguar-alpine", "12345")
+
+        self.assertEqual(error, RadioErrors.INVALID_SERIAL_LENGTH)
+        self.assertEqual(result["serialMaxLen"], 4)
+        self.assertEqual(self.server.requests, 1)
+        radioCodeApi.close()
+
+    def test_cache(self):
+
+        cache = RadioCodeCache(max_size=10)
+
+        radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, cache=cache)
+        radioCodeApi.API_URL = self.server.url
+
+        for _ in range(3):
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+            self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+            # errors are not cached
+            error, result = radioCodeApi.calc("ford-m-series", "1")
+            self.assertEqual(error, RadioErrors.INVALID_SERIAL_LENGTH)
+
+        self.assertEqual(self.server.requests, 4)
+        self.assertEqual(cache.hits, 2)
+        radioCodeApi.close()
+
+    def test_typed_results(self):
+
+        radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, typed_results=True, offline_validation=True,
+                                           cache=RadioCodeCache())
+        radioCodeApi.API_URL = self.server.url
+
+        error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(result, CalcResult(RadioErrors.SUCCESS, stand_in_code("ford-m-series", "123456"),
+                                            "ford-m-series", "123456", ""))
+
+        # the cached result, and the dictionary-style access
+        error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+        self.assertEqual(result.to_dict(), {"error": RadioErrors.SUCCESS, "code": result.code})
+
+        # only the keys of the raw results
+        self.assertIn("code", result)
+        self.assertNotIn("radio_model", result)
+        self.assertNotIn(0, result)
+        self.assertEqual(dict(result), result.to_dict())
+        self.assertEqual(list(result.keys()), ["error", "code"])
+
+        with self.assertRaises(KeyError):
+            result["radio_model"]
+
+        error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "1")
+
+        self.assertEqual(error, RadioErrors.INVALID_SERIAL_LENGTH)
+        self.assertEqual(result.error, RadioErrors.INVALID_SERIAL_LENGTH)
+        self.assertIsNone(result.get("code"))
+        self.assertNotIn("code", result)
+        self.assertEqual(dict(result), {"error": RadioErrors.INVALID_SERIAL_LENGTH})
+
+        with self.assertRaises(KeyError):
+            result["code"]
+
+        results = radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, "123456"), ("ford-m-series",)])
+
+        self.assertIsInstance(results[0][1], CalcResult)
+        self.assertEqual(results[1][1], CalcResult(RadioErrors.INVALID_INPUT))
+
+        self.assertEqual(self.server.requests, 1)
+        radioCodeApi.close()
+
+    def test_coalesce_requests(self):
+
+        self.server.latency = 0.2
+
+        # identical concurrent requests are sent only once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self.myRadioCodeCalculator.list(), range(8)))
+
+        self.assertTrue(all(error == RadioErrors.SUCCESS for error, radio_models in results))
+        self.assertEqual(self.server.requests, 1)
+
+        # different parameters are not coalesced
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda serial: self.myRadioCodeCalculator.calc(RadioModels.JAGUAR_ALPINE, serial),
+                              ["12345", "12345", "54321", "54321"]))
+
+        self.assertEqual(self.server.requests, 3)
+
+    def test_coalesce_requests_deadline(self):
+
+        self.server.latency = 0.5
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = executor.submit(self.myRadioCodeCalculator.login)
+
+            time.sleep(0.1)
+
+            # the waiting caller doesn't wait longer than its own deadline
+            start = time.monotonic()
+
+            self.assertEqual(self.myRadioCodeCalculator.login(timeout=0.1)[0], RadioErrors.ERROR_CONNECTION)
+            self.assertLess(time.monotonic() - start, 0.3)
+
+            self.assertEqual(first.result()[0], RadioErrors.SUCCESS)
+
+        self.assertEqual(self.server.requests, 1)
+
+    def test_coalesce_requests_disabled(self):
+
+        self.server.latency = 0.1
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, coalesce_requests=False) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: radioCodeApi.login(), range(4)))
+
+        self.assertEqual(self.server.requests, 4)
+
+    def test_connection_error(self):
+
+        self.server.stop()
+
+        error, result = self.myRadioCodeCalculator.login()
+
+        self.assertEqual(error, RadioErrors.ERROR_CONNECTION)
+        self.assertEqual(result, {"error": RadioErrors.ERROR_CONNECTION})
+
+
+if __name__ == '__main__':
+    unittest.main()
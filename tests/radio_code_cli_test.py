@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - bulk file pipeline unit test
+#
+# Validate the radio-code-calculator command, deduplication & resuming
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License       : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+from radio_code_calculator.radio_code_cli import Pipeline, main, normalize_serial
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code, stand_in_response
+
+
+class CrashingCalculator(object):
+    """Calculator wrapper simulating a crash after the given number of the results"""
+
+    def __init__(self, calculator: RadioCodeCalculator, results: int):
+        self.calculator = calculator
+        self.results = results
+
+    def calc_iter(self, items, max_workers=None, window=None):
+
+        for count, result in enumerate(self.calculator.calc_iter(items, max_workers, window)):
+            if count == self.results:
+                raise RuntimeError("crash")
+            yield result
+
+
+class TestRadioCodeCli(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def write_lines(self, name: str, lines: list) -> str:
+
+        with open(self.path(name), "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+        return self.path(name)
+
+    @staticmethod
+    def read_jsonl(path: str) -> list:
+
+        with open(path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_normalize_serial(self):
+
+        self.assertEqual(normalize_serial(RadioModels.FORD_M_SERIES, " 123-456 "), "123456")
+        self.assertEqual(normalize_serial(RadioModels.RENAULT_DACIA, "d123"), "D123")
+
+        # the letter case is kept when upper case doesn't help
+        self.assertEqual(normalize_serial(RadioModels.RENAULT_DACIA, "d12"), "d12")
+
+    def test_main_csv(self):
+
+        input_path = self.write_lines("serials.csv", [
+            "radio_model,serial,extra",
+            "ford-m-series,123456,",
+            "renault-dacia,d123,",
+            "ford-m-series,123-456,",
+            "ford-m-series,12345,",
+            "unknown-model,123,",
+            "",
+            "ford-travelpilot,1234567,",
+        ])
+        output_path = self.path("codes.jsonl")
+
+        server = StandInServer().start()
+
+        try:
+            exit_code = main([input_path, output_path, "--api-key", STAND_IN_ACTIVATION_KEY, "--api-url", server.url,
+                              "--workers", "2", "--progress-every", "0"])
+        finally:
+            server.stop()
+
+        self.assertEqual(exit_code, 0)
+
+        results = {result["record"]: result for result in self.read_jsonl(output_path)}
+
+        # the duplicate (after the normalization) is written only once
+        self.assertEqual(sorted(results), [1, 2, 4, 5, 6])
+
+        self.assertEqual(results[1]["code"], stand_in_code("ford-m-series", "123456"))
+        self.assertEqual(results[2]["code"], stand_in_code("renault-dacia", "D123"))
+        self.assertEqual(results[4]["error"], RadioErrors.INVALID_SERIAL_LENGTH)
+        self.assertEqual(results[5]["error"], RadioErrors.INVALID_RADIO_MODEL)
+        self.assertEqual(results[6]["code"], stand_in_code("ford-travelpilot", "1234567"))
+
+        # the invalid serial numbers are never sent
+        self.assertEqual(server.requests, 3)
+
+    def test_main_error(self):
+
+        input_path = self.write_lines("serials.csv", ["ford-m-series,123456,"])
+        checkpoint_path = self.write_lines("codes.checkpoint", ["not a database"])
+
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            exit_code = main([input_path, self.path("codes.jsonl"), "--checkpoint", checkpoint_path, "--progress-every", "0"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(len(stderr.getvalue().splitlines()), 1)
+        self.assertIn("DatabaseError", stderr.getvalue())
+
+    def test_pipeline_jsonl_to_csv(self):
+
+        input_path = self.write_lines("serials.jsonl", [
+            json.dumps({"serial": "654321"}),
+            "not json",
+            json.dumps({"serial": "654321"}),
+            json.dumps({"serial": "111111", "radio_model": "ford-travelpilot"}),
+        ])
+        output_path = self.path("codes.csv")
+
+        calculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(stand_in_response))
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 4, "invalid": 2, "duplicates": 1, "calculated": 1, "failed": 0})
+
+        with open(output_path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+        self.assertEqual(lines[0], "record,radio_model,serial,extra,error,code")
+        self.assertIn(f"1,ford-m-series,654321,,0,{stand_in_code('ford-m-series', '654321')}", lines)
+        self.assertIn(f"2,,,,{int(RadioErrors.INVALID_INPUT)},", lines)
+        self.assertIn(f"4,ford-travelpilot,111111,,{int(RadioErrors.INVALID_SERIAL_LENGTH)},", lines)
+
+    def test_not_utf8(self):
+
+        input_path = self.path("serials.csv")
+
+        with open(input_path, "wb") as file:
+            file.write(b"12\xff456\n123456\n")
+
+        output_path = self.path("codes.jsonl")
+
+        calculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(stand_in_response))
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 2, "invalid": 1, "duplicates": 0, "calculated": 1, "failed": 0})
+        self.assertIn({"record": 1, "error": RadioErrors.INVALID_INPUT}, self.read_jsonl(output_path))
+
+    def test_duplicate_before_checkpoint(self):
+
+        # the first copy is written, but not checkpointed yet when the duplicate comes
+        input_path = self.write_lines("serials.csv", ["123456", "12345"] + [f"{i:06d}" for i in range(20)] + ["123456", "12345"])
+        output_path = self.path("codes.jsonl")
+
+        serials = []
+
+        def handler(params: dict) -> dict:
+            serials.append(params["serial"])
+            return stand_in_response(params)
+
+        calculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(handler))
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", workers=2, window=2,
+                         log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 24, "invalid": 1, "duplicates": 2, "calculated": 21, "failed": 0})
+        self.assertEqual(serials.count("123456"), 1)
+        self.assertEqual(sorted(result["record"] for result in self.read_jsonl(output_path)), list(range(1, 23)))
+
+    def test_resume(self):
+
+        serials = [f"{i % 150:06d}" for i in range(200)]
+
+        input_path = self.write_lines("serials.csv", [f"ford-m-series,{serial}," for serial in serials])
+        output_path = self.path("codes.jsonl")
+
+        transport = FakeTransport(stand_in_response)
+        calculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport)
+
+        with self.assertRaises(RuntimeError):
+            Pipeline(CrashingCalculator(calculator, 70), input_path, output_path, workers=4, checkpoint_every=16,
+                     log=io.StringIO()).run()
+
+        crashed_requests = transport.requests
+
+        stats = Pipeline(calculator, input_path, output_path, workers=4, checkpoint_every=16, log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 200, "invalid": 0, "duplicates": 50, "calculated": 150, "failed": 0})
+
+        results = self.read_jsonl(output_path)
+
+        # each unique serial number is written exactly once
+        self.assertEqual(sorted(result["record"] for result in results), list(range(1, 151)))
+        self.assertTrue(all(result["code"] == stand_in_code("ford-m-series", result["serial"]) for result in results))
+
+        # the records finished before the last checkpoint are not calculated again
+        self.assertLess(transport.requests - crashed_requests, 150)
+
+        # nothing left to do
+        stats = Pipeline(calculator, input_path, output_path, log=io.StringIO()).run()
+
+        self.assertEqual(stats["records"], 200)
+        self.assertEqual(len(self.read_jsonl(output_path)), 150)
+
+    def test_resume_before_first_record(self):
+
+        input_path = self.write_lines("serials.csv", ["111111", "222222"])
+        output_path = self.path("codes.jsonl")
+
+        def handler(params: dict) -> dict:
+
+            # the first record finishes after the second one
+            if params["serial"] == "111111":
+                time.sleep(0.2)
+
+            return stand_in_response(params)
+
+        calculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(handler))
+
+        # the second record is written & checkpointed, the first one never finishes
+        with self.assertRaises(RuntimeError):
+            Pipeline(CrashingCalculator(calculator, 1), input_path, output_path, radio_model="ford-m-series", workers=2,
+                     checkpoint_every=1, log=io.StringIO()).run()
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", workers=2,
+                         log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 2, "invalid": 0, "duplicates": 0, "calculated": 2, "failed": 0})
+        self.assertEqual(sorted(result["serial"] for result in self.read_jsonl(output_path)), ["111111", "222222"])
+
+        # the output file is removed -> start over
+        os.remove(output_path)
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", log=io.StringIO()).run()
+
+        self.assertEqual(stats["calculated"], 2)
+        self.assertEqual(len(self.read_jsonl(output_path)), 2)
+
+        # the malformed records written out of order aren't written again
+        input_path = self.write_lines("serials.jsonl", [json.dumps({"serial": "111111"}), "not json",
+                                                        json.dumps({"serial": "222222"})])
+        output_path = self.path("codes.jsonl")
+
+        with self.assertRaises(RuntimeError):
+            Pipeline(CrashingCalculator(calculator, 1), input_path, output_path, radio_model="ford-m-series", workers=2,
+                     checkpoint_every=1, restart=True, log=io.StringIO()).run()
+
+        stats = Pipeline(calculator, input_path, output_path, radio_model="ford-m-series", log=io.StringIO()).run()
+
+        self.assertEqual(stats, {"records": 3, "invalid": 1, "duplicates": 0, "calculated": 2, "failed": 0})
+        self.assertEqual(sorted(result["record"] for result in self.read_jsonl(output_path)), [1, 2, 3])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - timeouts & hedged requests unit test
+#
+# Validate the per-call deadlines, the transport timeouts and the hedged
+# calc requests
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import itertools
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code, stand_in_response
+
+
+def latency_cycle(*latencies: float):
+    """Latency function repeating the given latencies"""
+
+    cycle = itertools.cycle(latencies)
+    return lambda: next(cycle)
+
+
+def refuse(params: dict) -> dict:
+    raise TransportConnectionError("connection refused")
+
+
+class TestTimeouts(unittest.TestCase):
+
+    def test_read_timeout(self):
+
+        server = StandInServer(latency=0.5).start()
+
+        try:
+            with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, read_timeout=0.1) as radioCodeApi:
+                radioCodeApi.API_URL = server.url
+
+                start = time.monotonic()
+
+                self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+                self.assertLess(time.monotonic() - start, 0.4)
+        finally:
+            server.stop()
+
+    def test_call_deadline(self):
+
+        transport = FakeTransport(stand_in_response, latency=0.5)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+
+            start = time.monotonic()
+
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456", timeout=0.1)[0], RadioErrors.ERROR_CONNECTION)
+            self.assertLess(time.monotonic() - start, 0.4)
+
+            # no deadline
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")[0], RadioErrors.SUCCESS)
+
+    def test_deadline_bounds_retries(self):
+
+        transport = FakeTransport(refuse)
+        retry_policy = RetryPolicy(max_attempts=100, base_delay=0.05, multiplier=1.0, jitter=False)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy,
+                                 timeout=0.2) as radioCodeApi:
+
+            start = time.monotonic()
+
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+            self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_deadline_circuit_breaker(self):
+
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+        rate_limiter = RateLimiter(5, burst=1)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(stand_in_response),
+                                 rate_limiter=rate_limiter, circuit_breaker=circuit_breaker) as radioCodeApi:
+
+            circuit_breaker.record_failure()
+
+            # the recovery timeout has passed
+            circuit_breaker._opened_at -= 10.0
+
+            # the wait for the rate limit uses up the deadline of the trial request
+            rate_limiter.acquire()
+
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456", timeout=0.1)[0], RadioErrors.ERROR_CONNECTION)
+
+            # the trial isn't held by the request that wasn't sent
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")[0], RadioErrors.SUCCESS)
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestHedging(unittest.TestCase):
+
+    def test_hedged_request(self):
+
+        hedging = HedgingPolicy(initial_delay=0.05)
+
+        # the first request is stuck, the hedged one answers right away
+        transport = FakeTransport(stand_in_response, latency=latency_cycle(1.0, 0.0))
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, hedging=hedging) as radioCodeApi:
+
+            start = time.monotonic()
+
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+            self.assertLess(time.monotonic() - start, 0.5)
+
+        self.assertEqual(hedging.stats()["hedged"], 1)
+        self.assertEqual(hedging.stats()["hedge_wins"], 1)
+
+    def test_queued_request_not_hedged(self):
+
+        hedging = HedgingPolicy(initial_delay=0.05)
+        transport = FakeTransport(stand_in_response, latency=0.01)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, hedging=hedging) as radioCodeApi:
+
+            # the executor is busy, the request waits for a free thread longer than the hedge delay
+            radioCodeApi._hedge_executor.shutdown()
+            radioCodeApi._hedge_executor = ThreadPoolExecutor(max_workers=1)
+            radioCodeApi._hedge_executor.submit(time.sleep, 0.2)
+
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")[0], RadioErrors.SUCCESS)
+
+            # the deadline passes in the queue, the request is not sent
+            radioCodeApi._hedge_executor.submit(time.sleep, 0.2)
+
+            self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "654321", timeout=0.05)[0], RadioErrors.ERROR_CONNECTION)
+
+        self.assertEqual(hedging.stats()["hedged"], 0)
+        self.assertEqual(transport.requests, 1)
+
+    def test_percentile_delay(self):
+
+        hedging = HedgingPolicy(percentile=90.0, min_samples=10)
+
+        for latency in range(1, 101):
+            hedging.record(latency / 1000.0)
+
+        self.assertAlmostEqual(hedging.delay(), 0.091)
+
+    def test_fast_requests_not_hedged(self):
+
+        hedging = HedgingPolicy(initial_delay=0.5)
+        transport = FakeTransport(stand_in_response)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, hedging=hedging) as radioCodeApi:
+
+            results = radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(20)])
+
+            # only the calc requests are hedged
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.SUCCESS)
+
+        self.assertTrue(all(error == RadioErrors.SUCCESS for error, result in results))
+        self.assertEqual(transport.requests, 21)
+        self.assertEqual(hedging.stats()["requests"], 20)
+        self.assertEqual(hedging.stats()["hedged"], 0)
+
+
+class TestAsyncHedging(unittest.IsolatedAsyncioTestCase):
+
+    async def test_hedged_request(self):
+
+        hedging = HedgingPolicy(initial_delay=0.05)
+        transport = AsyncFakeTransport(stand_in_response, latency=latency_cycle(1.0, 0.0))
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, hedging=hedging) as radioCodeApi:
+
+            start = time.monotonic()
+
+            error, result = await radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertLess(time.monotonic() - start, 0.5)
+
+        self.assertEqual(hedging.stats()["hedge_wins"], 1)
+
+    async def test_call_deadline(self):
+
+        transport = AsyncFakeTransport(stand_in_response, latency=0.5)
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+
+            start = time.monotonic()
+
+            self.assertEqual((await radioCodeApi.login(timeout=0.1))[0], RadioErrors.ERROR_CONNECTION)
+            self.assertLess(time.monotonic() - start, 0.4)
+
+    async def test_deadline_circuit_breaker(self):
+
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+        rate_limiter = RateLimiter(5, burst=1)
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=AsyncFakeTransport(stand_in_response),
+                                            rate_limiter=rate_limiter, circuit_breaker=circuit_breaker) as radioCodeApi:
+
+            circuit_breaker.record_failure()
+
+            # the recovery timeout has passed
+            circuit_breaker._opened_at -= 10.0
+
+            # the wait for the rate limit uses up the deadline of the trial request
+            rate_limiter.acquire()
+
+            self.assertEqual((await radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456", timeout=0.1))[0],
+                             RadioErrors.ERROR_CONNECTION)
+
+            # the trial isn't held by the request that wasn't sent
+            self.assertEqual((await radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456"))[0], RadioErrors.SUCCESS)
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
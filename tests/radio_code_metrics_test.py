@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - metrics unit test
+#
+# Validate the metrics collector, its exports and the SDK instrumentation
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import asyncio
+import importlib.util
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY
+
+
+class TestMetricsCollector(unittest.TestCase):
+
+    def test_snapshot(self):
+
+        metrics = MetricsCollector(buckets=[0.1, 1.0])
+
+        metrics.record_request("calc", "ford-m-series", RadioErrors.SUCCESS, 0.05)
+        metrics.record_request("calc", "ford-m-series", RadioErrors.SUCCESS, 0.1)
+        metrics.record_request("calc", "ford-m-series", RadioErrors.INVALID_SERIAL_LENGTH, 5.0)
+        metrics.record_request("login", "", RadioErrors.SUCCESS, 0.5)
+        metrics.record_failure("calc", TransportTimeoutError("timeout"))
+        metrics.record_transfer(100, 20)
+        metrics.record_transfer(100, 30)
+        metrics.record_connection()
+        metrics.record_cache("cache", True)
+        metrics.record_cache("cache", False)
+        metrics.record_cache("cache", False)
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["latency"]["calc"]["ford-m-series"]["buckets"], {0.1: 2, 1.0: 2})
+        self.assertEqual(snapshot["latency"]["calc"]["ford-m-series"]["count"], 3)
+        self.assertAlmostEqual(snapshot["latency"]["calc"]["ford-m-series"]["sum"], 5.15)
+        self.assertEqual(snapshot["latency"]["login"][""]["buckets"], {0.1: 0, 1.0: 1})
+        self.assertEqual(snapshot["errors"], {"calc": {"SUCCESS": 2, "INVALID_SERIAL_LENGTH": 1}, "login": {"SUCCESS": 1}})
+        self.assertEqual(snapshot["failures"], {"calc": {"timeout": 1}})
+        self.assertEqual(snapshot["cache"], {"cache": {"hits": 1, "misses": 2}})
+        self.assertEqual((snapshot["http_requests"], snapshot["bytes_sent"], snapshot["bytes_received"]), (2, 200, 50))
+        self.assertEqual((snapshot["connections"], snapshot["connections_reused"]), (1, 1))
+
+        metrics.reset()
+
+        self.assertEqual(metrics.snapshot()["latency"], {})
+
+    def test_prometheus(self):
+
+        metrics = MetricsCollector(buckets=[0.1, 1.0])
+
+        metrics.record_request("calc", "ford-m-series", RadioErrors.SUCCESS, 0.05)
+        metrics.record_request("calc", "ford-m-series", RadioErrors.SUCCESS, 2.0)
+        metrics.record_cache("store", True)
+
+        lines = metrics.prometheus().splitlines()
+
+        self.assertIn('radio_code_calculator_request_duration_seconds_bucket{command="calc",radio_model="ford-m-series",le="0.1"} 1', lines)
+        self.assertIn('radio_code_calculator_request_duration_seconds_bucket{command="calc",radio_model="ford-m-series",le="1.0"} 1', lines)
+        self.assertIn('radio_code_calculator_request_duration_seconds_bucket{command="calc",radio_model="ford-m-series",le="+Inf"} 2', lines)
+        self.assertIn('radio_code_calculator_request_duration_seconds_count{command="calc",radio_model="ford-m-series"} 2', lines)
+        self.assertIn('radio_code_calculator_responses_total{command="calc",error="SUCCESS"} 2', lines)
+        self.assertIn('radio_code_calculator_cache_lookups_total{layer="store",result="hit"} 1', lines)
+        self.assertIn('radio_code_calculator_cache_lookups_total{layer="store",result="miss"} 0', lines)
+        self.assertIn("# TYPE radio_code_calculator_bytes_sent_total counter", lines)
+
+
+class TestMetricsInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StandInServer().start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def check_transport(self, transport: Transport):
+
+        metrics = MetricsCollector()
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, cache=RadioCodeCache(),
+                                 metrics=metrics) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            radioCodeApi.login()
+
+            for _ in range(3):
+                radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            radioCodeApi.calc(RadioModels.FORD_M_SERIES, "1")
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["latency"]["calc"]["ford-m-series"]["count"], 2)
+        self.assertEqual(snapshot["errors"]["calc"], {"SUCCESS": 1, "INVALID_SERIAL_LENGTH": 1})
+        self.assertEqual(snapshot["errors"]["login"], {"SUCCESS": 1})
+        self.assertEqual(snapshot["cache"], {"cache": {"hits": 2, "misses": 2}})
+
+        # all the requests over a single keep-alive connection
+        self.assertEqual(snapshot["http_requests"], 3)
+        self.assertEqual(snapshot["connections"], 1)
+        self.assertEqual(snapshot["connections_reused"], 2)
+        self.assertGreater(snapshot["bytes_sent"], 3 * len(STAND_IN_ACTIVATION_KEY))
+        self.assertGreater(snapshot["bytes_received"], 0)
+
+    def test_requests_transport(self):
+        self.check_transport(RequestsTransport())
+
+    def test_bytes_sent(self):
+
+        from urllib.parse import urlencode
+
+        # the encoded request size, the same for all the transports
+        data = {"command": "calc", "key": STAND_IN_ACTIVATION_KEY, "radio_model": "ford-m-series", "serial": "ąę€"}
+        transports = [RequestsTransport()]
+
+        if importlib.util.find_spec("urllib3") is not None:
+            transports.append(Urllib3Transport())
+
+        if importlib.util.find_spec("httpx") is not None:
+            transports.append(HttpxTransport())
+
+        for transport in transports:
+            metrics = MetricsCollector()
+            transport.metrics = metrics
+
+            transport.post(self.server.url, data)
+            transport.close()
+
+            self.assertEqual(metrics.snapshot()["bytes_sent"], len(urlencode(data).encode("utf-8")), type(transport).__name__)
+
+    @unittest.skipIf(importlib.util.find_spec("urllib3") is None, "urllib3 is not installed")
+    def test_urllib3_transport(self):
+        self.check_transport(Urllib3Transport())
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_httpx_transport(self):
+        self.check_transport(HttpxTransport())
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_async(self):
+
+        metrics = MetricsCollector()
+
+        async def calc():
+            async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, metrics=metrics) as radioCodeApi:
+                radioCodeApi.API_URL = self.server.url
+                return await radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(5)])
+
+        asyncio.run(calc())
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["errors"]["calc"], {"SUCCESS": 5})
+        self.assertEqual(snapshot["http_requests"], 5)
+        self.assertGreaterEqual(snapshot["connections"], 1)
+
+    def test_failures(self):
+
+        metrics = MetricsCollector()
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, metrics=metrics,
+                                 retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0)) as radioCodeApi:
+
+            # only the "/" path exists
+            radioCodeApi.API_URL = self.server.url + "missing"
+
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(error, RadioErrors.ERROR_CONNECTION)
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["failures"], {"calc": {"status": 1}})
+        self.assertEqual(snapshot["errors"]["calc"], {"ERROR_CONNECTION": 1})
+
+
+if __name__ == '__main__':
+
+    unittest.main()
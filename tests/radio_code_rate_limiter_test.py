@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - client-side rate limiter unit test
+#
+# Validate the token bucket shared by the threads and the asyncio tasks
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import STAND_IN_ACTIVATION_KEY, stand_in_response
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_unlimited(self):
+
+        rate_limiter = RateLimiter()
+
+        for _ in range(100):
+            self.assertEqual(rate_limiter.acquire(), 0.0)
+
+        self.assertEqual(rate_limiter.stats()["waited"], 0)
+
+    def test_burst(self):
+
+        rate_limiter = RateLimiter(rate=50, burst=5)
+
+        start = time.monotonic()
+
+        waits = [rate_limiter.acquire() for _ in range(15)]
+
+        # the burst is sent at once, the rest is spread at the rate
+        self.assertEqual(waits[:5], [0.0] * 5)
+        self.assertGreaterEqual(time.monotonic() - start, 10 / 50 * 0.9)
+
+        stats = rate_limiter.stats()
+
+        self.assertEqual(stats["acquired"], 15)
+        self.assertEqual(stats["waited"], 10)
+        self.assertEqual(stats["queued"], 0)
+        self.assertGreater(stats["max_wait"], 0.0)
+
+    def test_threads(self):
+
+        rate_limiter = RateLimiter(rate=100, burst=1)
+
+        start = time.monotonic()
+
+        # the callers are queued, not rejected
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: rate_limiter.acquire(), range(30)))
+
+        self.assertGreaterEqual(time.monotonic() - start, 29 / 100 * 0.9)
+        self.assertEqual(rate_limiter.stats()["acquired"], 30)
+
+    def test_async(self):
+
+        rate_limiter = RateLimiter(rate=100, burst=1)
+
+        async def main():
+            await asyncio.gather(*[rate_limiter.acquire_async() for _ in range(20)])
+
+        start = time.monotonic()
+        asyncio.run(main())
+
+        self.assertGreaterEqual(time.monotonic() - start, 19 / 100 * 0.9)
+
+    def test_update_from_license(self):
+
+        rate_limiter = RateLimiter()
+
+        # the documented license fields don't define any limits
+        self.assertFalse(rate_limiter.update_from_license(stand_in_response({"key": STAND_IN_ACTIVATION_KEY, "command": "login"})))
+        self.assertIsNone(rate_limiter.rate)
+
+        # the strictest limit wins
+        result = {"error": RadioErrors.SUCCESS, "license": {"requestsPerSecond": 10, "requestsPerMinute": 300}}
+
+        self.assertTrue(rate_limiter.update_from_license(result))
+        self.assertEqual(rate_limiter.rate, 5.0)
+
+        self.assertFalse(rate_limiter.update_from_license({"error": RadioErrors.INVALID_LICENSE}))
+        self.assertEqual(rate_limiter.rate, 5.0)
+
+    def test_calculator(self):
+
+        def handler(params):
+            result = stand_in_response(params)
+
+            if params["command"] == "login":
+                result["license"]["requestsPerSecond"] = 100
+
+            return result
+
+        rate_limiter = RateLimiter()
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(handler), rate_limiter=rate_limiter) as radioCodeApi:
+
+            error, result = radioCodeApi.login()
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertEqual(rate_limiter.rate, 100)
+
+            results = radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(200)], max_workers=8)
+
+        self.assertTrue(all(error == RadioErrors.SUCCESS for error, result in results))
+        self.assertGreater(rate_limiter.stats()["total_wait"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - retry policy & circuit breaker unit test
+#
+# Validate the retries of the transient failures and the circuit breaker
+# with the in-process fake transports
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import STAND_IN_ACTIVATION_KEY, stand_in_response
+
+
+class FlakyHandler(object):
+    """Fail the first requests with the given exceptions, then answer like the stand-in server"""
+
+    def __init__(self, *failures: Exception):
+        self.failures = list(failures)
+
+    def __call__(self, params: dict) -> dict:
+
+        if self.failures:
+            raise self.failures.pop(0)
+
+        return stand_in_response(params)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_retry_transient(self):
+
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        transport = FakeTransport(FlakyHandler(TransportTimeoutError("timeout"), TransportStatusError(503)))
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy) as radioCodeApi:
+
+            error, result = radioCodeApi.login()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(transport.requests, 3)
+
+        stats = retry_policy.stats()
+
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["timeout_failures"], 1)
+        self.assertEqual(stats["status_failures"], 1)
+
+    def test_no_retry_permanent(self):
+
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        transport = FakeTransport(FlakyHandler(TransportStatusError(404)))
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy) as radioCodeApi:
+
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+
+        self.assertEqual(transport.requests, 1)
+        self.assertEqual(retry_policy.stats()["retries"], 0)
+
+    def test_max_attempts(self):
+
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        transport = FakeTransport(FlakyHandler(*[TransportConnectionError("refused")] * 5))
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy) as radioCodeApi:
+
+            self.assertEqual(radioCodeApi.login(), (RadioErrors.ERROR_CONNECTION, {"error": RadioErrors.ERROR_CONNECTION}))
+
+        self.assertEqual(transport.requests, 3)
+        self.assertEqual(retry_policy.stats()["exhausted"], 1)
+
+    def test_deadline(self):
+
+        retry_policy = RetryPolicy(max_attempts=100, base_delay=0.05, multiplier=1.0, jitter=False, deadline=0.2)
+        transport = FakeTransport(FlakyHandler(*[TransportConnectionError("refused")] * 100))
+
+        start = time.monotonic()
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy) as radioCodeApi:
+
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertLessEqual(transport.requests, 4)
+
+    def test_backoff_delays(self):
+
+        retry_policy = RetryPolicy(base_delay=0.1, max_delay=1.0, multiplier=2.0, jitter=False)
+
+        self.assertEqual([retry_policy.delay(attempt) for attempt in range(1, 6)], [0.1, 0.2, 0.4, 0.8, 1.0])
+
+        retry_policy.jitter = True
+
+        for attempt in range(1, 6):
+            self.assertLessEqual(retry_policy.delay(attempt), min(1.0, 0.1 * 2 ** (attempt - 1)))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_open_half_open_close(self):
+
+        changes = []
+
+        circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0.1,
+                                         on_state_change=lambda old, new: changes.append((old, new)))
+
+        transport = FakeTransport(FlakyHandler(*[TransportConnectionError("refused")] * 4))
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, circuit_breaker=circuit_breaker) as radioCodeApi:
+
+            for _ in range(3):
+                self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+            # fail fast without sending the request
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+            self.assertEqual(transport.requests, 3)
+
+            # the trial request fails, the circuit opens again
+            time.sleep(0.15)
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.ERROR_CONNECTION)
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+            # the trial request succeeds, the circuit closes
+            time.sleep(0.15)
+            self.assertEqual(radioCodeApi.login()[0], RadioErrors.SUCCESS)
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+        self.assertEqual(changes, [("closed", "open"), ("open", "half_open"), ("half_open", "open"),
+                                   ("open", "half_open"), ("half_open", "closed")])
+
+        stats = circuit_breaker.stats()
+
+        self.assertEqual(stats["opened"], 2)
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_client_errors(self):
+
+        circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+        # the Web API responded, it isn't down
+        circuit_breaker.record_exception(TransportStatusError(404))
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+        circuit_breaker.record_exception(TransportStatusError(502))
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+    def test_trial_release(self):
+
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        circuit_breaker.record_failure()
+
+        time.sleep(0.06)
+
+        # a single trial request at a time
+        self.assertTrue(circuit_breaker.allow())
+        self.assertFalse(circuit_breaker.allow())
+
+        # the trial without an outcome is given back
+        circuit_breaker.release()
+
+        self.assertTrue(circuit_breaker.allow())
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+
+        # the abandoned trial expires
+        time.sleep(0.06)
+
+        self.assertTrue(circuit_breaker.allow())
+
+
+class TestAsyncRetry(unittest.IsolatedAsyncioTestCase):
+
+    async def test_retry_transient(self):
+
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        circuit_breaker = CircuitBreaker()
+        transport = AsyncFakeTransport(FlakyHandler(TransportConnectionError("refused")))
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, retry_policy=retry_policy,
+                                            circuit_breaker=circuit_breaker) as radioCodeApi:
+
+            error, result = await radioCodeApi.login()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(transport.requests, 2)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_cancelled_trial(self):
+
+        import asyncio
+
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+        transport = AsyncFakeTransport(stand_in_response, latency=0.5)
+
+        # the cancelled request isn't shared with the next one
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, circuit_breaker=circuit_breaker,
+                                            coalesce_requests=False) as radioCodeApi:
+
+            circuit_breaker.record_failure()
+
+            # the recovery timeout has passed
+            circuit_breaker._opened_at -= 10.0
+
+            # the trial request is cancelled
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(radioCodeApi.login(), 0.05)
+
+            self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+
+            # the next request is the trial
+            transport.latency = 0.0
+
+            error, result = await radioCodeApi.login()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - stand-in server & load generator unit test
+#
+# Validate the stand-in Web API server options (latency, error injection,
+# connection limits) and the load generator reports
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import importlib.util
+import statistics
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code, \
+    lognormal_latency, uniform_latency
+from radio_code_calculator.radio_code_load_generator import LoadGenerator, LoadReport
+
+
+class TestStandInServer(unittest.TestCase):
+
+    def calculator(self, server: StandInServer, **options) -> RadioCodeCalculator:
+
+        myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, coalesce_requests=False, **options)
+        myRadioCodeCalculator.API_URL = server.url
+
+        return myRadioCodeCalculator
+
+    def test_commands(self):
+
+        with StandInServer() as server:
+
+            with self.calculator(server) as radioCodeApi:
+
+                self.assertEqual(radioCodeApi.login()[0], RadioErrors.SUCCESS)
+                self.assertEqual(radioCodeApi.calc(RadioModels.TOYOTA_ERC, "1234567890ABCDEF")[1]["code"],
+                                 stand_in_code("toyota-erc", "1234567890ABCDEF"))
+                self.assertEqual(radioCodeApi.calc(RadioModels.FORD_M_SERIES, "1")[0], RadioErrors.INVALID_SERIAL_LENGTH)
+                self.assertEqual(radioCodeApi.calc("unknown", "1")[0], RadioErrors.INVALID_RADIO_MODEL)
+
+                error, radio_models = radioCodeApi.list()
+
+                self.assertEqual(len(radio_models), len(RadioModels.all()))
+
+            with self.calculator(server) as radioCodeApi:
+                radioCodeApi._apiKey = "INVALID"
+
+                self.assertEqual(radioCodeApi.login()[0], RadioErrors.INVALID_LICENSE)
+
+        with StandInServer(radio_models=[RadioModels.FORD_M_SERIES]) as server, self.calculator(server) as radioCodeApi:
+
+            self.assertEqual(radioCodeApi.calc(RadioModels.JAGUAR_ALPINE, "12345")[0], RadioErrors.INVALID_RADIO_MODEL)
+            self.assertEqual(len(radioCodeApi.list()[1]), 1)
+
+    def test_latency(self):
+
+        latency = lognormal_latency(0.05, seed=1)
+        samples = [latency() for _ in range(1000)]
+
+        self.assertAlmostEqual(statistics.median(samples), 0.05, delta=0.005)
+        self.assertTrue(all(0.01 <= sample <= 0.02 for sample in [uniform_latency(0.01, 0.02)() for _ in range(100)]))
+
+        with StandInServer(latency=0.1) as server, self.calculator(server) as radioCodeApi:
+
+            started = time.monotonic()
+
+            radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+    def test_error_injection(self):
+
+        with StandInServer(error_rate=0.3, disconnect_rate=0.2, seed=1) as server, \
+                self.calculator(server) as radioCodeApi:
+
+            errors = [radioCodeApi.calc(RadioModels.FORD_M_SERIES, f"{i:06d}")[0] for i in range(100)]
+
+        self.assertEqual(errors.count(RadioErrors.ERROR_CONNECTION), server.injected_errors + server.disconnects)
+        self.assertTrue(20 <= server.injected_errors <= 40)
+        self.assertTrue(10 <= server.disconnects <= 30)
+
+        # the transient failures are retried
+        with StandInServer(error_rate=0.2, seed=1) as server, \
+                self.calculator(server, retry_policy=RetryPolicy(max_attempts=5, base_delay=0.0)) as radioCodeApi:
+
+            errors = [radioCodeApi.calc(RadioModels.FORD_M_SERIES, f"{i:06d}")[0] for i in range(50)]
+
+        self.assertEqual(errors, [RadioErrors.SUCCESS] * 50)
+        self.assertGreater(server.requests, 50)
+
+    def test_max_connections(self):
+
+        # the idle keep-alive connections hold their slots until they're closed
+        with StandInServer(latency=0.05, max_connections=2, idle_timeout=0.1) as server, \
+                self.calculator(server, pool_maxsize=8) as radioCodeApi:
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                errors = list(executor.map(lambda i: radioCodeApi.calc(RadioModels.FORD_M_SERIES, f"{i:06d}")[0],
+                                           range(8)))
+
+        self.assertEqual(errors, [RadioErrors.SUCCESS] * 8)
+        self.assertEqual(server.peak_in_flight, 2)
+
+
+class TestLoadGenerator(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StandInServer(latency=0.01).start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def check_report(self, report: LoadReport, mode: str, requests: int):
+
+        self.assertEqual(report.mode, mode)
+        self.assertEqual(report.requests, requests)
+        self.assertEqual(report.errors, {"SUCCESS": requests})
+        self.assertGreaterEqual(report.percentile(0.5), 0.01)
+        self.assertLessEqual(report.percentile(0.5), report.percentile(0.99))
+        self.assertEqual(report.to_dict()["latency"]["max"], report.latencies[-1])
+        self.assertIn("requests/s", str(report))
+
+    def test_modes(self):
+
+        generator = LoadGenerator(self.server.url, STAND_IN_ACTIVATION_KEY, seed=1)
+
+        for mode in ("sync", "bulk"):
+            report = generator.run(mode, rps=100, duration=0.5, workers=4)
+
+            self.check_report(report, mode, 50)
+
+            # paced at the target rate
+            self.assertGreaterEqual(report.duration, 0.49)
+
+        self.assertEqual(self.server.requests, 100)
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_async(self):
+
+        report = LoadGenerator(self.server.url, STAND_IN_ACTIVATION_KEY).run("async", rps=100, duration=0.5, workers=4)
+
+        self.check_report(report, "async", 50)
+
+    def test_unlimited(self):
+
+        report = LoadGenerator(self.server.url, STAND_IN_ACTIVATION_KEY).run_sync(rps=0, duration=0.3, workers=4)
+
+        self.assertGreater(report.requests, 0)
+        self.assertGreater(report.throughput, 0)
+        self.assertEqual(sum(report.errors.values()), report.requests)
+
+    def test_percentile(self):
+
+        report = LoadReport("sync", 0, 1.0, [i / 100 for i in range(100, 0, -1)], [RadioErrors.SUCCESS] * 100)
+
+        self.assertEqual((report.percentile(0.5), report.percentile(0.95), report.percentile(0.99)), (0.5, 0.95, 0.99))
+        self.assertEqual(report.throughput, 100)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
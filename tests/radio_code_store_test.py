@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - persistent radio code store unit test
+#
+# Validate the SQLite store, batched writes & bulk import/export
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code, stand_in_response
+
+
+class TestRadioCodeStore(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.directory.name, "radio_codes.sqlite")
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_get_put(self):
+
+        with RadioCodeStore(self.database_path, batch_size=2) as store:
+
+            self.assertTrue(store.put(("ford-m-series", "123456", ""), {"error": RadioErrors.SUCCESS, "code": "2487"}))
+            self.assertFalse(store.put(("ford-m-series", "1", ""), {"error": RadioErrors.INVALID_SERIAL_LENGTH}))
+
+            # buffered result is visible before it's written
+            self.assertEqual(store.get(("ford-m-series", "123456", ""))["code"], "2487")
+            self.assertIsNone(store.get(("ford-m-series", "1", "")))
+
+        # the results survive the restart
+        with RadioCodeStore(self.database_path) as store:
+
+            self.assertEqual(store.get(("ford-m-series", "123456", "")), {"error": RadioErrors.SUCCESS, "code": "2487"})
+            self.assertEqual(len(store), 1)
+
+    def test_flush(self):
+
+        key = ("ford-m-series", "123456", "")
+
+        with RadioCodeStore(self.database_path) as store:
+
+            write = store._write
+            visible = []
+
+            def checked_write(items):
+
+                # the results being written are still visible to the other threads
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    visible.append(executor.submit(store.get, key).result())
+
+                return write(items)
+
+            store._write = checked_write
+
+            # the buffered results are written when the calculator is closed
+            with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(stand_in_response), store=store) as radioCodeApi:
+                radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(visible[0]["code"], stand_in_code("ford-m-series", "123456"))
+
+            with RadioCodeStore(self.database_path) as other_store:
+                self.assertEqual(other_store.get(key)["code"], stand_in_code("ford-m-series", "123456"))
+
+    def test_threads_and_processes(self):
+
+        with RadioCodeStore(self.database_path, batch_size=10) as store:
+
+            def worker(index: int):
+                for i in range(50):
+                    store.put(("jaguar-alpine", f"{index:02d}{i:03d}", ""), {"error": RadioErrors.SUCCESS, "code": str(i)})
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(worker, range(4)))
+
+            # another process writing to the same database
+            subprocess.run([sys.executable, "-c",
+                            "from radio_code_calculator import *\n"
+                            f"with RadioCodeStore({self.database_path!r}) as store:\n"
+                            "    store.put(('jaguar-alpine', '99999', ''), {'error': 0, 'code': '6125'})\n"],
+                           check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+            self.assertEqual(len(store), 201)
+            self.assertEqual(store.get(("jaguar-alpine", "99999", ""))["code"], "6125")
+
+    def test_import_export(self):
+
+        export_path = os.path.join(self.directory.name, "radio_codes.jsonl")
+
+        with RadioCodeStore(self.database_path) as store:
+
+            count = store.import_codes(((("ford-m-series", f"{i:06d}", ""), {"error": RadioErrors.SUCCESS, "code": str(i)})
+                                        for i in range(1000)), batch_size=300)
+
+            self.assertEqual(count, 1000)
+            self.assertEqual(store.export_jsonl(export_path), 1000)
+
+        with RadioCodeStore(os.path.join(self.directory.name, "seeded.sqlite")) as store:
+
+            self.assertEqual(store.import_jsonl(export_path), 1000)
+            self.assertEqual(store.get(("ford-m-series", "000999", ""))["code"], "999")
+            self.assertEqual(sorted(key for key, result in store.export_codes())[0], ("ford-m-series", "000000", ""))
+
+    def test_calc(self):
+
+        server = StandInServer().start()
+
+        try:
+            with RadioCodeStore(self.database_path) as store:
+
+                radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, store=store)
+                radioCodeApi.API_URL = server.url
+
+                for _ in range(2):
+                    error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+                    self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+                results = radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, "123456"), (RadioModels.JAGUAR_ALPINE, "12345")])
+                self.assertEqual([error for error, result in results], [RadioErrors.SUCCESS, RadioErrors.SUCCESS])
+
+                radioCodeApi.close()
+
+            self.assertEqual(server.requests, 2)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - memory-mapped radio code table unit test
+#
+# Validate the dense radio code tables & their use by calc()
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import STAND_IN_ACTIVATION_KEY, stand_in_code, stand_in_response
+
+
+class TestRadioCodeTable(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.table_path = os.path.join(self.directory.name, "ford-m-series.table")
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_numeric_serial_length(self):
+
+        self.assertEqual(numeric_serial_length(RadioModels.FORD_M_SERIES), 6)
+        self.assertEqual(numeric_serial_length(RadioModels.FORD_TRAVELPILOT), 7)
+        self.assertEqual(numeric_serial_length(RadioModels.JAGUAR_ALPINE), 5)
+        self.assertIsNone(numeric_serial_length(RadioModels.RENAULT_DACIA))
+
+        with self.assertRaises(ValueError):
+            RadioCodeTable(self.table_path, RadioModels.RENAULT_DACIA)
+
+    def test_get_put(self):
+
+        with RadioCodeTable(self.table_path, RadioModels.FORD_M_SERIES, code_width=4) as table:
+
+            self.assertEqual(table.digits, 6)
+            self.assertIsNone(table.get(("ford-m-series", "123456", "")))
+
+            self.assertTrue(table.put(("ford-m-series", "123456", ""), {"error": RadioErrors.SUCCESS, "code": "2487"}))
+            self.assertTrue(table.put(("ford-m-series", "000000", ""), {"error": RadioErrors.SUCCESS, "code": "17"}))
+
+            # the errors, the other radio models, the extra data & the codes longer than the cells (or not ASCII)
+            # are not stored
+            self.assertFalse(table.put(("ford-m-series", "123457", ""), {"error": RadioErrors.ERROR_CONNECTION}))
+            self.assertFalse(table.put(("ford-v-series", "123456", ""), {"error": RadioErrors.SUCCESS, "code": "1"}))
+            self.assertFalse(table.put(("ford-m-series", "123456", "x"), {"error": RadioErrors.SUCCESS, "code": "1"}))
+            self.assertFalse(table.put(("ford-m-series", "12345", ""), {"error": RadioErrors.SUCCESS, "code": "1"}))
+            self.assertFalse(table.put(("ford-m-series", "999999", ""), {"error": RadioErrors.SUCCESS, "code": "12345"}))
+            self.assertFalse(table.put(("ford-m-series", "999999", ""), {"error": RadioErrors.SUCCESS, "code": "12\xe9"}))
+            self.assertFalse(table.put(("ford-m-series", "999999", ""), {"error": RadioErrors.SUCCESS, "code": "12\0"}))
+            self.assertIsNone(table.get(("ford-m-series", "999999", "")))
+
+            self.assertEqual(table.get(("ford-m-series", "123456", "")), {"error": RadioErrors.SUCCESS, "code": "2487"})
+            self.assertEqual(table.get(("ford-m-series", "000000", ""))["code"], "17")
+            self.assertIsNone(table.get(("ford-m-series", "12345a", "")))
+            self.assertEqual(len(table), 2)
+
+        # the codes survive reopening, the radio model is read from the file
+        with RadioCodeTable(self.table_path, readonly=True) as table:
+
+            self.assertEqual(table.radio_model, "ford-m-series")
+            self.assertEqual(table.get(("ford-m-series", "123456", ""))["code"], "2487")
+            self.assertFalse(table.put(("ford-m-series", "111111", ""), {"error": RadioErrors.SUCCESS, "code": "1"}))
+
+        with self.assertRaises(ValueError):
+            RadioCodeTable(self.table_path, RadioModels.FORD_V_SERIES)
+
+        # the radio model name must fit in the header
+        with self.assertRaises(ValueError):
+            RadioCodeTable(self.table_path + ".long", RadioModel("x" * 49, 4, r"^([0-9]{4})$"))
+
+    def test_shared_between_processes(self):
+
+        with RadioCodeTable(self.table_path, RadioModels.FORD_M_SERIES) as table:
+
+            with RadioCodeTable(self.table_path, readonly=True) as reader:
+
+                subprocess.run([sys.executable, "-c",
+                                "from radio_code_calculator import *\n"
+                                f"with RadioCodeTable({self.table_path!r}) as table:\n"
+                                "    table.put(('ford-m-series', '654321', ''), {'error': 0, 'code': '6125'})\n"],
+                               check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+                # the mapped pages are shared, no reopening needed
+                self.assertEqual(reader.get(("ford-m-series", "654321", ""))["code"], "6125")
+                self.assertEqual(table.get(("ford-m-series", "654321", ""))["code"], "6125")
+
+    def test_calc(self):
+
+        transport = FakeTransport(stand_in_response)
+
+        with RadioCodeTable(self.table_path, RadioModels.FORD_M_SERIES) as table:
+
+            myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, code_tables=[table])
+
+            for _ in range(3):
+                error, result = myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+
+                self.assertEqual(error, RadioErrors.SUCCESS)
+                self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+            # the other radio models bypass the table
+            myRadioCodeCalculator.calc(RadioModels.FORD_TRAVELPILOT, "1234567")
+            myRadioCodeCalculator.calc(RadioModels.FORD_TRAVELPILOT, "1234567")
+
+            self.assertEqual(transport.requests, 3)
+            self.assertEqual(len(table), 1)
+
+    def test_async_calc(self):
+
+        transport = AsyncFakeTransport(stand_in_response)
+
+        async def calc(calculator):
+            return [await calculator.calc(RadioModels.FORD_M_SERIES, "123456") for _ in range(3)]
+
+        with RadioCodeTable(self.table_path, RadioModels.FORD_M_SERIES) as table:
+
+            results = asyncio.run(calc(AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport,
+                                                                code_tables=[table])))
+
+        self.assertTrue(all(result["code"] == stand_in_code("ford-m-series", "123456") for _, result in results))
+        self.assertEqual(transport.requests, 1)
+
+
+if __name__ == '__main__':
+
+    unittest.main()
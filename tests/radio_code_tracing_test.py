@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - tracing unit test
+#
+# Validate the sampled traces and the per-phase spans of the SDK calls
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import asyncio
+import importlib.util
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_response
+
+
+def span_names(spans: list) -> list:
+    return [span.name for span in spans]
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_spans(self):
+
+        traces = []
+        tracer = Tracer(traces.append)
+
+        trace = tracer.start("calc", radio_model="ford-m-series")
+
+        with trace.span("queue", kind="rate_limit"):
+            pass
+
+        with self.assertRaises(ValueError):
+            with trace.span("http", attempt=1):
+                raise ValueError()
+
+        trace.finish(error=0)
+
+        root, queue, http = traces[0]
+
+        self.assertEqual(root.attributes, {"radio_model": "ford-m-series", "error": 0})
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(len(root.trace_id), 32)
+        self.assertTrue(all(span.parent_id == root.span_id and span.trace_id == root.trace_id for span in (queue, http)))
+        self.assertEqual(http.attributes, {"attempt": 1, "exception": "ValueError"})
+        self.assertLessEqual(root.start_ns, queue.start_ns)
+        self.assertLessEqual(http.end_ns, root.end_ns)
+        self.assertGreaterEqual(root.duration, 0.0)
+        self.assertEqual(root.to_dict()["name"], "calc")
+
+    def test_outside_of_trace(self):
+
+        # does nothing
+        with trace_span("decode"):
+            pass
+
+        self.assertIsNone(current_trace())
+
+    def test_sampling(self):
+
+        traces = []
+        transport = FakeTransport(stand_in_response)
+
+        myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport,
+                                                    tracer=Tracer(traces.append, sample_rate=0.0))
+
+        for i in range(10):
+            myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, f"{i:06d}")
+
+        self.assertEqual(transport.requests, 10)
+        self.assertEqual(traces, [])
+
+    def test_sink_errors(self):
+
+        def sink(spans):
+            raise RuntimeError()
+
+        tracer = Tracer(sink)
+
+        myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(stand_in_response),
+                                                    tracer=tracer)
+
+        error, result = myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual((tracer.traces, tracer.sink_errors), (1, 1))
+
+    def test_retries(self):
+
+        traces = []
+        attempts = []
+
+        def handler(params):
+
+            attempts.append(params)
+
+            if len(attempts) == 1:
+                raise TransportTimeoutError("timeout")
+
+            return stand_in_response(params)
+
+        myRadioCodeCalculator = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(handler),
+                                                    retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0),
+                                                    tracer=Tracer(traces.append))
+
+        myRadioCodeCalculator.calc(RadioModels.FORD_M_SERIES, "123456")
+
+        spans = traces[0]
+
+        self.assertEqual(span_names(spans), ["calc", "http", "backoff", "http"])
+        self.assertEqual(spans[1].attributes, {"attempt": 1, "exception": "TransportTimeoutError"})
+        self.assertEqual(spans[3].attributes, {"attempt": 2})
+
+
+class TestTracingInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StandInServer().start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def check_transport(self, transport: Transport):
+
+        traces = []
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport, rate_limiter=RateLimiter(1000),
+                                 tracer=Tracer(traces.append)) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+
+            radioCodeApi.calc(RadioModels.FORD_M_SERIES, "654321")
+            radioCodeApi.info(RadioModels.FORD_M_SERIES)
+            radioCodeApi.list()
+
+        first, second, info, radio_models = traces
+
+        self.assertEqual(first[0].attributes, {"command": "calc", "radio_model": "ford-m-series", "error": 0})
+
+        # the first request opens the connection, the next ones reuse it
+        self.assertIn("connect", span_names(first))
+        self.assertNotIn("connect", span_names(second))
+
+        for spans in traces:
+            self.assertTrue({"queue", "http", "ttfb", "body", "decode"} <= set(span_names(spans)))
+
+        self.assertIn("model", span_names(info))
+        self.assertEqual(radio_models[-1].name, "model")
+        self.assertGreater(radio_models[-1].attributes["count"], 0)
+
+    def test_requests_transport(self):
+        self.check_transport(RequestsTransport())
+
+    @unittest.skipIf(importlib.util.find_spec("urllib3") is None, "urllib3 is not installed")
+    def test_urllib3_transport(self):
+        self.check_transport(Urllib3Transport())
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_httpx_transport(self):
+        self.check_transport(HttpxTransport())
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_async(self):
+
+        traces = []
+
+        async def calc():
+            async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, tracer=Tracer(traces.append)) as radioCodeApi:
+                radioCodeApi.API_URL = self.server.url
+                return await radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(5)])
+
+        asyncio.run(calc())
+
+        self.assertEqual(len(traces), 5)
+
+        # each concurrent command has its own trace
+        self.assertEqual(len({spans[0].trace_id for spans in traces}), 5)
+
+        for spans in traces:
+            self.assertTrue({"queue", "http", "ttfb", "body", "decode"} <= set(span_names(spans)))
+            self.assertTrue(all(span.trace_id == spans[0].trace_id for span in spans))
+
+
+if __name__ == '__main__':
+
+    unittest.main()
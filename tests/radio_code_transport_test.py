@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - HTTP transports unit test
+#
+# Validate the pluggable transports against the local stand-in Web API
+# server and the in-process fake transports
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_code, stand_in_response
+
+
+class TestHttpTransports(unittest.TestCase):
+
+    #
+    # local stand-in Web API server
+    #
+    server: StandInServer
+
+    def setUp(self):
+
+        self.server = StandInServer().start()
+
+    def tearDown(self):
+
+        self.server.stop()
+
+    def check_transport(self, transport: Transport):
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+            # the connections are pooled
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda serial: radioCodeApi.calc(RadioModels.FORD_M_SERIES, serial),
+                                            [f"{i:06d}" for i in range(40)]))
+
+            self.assertTrue(all(error == RadioErrors.SUCCESS for error, result in results))
+            self.assertLessEqual(self.server.connections, 4)
+
+        # the same error semantics as the default transport
+        self.server.stop()
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+            radioCodeApi.API_URL = self.server.url
+
+            self.assertEqual(radioCodeApi.login(), (RadioErrors.ERROR_CONNECTION, {"error": RadioErrors.ERROR_CONNECTION}))
+
+    def test_requests_transport(self):
+
+        self.check_transport(RequestsTransport(pool_maxsize=4))
+
+    @unittest.skipIf(importlib.util.find_spec("urllib3") is None, "urllib3 is not installed")
+    def test_urllib3_transport(self):
+
+        self.check_transport(Urllib3Transport(maxsize=4))
+
+    @unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+    def test_httpx_transport(self):
+
+        self.check_transport(HttpxTransport(max_connections=4, max_keepalive_connections=4))
+
+    def test_transport_errors(self):
+
+        transport = RequestsTransport()
+
+        with self.assertRaises(TransportStatusError) as context:
+            transport.post(self.server.url + "missing", {})
+
+        self.assertEqual(context.exception.status_code, 404)
+
+        transport.close()
+
+        self.server.stop()
+
+        with self.assertRaises(TransportConnectionError):
+            transport.post(self.server.url, {})
+
+    def test_redirect_status(self):
+
+        transports = [RequestsTransport()]
+
+        if importlib.util.find_spec("urllib3") is not None:
+            transports.append(Urllib3Transport())
+
+        if importlib.util.find_spec("httpx") is not None:
+            transports.append(HttpxTransport())
+
+        self.server.stop()
+
+        # a redirect (that isn't followed) is an HTTP status error, not a malformed response
+        with StandInServer(error_rate=1.0, error_status=302) as server:
+            for transport in transports:
+                with self.subTest(transport=type(transport).__name__):
+
+                    with self.assertRaises(TransportStatusError) as context:
+                        transport.post(server.url, {"command": "login"})
+
+                    self.assertEqual(context.exception.status_code, 302)
+                    transport.close()
+
+
+class TestTransportBase(unittest.TestCase):
+
+    def test_abstract_post(self):
+
+        class IncompleteTransport(Transport):
+            pass
+
+        class IncompleteAsyncTransport(AsyncTransport):
+            pass
+
+        # fails at the construction, not on the first request
+        with self.assertRaises(TypeError):
+            IncompleteTransport()
+
+        with self.assertRaises(TypeError):
+            IncompleteAsyncTransport()
+
+
+class TestFakeTransport(unittest.TestCase):
+
+    def test_calc(self):
+
+        transport = FakeTransport(stand_in_response)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+
+            error, result = radioCodeApi.calc(RadioModels.FORD_M_SERIES, "123456")
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+            self.assertEqual(result["code"], stand_in_code("ford-m-series", "123456"))
+
+            error, radio_models = radioCodeApi.list()
+
+            self.assertEqual(error, RadioErrors.SUCCESS)
+
+        self.assertEqual(transport.requests, 2)
+
+    def test_transport_error(self):
+
+        def handler(params):
+            raise TransportStatusError(503)
+
+        with RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=FakeTransport(handler)) as radioCodeApi:
+
+            self.assertEqual(radioCodeApi.login(), (RadioErrors.ERROR_CONNECTION, {"error": RadioErrors.ERROR_CONNECTION}))
+
+
+class TestAsyncFakeTransport(unittest.IsolatedAsyncioTestCase):
+
+    async def test_calc_many(self):
+
+        transport = AsyncFakeTransport(stand_in_response, latency=0.01)
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=transport) as radioCodeApi:
+
+            results = await radioCodeApi.calc_many([(RadioModels.FORD_M_SERIES, f"{i:06d}") for i in range(20)])
+
+        self.assertTrue(all(error == RadioErrors.SUCCESS for error, result in results))
+        self.assertEqual(transport.requests, 20)
+
+    async def test_transport_error(self):
+
+        def handler(params):
+            raise TransportConnectionError("connection refused")
+
+        async with AsyncRadioCodeCalculator(STAND_IN_ACTIVATION_KEY, transport=AsyncFakeTransport(handler)) as radioCodeApi:
+
+            self.assertEqual(await radioCodeApi.login(), (RadioErrors.ERROR_CONNECTION, {"error": RadioErrors.ERROR_CONNECTION}))
+
+
+if __name__ == '__main__':
+    unittest.main()
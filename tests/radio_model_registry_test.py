@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - radio model registry unit test
+#
+# Validate radio model detection by the serial number
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from radio_code_calculator.radio_code_stand_in_server import StandInServer, STAND_IN_ACTIVATION_KEY, stand_in_response
+
+
+class TestRadioModelRegistry(unittest.TestCase):
+
+    #
+    # registry of all the predefined radio models
+    #
+    registry: RadioModelRegistry = RadioModelRegistry()
+
+    def test_lookup(self):
+
+        self.assertEqual(len(self.registry), len(RadioModels.all()))
+        self.assertIs(self.registry["ford-m-series"], RadioModels.FORD_M_SERIES)
+        self.assertIs(self.registry.get("jaguar-alpine"), RadioModels.JAGUAR_ALPINE)
+        self.assertIsNone(self.registry.get("INVALID RADIO MODEL"))
+        self.assertIn("toyota-erc", self.registry)
+
+    def test_candidates(self):
+
+        self.assertEqual(self.registry.candidates("123456"),
+                         [RadioModels.FORD_M_SERIES, RadioModels.FORD_V_SERIES,
+                          RadioModels.FIAT_STILO_BRAVO_VISTEON, RadioModels.ECLIPSE_ESN])
+        self.assertEqual(self.registry.candidates("Z999"),
+                         [RadioModels.RENAULT_DACIA, RadioModels.CHRYSLER_DODGE_VP, RadioModels.FIAT_DAIICHI, RadioModels.FIAT_VP])
+        self.assertEqual(self.registry.candidates("TQ1AA1500E2884"), [RadioModels.JEEP_CHEROKEE])
+        self.assertEqual(self.registry.candidates("TQ1AA1500E288A"), [])
+        self.assertEqual(self.registry.candidates("1"), [])
+
+    def test_candidates_match_validate(self):
+
+        alphabet = "09AZaz-%"
+        randomizer = random.Random(3)
+
+        for _ in range(3000):
+            serial = "".join(randomizer.choice(alphabet) for _ in range(randomizer.choice([4, 5, 6, 7, 12, 14, 16])))
+
+            self.assertEqual(self.registry.candidates(serial),
+                             [radio_model for radio_model in RadioModels.all()
+                              if radio_model.validate(serial) == RadioErrors.SUCCESS], serial)
+
+    def test_candidates_extra_and_complex_patterns(self):
+
+        registry = RadioModelRegistry([
+            RadioModel("custom-extra", 4, r"^([0-9]{4})$", 2, r"^([A-F]{2})$"),
+            RadioModel("custom-complex", 4, r"^(AB|12)[0-9]{2}$"),
+            RadioModels.CHRYSLER_PANASONIC_TM9,
+        ])
+
+        self.assertEqual([radio_model.name for radio_model in registry.candidates("1234")],
+                         ["custom-extra", "chrysler-panasonic-tm9", "custom-complex"])
+        self.assertEqual([radio_model.name for radio_model in registry.candidates("1234", "AF")],
+                         ["custom-extra"])
+
+        # replaced model
+        registry.add(RadioModel("custom-extra", 5, r"^([0-9]{5})$"))
+
+        self.assertEqual([radio_model.name for radio_model in registry.candidates("12345")], ["custom-extra"])
+        self.assertEqual([radio_model.name for radio_model in registry.candidates("1234")],
+                         ["chrysler-panasonic-tm9", "custom-complex"])
+
+    def test_candidates_many(self):
+
+        lines = io.StringIO("123456\nTQ1AA1500E2884\r\n%\n")
+
+        results = list(self.registry.candidates_many(lines))
+
+        self.assertEqual(len(results), 3)
+        self.assertIn(RadioModels.FORD_M_SERIES, results[0])
+        self.assertEqual(results[1], [RadioModels.JEEP_CHEROKEE])
+        self.assertEqual(results[2], [])
+
+
+class TestRadioModelCatalog(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StandInServer().start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, "radio_models.json")
+
+    def tearDown(self):
+
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _calculator(self, model_catalog: RadioModelCatalog) -> RadioCodeCalculator:
+
+        radioCodeApi = RadioCodeCalculator(STAND_IN_ACTIVATION_KEY, model_catalog=model_catalog)
+        radioCodeApi.API_URL = self.server.url
+        self.addCleanup(radioCodeApi.close)
+
+        return radioCodeApi
+
+    def test_list_info(self):
+
+        radioCodeApi = self._calculator(RadioModelCatalog(ttl=60))
+
+        error, radio_models = radioCodeApi.list()
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertIn("ford-m-series", [radio_model.name for radio_model in radio_models])
+
+        # served from the cached list command results
+        error, radio_model = radioCodeApi.info(RadioModels.FORD_M_SERIES)
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.serial_max_len, 6)
+
+        error, radio_model = radioCodeApi.info("INVALID RADIO MODEL")
+        self.assertEqual(error, RadioErrors.INVALID_RADIO_MODEL)
+        self.assertIsNone(radio_model)
+
+        self.assertEqual(self.server.requests, 1)
+
+    def test_stale_while_revalidate(self):
+
+        model_catalog = RadioModelCatalog(ttl=0.1)
+        radioCodeApi = self._calculator(model_catalog)
+
+        radioCodeApi.list()
+        time.sleep(0.15)
+
+        # stale models are returned immediately and refreshed in the background
+        self.server.latency = 0.2
+
+        started = time.monotonic()
+        error, radio_models = radioCodeApi.list()
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertLess(time.monotonic() - started, 0.15)
+
+        deadline = time.monotonic() + 5
+        while model_catalog.refreshes < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(model_catalog.refreshes, 2)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_snapshot(self):
+
+        radioCodeApi = self._calculator(RadioModelCatalog(ttl=60, snapshot_path=self.snapshot_path))
+        radioCodeApi.list()
+
+        # cold start without the network
+        self.server.stop()
+
+        radioCodeApi = self._calculator(RadioModelCatalog(ttl=60, snapshot_path=self.snapshot_path))
+
+        error, radio_model = radioCodeApi.info("jaguar-alpine")
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.validate("99999"), RadioErrors.SUCCESS)
+
+        # no snapshot and no network
+        radioCodeApi = self._calculator(RadioModelCatalog(snapshot_path=os.path.join(self.directory.name, "missing.json")))
+
+        self.assertEqual(radioCodeApi.list(), (RadioErrors.ERROR_CONNECTION, None))
+
+
+class TestAsyncRadioModelCatalog(unittest.IsolatedAsyncioTestCase):
+
+    async def test_background_refresh(self):
+
+        import asyncio
+        import gc
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return stand_in_response({"command": "list", "key": STAND_IN_ACTIVATION_KEY})
+
+        model_catalog = RadioModelCatalog(ttl=0.0)
+
+        await model_catalog.get_async(fetch)
+
+        # the stale models are returned, the refresh task is kept until it's done
+        error, registry = await model_catalog.get_async(fetch)
+
+        self.assertEqual(error, RadioErrors.SUCCESS)
+        self.assertIsNotNone(model_catalog._refresh_task)
+
+        gc.collect()
+
+        await model_catalog._refresh_task
+
+        self.assertIsNone(model_catalog._refresh_task)
+        self.assertEqual(model_catalog.refreshes, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+###############################################################################
+#
+# Radio Code Calculator API - offline radio model validation unit test
+#
+# Validate RadioModel offline validation against the regex patterns
+#
+# Version        : v1.1.6
+# Language       : Python
+# Author         : Bartosz Wójcik
+# Project        : https://www.pelock.com/products/radio-code-calculator
+# Homepage       : https://www.pelock.com
+# Copyright      : (c) 2021-2024 PELock LLC
+# License        : Apache-2.0
+#
+###############################################################################
+
+#
+# include Radio Code Calculator API module
+#
+from radio_code_calculator import *
+
+import importlib.util
+import random
+import re
+import unittest
+from unittest import mock
+
+
+def reference_validate(radio_model: RadioModel, serial: str, extra: str = "") -> int:
+    """Regex based validation the compiled validators must be compatible with"""
+
+    if len(serial) != radio_model.serial_max_len:
+        return RadioErrors.INVALID_SERIAL_LENGTH
+    if re.match(radio_model.serial_regex_pattern, serial) is None:
+        return RadioErrors.INVALID_SERIAL_PATTERN
+
+    if extra:
+        if len(extra) != radio_model.extra_max_len:
+            return RadioErrors.INVALID_EXTRA_LENGTH
+        if re.match(radio_model.extra_regex_pattern, extra) is None:
+            return RadioErrors.INVALID_EXTRA_PATTERN
+
+    return RadioErrors.SUCCESS
+
+
+class TestRadioModel(unittest.TestCase):
+
+    def test_validate(self):
+
+        self.assertEqual(RadioModels.RENAULT_DACIA.validate("Z999"), RadioErrors.SUCCESS)
+        self.assertEqual(RadioModels.RENAULT_DACIA.validate("9999"), RadioErrors.INVALID_SERIAL_PATTERN)
+        self.assertEqual(RadioModels.RENAULT_DACIA.validate("Z99"), RadioErrors.INVALID_SERIAL_LENGTH)
+        self.assertEqual(RadioModels.JEEP_CHEROKEE.validate("TQ1AA1500E2884"), RadioErrors.SUCCESS)
+        self.assertEqual(RadioModels.JEEP_CHEROKEE.validate("TQ1AA1500E288A"), RadioErrors.INVALID_SERIAL_PATTERN)
+        self.assertEqual(RadioModels.FORD_M_SERIES.validate("12345\n"), RadioErrors.INVALID_SERIAL_PATTERN)
+        self.assertEqual(RadioModels.FORD_M_SERIES.validate("12345٣"), RadioErrors.INVALID_SERIAL_PATTERN)
+
+    def test_validate_matches_regex(self):
+
+        alphabet = "09AZaz-_ \n٣é" + "".join(map(chr, range(0x21, 0x7f)))
+        randomizer = random.Random(1)
+
+        for radio_model in RadioModels.all():
+            for _ in range(2000):
+                length = radio_model.serial_max_len + randomizer.choice([-1, 0, 0, 0, 1])
+                serial = "".join(randomizer.choice(alphabet) for _ in range(max(length, 0)))
+
+                self.assertEqual(radio_model.validate(serial), reference_validate(radio_model, serial),
+                                 f"{radio_model.name} {serial!r}")
+
+    def test_validate_regex_fallback(self):
+
+        # patterns other than the fixed-length character classes use the regex engine
+        radio_model = RadioModel("custom", 5, r"^(AB|CD)[0-9]{3}$")
+
+        self.assertEqual(radio_model.validate("AB123"), RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.validate("AC123"), RadioErrors.INVALID_SERIAL_PATTERN)
+
+        # pattern length different from the max. length
+        radio_model = RadioModel("custom", 7, r"^([0-9]{6})$")
+
+        self.assertEqual(radio_model.validate("123456\n"), reference_validate(radio_model, "123456\n"))
+
+    def test_validate_extra(self):
+
+        radio_model = RadioModel("custom", 4, r"^([0-9]{4})$", 2, {"python": r"^([A-F]{2})$"})
+
+        self.assertEqual(radio_model.validate("1234", "AF"), RadioErrors.SUCCESS)
+        self.assertEqual(radio_model.validate("1234", "AG"), RadioErrors.INVALID_EXTRA_PATTERN)
+        self.assertEqual(radio_model.validate("1234", "AFF"), RadioErrors.INVALID_EXTRA_LENGTH)
+        self.assertEqual(radio_model.validate("1234", ""), RadioErrors.SUCCESS)
+
+    def test_patterns_not_shared(self):
+
+        first = RadioModel("first", 2, r"^([0-9]{2})$", 2, r"^([A-Z]{2})$")
+        second = RadioModel("second", 2, r"^([A-Z]{2})$", 2, r"^([0-9]{2})$")
+
+        self.assertEqual(first.extra_regex_pattern, r"^([A-Z]{2})$")
+        self.assertEqual(second.extra_regex_pattern, r"^([0-9]{2})$")
+        self.assertEqual(first.serial_regex_pattern, r"^([0-9]{2})$")
+        self.assertIsNone(RadioModels.FORD_M_SERIES.extra_regex_pattern)
+
+    def test_compact(self):
+
+        first = RadioModel("-".join(["custom", "model"]), 6, r"^([0-9]{6})$")
+        second = RadioModel("custom-model", 6, "".join([r"^([0-9]", r"{6})$"]))
+
+        # no per-instance dictionary, the names & patterns are interned, the validators are shared
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.name, second.name)
+        self.assertIs(first.serial_regex_pattern, second.serial_regex_pattern)
+        self.assertIs(first._serial_validator, RadioModels.FORD_M_SERIES._serial_validator)
+
+        with self.assertRaises(AttributeError):
+            first.region = "EU"
+
+    def _serials(self, radio_model: RadioModel, count: int = 500) -> list[str]:
+
+        alphabet = "09AZaz- \n%"
+        randomizer = random.Random(2)
+
+        return ["".join(randomizer.choice(alphabet) for _ in range(radio_model.serial_max_len + randomizer.choice([-1, 0, 0, 1])))
+                for _ in range(count)]
+
+    def test_validate_many_list(self):
+
+        for radio_model in RadioModels.all():
+            serials = self._serials(radio_model)
+            self.assertEqual(list(radio_model.validate_many(serials)), [radio_model.validate(serial) for serial in serials])
+
+    def test_validate_many_nul(self):
+
+        # NumPy strips the trailing NUL characters of the strings
+        radio_model = RadioModels.FIAT_STILO_BRAVO_VISTEON
+        serials = ["BB6D6B\x00", "BB6D6B", "BB6D6\x00", "\x00BB6D6B", "BB\x00D6B"]
+
+        self.assertEqual(list(radio_model.validate_many(serials)), [radio_model.validate(serial) for serial in serials])
+        self.assertEqual(radio_model.validate_many(["BB6D6B\x00"])[0], RadioErrors.INVALID_SERIAL_LENGTH)
+
+    def test_validate_many_buffer(self):
+
+        radio_model = RadioModels.JEEP_CHEROKEE
+        serials = ["TQ1AA1500E2884", "TQ1AA1500E288A", "TQ1AA1500E288", "TQ1AA1500 2884"]
+
+        # new line terminated records padded with spaces
+        buffer = b"".join(serial.ljust(radio_model.serial_max_len + 1).encode()[:radio_model.serial_max_len] + b"\n"
+                          for serial in serials)
+
+        expected = [RadioErrors.SUCCESS, RadioErrors.INVALID_SERIAL_PATTERN, RadioErrors.INVALID_SERIAL_LENGTH,
+                    RadioErrors.INVALID_SERIAL_PATTERN]
+
+        self.assertEqual(list(radio_model.validate_many(buffer, record_len=radio_model.serial_max_len + 1)), expected)
+
+        with mock.patch("radio_code_calculator.radio_code_calculator._import_numpy", return_value=None):
+            self.assertEqual(list(radio_model.validate_many(buffer, record_len=radio_model.serial_max_len + 1)), expected)
+            self.assertEqual(list(radio_model.validate_many(serials)), expected)
+
+        with self.assertRaises(ValueError):
+            radio_model.validate_many(b"123")
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+    def test_validate_many_numpy(self):
+
+        import numpy
+
+        for radio_model in RadioModels.all():
+            serials = self._serials(radio_model)
+            errors = radio_model.validate_many(numpy.array([serial.encode() for serial in serials]))
+
+            self.assertEqual(errors.dtype, numpy.int8)
+            self.assertEqual(list(errors), [radio_model.validate(serial) for serial in serials])
+
+        # complex patterns are validated one by one
+        radio_model = RadioModel("custom", 5, r"^(AB|CD)[0-9]{3}$")
+        self.assertEqual(list(radio_model.validate_many(numpy.array(["AB123", "AC123", "AB12"]))),
+                         [RadioErrors.SUCCESS, RadioErrors.INVALID_SERIAL_PATTERN, RadioErrors.INVALID_SERIAL_LENGTH])
+
+
+if __name__ == '__main__':
+    unittest.main()